@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# FortiPass - Bulk Generation Benchmark
+
+"""
+Compare generate_many() against generate_strong_password().
+
+For each length and option set, times both on --count passwords and checks
+every generated password for its length and character classes. The
+character frequencies of the two generators are compared with a two-sample
+chi-square statistic; since both draw from the same distribution it should
+stay near its degrees of freedom. Generated passwords are never printed.
+
+Run from the repository root:
+
+    python benchmarks/bench_generate.py [--count 20000] [--lengths 8,16,32,64]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fortipass.core.generator import character_classes
+from fortipass.core.password_analyzer import PasswordAnalyzer
+
+OPTIONS = {
+    "all": {},
+    "alnum": {"include_symbols": False},
+    "lower": {"include_uppercase": False, "include_digits": False,
+              "include_symbols": False},
+}
+
+
+def invalid(passwords: list, length: int, classes: list) -> int:
+    """Return how many passwords have the wrong length or miss a class."""
+    return sum(1 for password in passwords
+               if len(password) != length or
+               not all(any(c in members for c in password) for members in classes))
+
+
+def chi_square(first: Counter, second: Counter) -> tuple:
+    """
+    Two-sample chi-square statistic over character counts.
+    
+    Returns:
+        (statistic, degrees of freedom)
+    """
+    total_first = sum(first.values())
+    total_second = sum(second.values())
+    keys = set(first) | set(second)
+    statistic = 0.0
+    for key in keys:
+        a, b = first[key], second[key]
+        # Scaled so that equal totals reduce to sum((a - b)^2 / (a + b))
+        statistic += (a * (total_second / total_first) ** 0.5 -
+                      b * (total_first / total_second) ** 0.5) ** 2 / (a + b)
+    return statistic, len(keys) - 1
+
+
+def main(argv: list = None) -> int:
+    """Run the benchmark; exit non-zero if any password is malformed."""
+    parser = argparse.ArgumentParser(description="Benchmark bulk password generation.")
+    parser.add_argument("--count", type=int, default=20000,
+                        help="Passwords per case (default: %(default)s)")
+    parser.add_argument("--lengths", default="8,16,32,64",
+                        help="Comma-separated password lengths (default: %(default)s)")
+    args = parser.parse_args(argv)
+    lengths = [int(length) for length in args.lengths.split(",")]
+    analyzer = PasswordAnalyzer()
+    
+    bad = 0
+    print(f"{'case':12s} {'generate_strong_password':>26s} {'generate_many':>16s} "
+          f"{'speedup':>8s} {'chi2/df':>10s}")
+    for label, kwargs in OPTIONS.items():
+        classes = character_classes(**kwargs)
+        for length in lengths:
+            started = time.perf_counter()
+            single = [analyzer.generate_strong_password(length, **kwargs)
+                      for _ in range(args.count)]
+            single_seconds = time.perf_counter() - started
+            
+            started = time.perf_counter()
+            many = list(analyzer.generate_many(args.count, length, **kwargs))
+            many_seconds = time.perf_counter() - started
+            
+            bad += invalid(single, length, classes) + invalid(many, length, classes)
+            statistic, df = chi_square(Counter("".join(single)), Counter("".join(many)))
+            print(f"{label + '/' + str(length):12s} {args.count / single_seconds:20,.0f} pw/s "
+                  f"{args.count / many_seconds:10,.0f} pw/s {single_seconds / many_seconds:7.1f}x "
+                  f"{statistic:6.0f}/{df}")
+    
+    print(f"malformed passwords: {bad}")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# FortiPass - Guess Estimator Benchmark
+
+"""
+Measure the per-password cost of the minimum-guess decomposition.
+
+Typical passwords time estimate_guesses() alone. Long adversarial inputs
+(2,000 to 10,000 characters of digits, repeated units and dictionary words,
+which produce a match at nearly every position) time analyze() end to end,
+since that is what a pasted or hostile input actually costs.
+
+Run from the repository root:
+
+    python benchmarks/bench_guesses.py
+"""
+
+import os
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fortipass.core.password_analyzer import PasswordAnalyzer
+
+WORDLIST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "data", "common_passwords.txt")
+
+# Typical inputs: weak, mixed, passphrase-like and random
+PASSWORDS = [
+    "password1",
+    "Tr0ub4dor&3",
+    "qwerty123456",
+    "correcthorsebatterystaple",
+    "Summer2023!",
+    "kJ8#mQ2$vL9!pR4&",
+]
+
+# Per-password latency the estimator is expected to stay under
+BUDGET_SECONDS = 0.001
+
+# Full analyze() latency allowed for a single adversarial input
+ADVERSARIAL_BUDGET_SECONDS = 0.25
+
+
+def adversarial_inputs() -> list:
+    """Return (label, text) pairs of long inputs dense with matches."""
+    rng = random.Random(8)
+    words = ["correct", "horse", "battery", "staple", "summer", "dragon"]
+    passphrase = " ".join(rng.choice(words) for _ in range(1500))[:10000]
+    return [
+        ("digits 2k", "".join(rng.choice("0123456789") for _ in range(2000))),
+        ("digits 10k", "".join(rng.choice("0123456789") for _ in range(10000))),
+        ("'ab' x 5000", "ab" * 5000),
+        ("'password' x 1250", "password" * 1250),
+        ("sequences 10k", ("abcdef123456qwerty" * 556)[:10000]),
+        ("passphrase 10k", passphrase),
+    ]
+
+
+def main() -> int:
+    """Run the benchmark and report microseconds per password."""
+    analyzer = PasswordAnalyzer(WORDLIST)
+    worst = 0.0
+    for password in PASSWORDS:
+        runs = 2000
+        seconds = min(timeit.repeat(lambda: analyzer.estimate_guesses(password),
+                                    number=runs, repeat=3)) / runs
+        worst = max(worst, seconds)
+        estimate = analyzer.estimate_guesses(password)
+        print(f"{len(password):3d} chars  {seconds * 1e6:8.1f} us  "
+              f"log10(guesses)={estimate.guesses_log10:.2f}")
+    
+    status = "OK" if worst < BUDGET_SECONDS else "OVER BUDGET"
+    print(f"worst case {worst * 1e6:.1f} us per password "
+          f"(budget {BUDGET_SECONDS * 1e6:.0f} us): {status}")
+    failed = worst >= BUDGET_SECONDS
+    
+    print()
+    analyzer.preload()
+    worst_adversarial = 0.0
+    for label, text in adversarial_inputs():
+        # Each input is analyzed once; the result cache would hide repeats
+        analyzer.clear_cache()
+        started = time.perf_counter()
+        analyzer.analyze(text)
+        seconds = time.perf_counter() - started
+        worst_adversarial = max(worst_adversarial, seconds)
+        print(f"{label:18s} {len(text):6d} chars  {seconds * 1e3:8.1f} ms")
+    
+    status = "OK" if worst_adversarial < ADVERSARIAL_BUDGET_SECONDS else "OVER BUDGET"
+    print(f"worst adversarial input {worst_adversarial * 1e3:.1f} ms "
+          f"(budget {ADVERSARIAL_BUDGET_SECONDS * 1e3:.0f} ms): {status}")
+    failed = failed or worst_adversarial >= ADVERSARIAL_BUDGET_SECONDS
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
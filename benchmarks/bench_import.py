@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# FortiPass - Import Time Budget Check
+
+"""
+Check that the library and CLI entry points import quickly and never pull
+in GUI or PDF dependencies.
+
+Each module is imported in a fresh interpreter with ``-X importtime``. The
+interpreter first imports BASELINE, the standard library modules that any
+annotated Python library loads (typing alone takes 10-20 ms on a slow
+machine). What is left is the cost the project controls, so the budget is
+a few times the measured figure rather than a few milliseconds above it,
+and the best of several runs is compared against it. Exits non-zero if any
+module is over budget or imports a forbidden module; the forbidden-module
+check does not depend on timing at all.
+
+tests/test_import_time.py runs this script.
+
+Run from the repository root:
+
+    python benchmarks/bench_import.py [--budget-ms 20] [--runs 5]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# GUI and PDF dependencies must never load on the headless paths
+_HEADLESS = ("PyQt5", "reportlab")
+
+# Imported before the module under test and left out of its time
+BASELINE = ("typing", "re", "collections", "enum", "functools", "contextlib")
+
+# Modules that short-lived processes import: (module, budget multiplier,
+# top-level packages it must not import)
+MODULES = (
+    ("fortipass.core.password_analyzer", 1.0,
+     _HEADLESS + ("argparse", "tempfile", "secrets", "hashlib", "multiprocessing")),
+    ("fortipass.audit", 2.5, _HEADLESS + ("multiprocessing", "urllib")),
+    ("fortipass.main", 1.0, _HEADLESS),
+)
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def measure(module: str) -> tuple:
+    """
+    Import a module in a fresh interpreter after the BASELINE modules.
+    
+    Returns:
+        Tuple of (cumulative microseconds for the module, set of every
+        module imported along the way)
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import {', '.join(BASELINE)}; import {module}"],
+        stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, env=env,
+        universal_newlines=True, check=True
+    )
+    cumulative = None
+    imported = set()
+    for line in completed.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        if name == module:
+            cumulative = int(match.group(2))
+    return cumulative, imported
+
+
+def main(argv: list = None) -> int:
+    """Run the check and report per-module import times."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=20.0,
+                        help="Import budget for the core analyzer (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Fresh interpreters per module; the best run counts")
+    args = parser.parse_args(argv)
+    
+    # Make sure bytecode exists so compile time is not measured
+    subprocess.run([sys.executable, "-m", "compileall", "-q",
+                    os.path.join(ROOT, "fortipass")], check=True)
+    
+    failed = False
+    for module, multiplier, forbidden in MODULES:
+        budget = args.budget_ms * multiplier
+        timings = []
+        imported = set()
+        for _ in range(args.runs):
+            cumulative, imported = measure(module)
+            timings.append(cumulative / 1000.0)
+        best = min(timings)
+        
+        leaked = sorted(name for name in imported
+                        if name.split(".")[0] in forbidden)
+        status = "OK"
+        if best > budget:
+            status = "OVER BUDGET"
+            failed = True
+        if leaked:
+            status = f"FORBIDDEN IMPORTS: {', '.join(leaked)}"
+            failed = True
+        print(f"{module:40s} {best:7.1f} ms (budget {budget:.0f} ms)  {status}")
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# FortiPass - Result Memory Benchmark
+
+"""
+Compare the memory held by analysis results stored as AnalysisResult
+objects against the equivalent plain dicts (the pre-slots representation).
+
+Run from the repository root:
+
+    python benchmarks/bench_memory.py [count]
+"""
+
+import gc
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fortipass.core.password_analyzer import PasswordAnalyzer
+
+WORDLIST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "data", "common_passwords.txt")
+
+
+def _passwords(count: int) -> list:
+    """Deterministic mix of weak and random-looking passwords."""
+    rng = random.Random(1234)
+    alphabet = string.ascii_letters + string.digits + "!@#$%&*"
+    weak = ["password", "qwerty", "letmein", "dragon", "1990", "abc123"]
+    passwords = []
+    for index in range(count):
+        if index % 3 == 0:
+            passwords.append(rng.choice(weak) + str(rng.randint(0, 9999)))
+        else:
+            passwords.append("".join(rng.choice(alphabet)
+                                     for _ in range(rng.randint(8, 20))))
+    return passwords
+
+
+def _measure(build) -> tuple:
+    """Return (bytes retained, seconds) for the list produced by build()."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = build()
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return retained, elapsed
+
+
+def main(argv: list = None) -> int:
+    """Run the benchmark and print bytes per result for each representation."""
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 10000
+    analyzer = PasswordAnalyzer(WORDLIST)
+    passwords = _passwords(count)
+    
+    objects, object_seconds = _measure(
+        lambda: [analyzer.analyze(password) for password in passwords])
+    dicts, dict_seconds = _measure(
+        lambda: [analyzer.analyze(password).to_dict() for password in passwords])
+    
+    print(f"{count} results")
+    print(f"AnalysisResult  {objects / count:8.1f} bytes/result  {object_seconds:.2f}s")
+    print(f"dict            {dicts / count:8.1f} bytes/result  {dict_seconds:.2f}s")
+    print(f"saving          {100 * (1 - objects / dicts):8.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
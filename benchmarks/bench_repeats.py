@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# FortiPass - Repeated Sequence Worst-Case Benchmark
+
+"""
+Check that repeated-sequence detection stays fast on adversarial input.
+
+Times find_repeats() and a full PasswordAnalyzer.analyze() on input
+families that are hard for repeat finders: square-free text (worst case for
+the old ``(.{2,})\\1+`` regex), Fibonacci words (the most runs per
+character), random binary text, a single repeated character, a repeated
+word and random printable text. The regex is timed alongside them up to
+--regex-max characters for comparison.
+
+Exits non-zero if analyze() takes longer than the budget on any input of
+the largest size; the detector is only one stage of what a caller waits
+for.
+
+Run from the repository root:
+
+    python benchmarks/bench_repeats.py [--sizes 1000,2000,5000,10000] [--budget-ms 250]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fortipass.core.password_analyzer import PasswordAnalyzer
+from fortipass.core.repeats import find_repeats
+
+WORDLIST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "data", "common_passwords.txt")
+
+_OLD_RE = re.compile(r'(.{2,})\1+')
+
+
+def square_free(length: int) -> str:
+    """Ternary square-free word from the Thue-Morse sequence."""
+    thue_morse = [bin(index).count("1") % 2 for index in range(length + 2)]
+    return "".join("abc"[thue_morse[index + 1] - thue_morse[index] + 1]
+                   for index in range(length))
+
+
+def fibonacci(length: int) -> str:
+    """Prefix of the Fibonacci word, which maximizes the number of runs."""
+    previous, current = "a", "ab"
+    while len(current) < length:
+        previous, current = current, current + previous
+    return current[:length]
+
+
+def families(length: int, seed: int = 21) -> dict:
+    """Return the benchmark inputs of one length by family name."""
+    rng = random.Random(seed)
+    return {
+        "square_free": square_free(length),
+        "fibonacci": fibonacci(length),
+        "random_binary": "".join(rng.choice("ab") for _ in range(length)),
+        "single_char": "a" * length,
+        "repeated_word": ("password1" * (length // 9 + 1))[:length],
+        "random_printable": "".join(chr(rng.randint(33, 126)) for _ in range(length)),
+    }
+
+
+def best_time(function, text: str, repeat: int = 3) -> float:
+    """Return the fastest of several runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list = None) -> int:
+    """Run the benchmark and check the largest size against the budget."""
+    parser = argparse.ArgumentParser(description="Benchmark repeated-sequence detection.")
+    parser.add_argument("--sizes", default="1000,2000,5000,10000",
+                        help="Comma-separated input lengths (default: %(default)s)")
+    parser.add_argument("--budget-ms", type=float, default=250.0,
+                        help="Allowed time at the largest size (default: %(default)s)")
+    parser.add_argument("--regex-max", type=int, default=2000,
+                        help="Largest input also timed with the old regex (default: %(default)s)")
+    args = parser.parse_args(argv)
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    # No result cache, so every run repeats the full analysis
+    analyzer = PasswordAnalyzer(WORDLIST)
+    analyzer.preload()
+    
+    worst = 0.0
+    print(f"{'input':18s} {'length':>7s} {'runs':>6s} {'find_repeats':>13s} "
+          f"{'analyze':>11s} {'old regex':>11s}")
+    for size in sizes:
+        for name, text in families(size).items():
+            seconds = best_time(find_repeats, text)
+            runs = len(find_repeats(text))
+            analyze_seconds = best_time(analyzer.analyze, text)
+            regex = "-"
+            if size <= args.regex_max:
+                regex = f"{best_time(_OLD_RE.search, text, 1) * 1e3:8.1f} ms"
+            print(f"{name:18s} {size:7d} {runs:6d} {seconds * 1e3:10.1f} ms "
+                  f"{analyze_seconds * 1e3:8.1f} ms {regex:>11s}")
+            if size == sizes[-1]:
+                worst = max(worst, analyze_seconds)
+    
+    status = "OK" if worst * 1e3 <= args.budget_ms else "OVER BUDGET"
+    print(f"worst analyze() at {sizes[-1]} characters: {worst * 1e3:.1f} ms "
+          f"(budget {args.budget_ms:.0f} ms): {status}")
+    return 0 if status == "OK" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# FortiPass - HTTP Service Load Generator
+
+"""
+Drive the HTTP service with concurrent keep-alive clients and report
+throughput and latency percentiles.
+
+By default a server is started on a free localhost port for the duration
+of the run; pass --host/--port to target one that is already running.
+
+Run from the repository root:
+
+    python benchmarks/bench_server.py --connections 32 --requests 5000
+    python benchmarks/bench_server.py --batch 100 --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import string
+import subprocess
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_LISTENING_RE = re.compile(r"listening on http://([^:]+):(\d+)")
+
+
+def _passwords(count: int, seed: int = 1234) -> list:
+    """Deterministic mix of weak and random-looking passwords."""
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + "!@#$%&*"
+    weak = ["password", "qwerty", "letmein", "dragon", "1990", "abc123"]
+    passwords = []
+    for index in range(count):
+        if index % 3 == 0:
+            passwords.append(rng.choice(weak) + str(rng.randint(0, 9999)))
+        else:
+            passwords.append("".join(rng.choice(alphabet)
+                                     for _ in range(rng.randint(8, 20))))
+    return passwords
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+async def _client(host: str, port: int, bodies: list, path: str,
+                  latencies: list, statuses: Counter) -> None:
+    """Send requests over one keep-alive connection, recording latencies."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                       f"Content-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            
+            status_line = await reader.readline()
+            length = 0
+            close = False
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                name = name.strip().lower()
+                if name == "content-length":
+                    length = int(value)
+                elif name == "connection" and value.strip().lower() == "close":
+                    close = True
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            statuses[int(status_line.split()[1])] += 1
+            if close:
+                break
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, connections: int, requests: int,
+                   batch: int) -> dict:
+    """
+    Issue requests from concurrent connections.
+    
+    Returns:
+        Summary with throughput, latency percentiles and status counts
+    """
+    passwords = _passwords(max(requests * max(batch, 1), 1))
+    if batch:
+        path = "/analyze/batch"
+        bodies = [json.dumps({"passwords": passwords[i * batch:(i + 1) * batch]}).encode()
+                  for i in range(requests)]
+    else:
+        path = "/analyze"
+        bodies = [json.dumps({"password": password}).encode() for password in passwords]
+    
+    latencies = []
+    statuses = Counter()
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, bodies[index::connections], path, latencies, statuses)
+        for index in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "passwords": len(latencies) * max(batch, 1),
+        "elapsed": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        "statuses": dict(statuses)
+    }
+
+
+def _start_server(workers: int, max_concurrency: int) -> tuple:
+    """Start a local server on a free port; returns (process, host, port)."""
+    command = [sys.executable, "-m", "fortipass.server", "--port", "0"]
+    if workers:
+        command += ["--workers", str(workers)]
+    if max_concurrency:
+        command += ["--max-concurrency", str(max_concurrency)]
+    process = subprocess.Popen(command, stderr=subprocess.PIPE, universal_newlines=True,
+                               env=dict(os.environ, PYTHONPATH=ROOT))
+    line = process.stderr.readline()
+    match = _LISTENING_RE.search(line)
+    if not match:
+        process.kill()
+        raise RuntimeError(f"Server failed to start: {line.strip()}")
+    return process, match.group(1), int(match.group(2))
+
+
+def main(argv: list = None) -> int:
+    """Run the load test and print a summary."""
+    parser = argparse.ArgumentParser(description="Load test the FortiPass HTTP service.")
+    parser.add_argument("--host", default=None, help="Target an already running server")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=16,
+                        help="Concurrent keep-alive connections (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="Total requests (default: %(default)s)")
+    parser.add_argument("--batch", type=int, default=0,
+                        help="Passwords per /analyze/batch request (0 uses /analyze)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Workers for the spawned server (default: CPU count)")
+    parser.add_argument("--max-concurrency", type=int, default=None,
+                        help="Concurrency limit for the spawned server")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+    
+    process = None
+    host, port = args.host, args.port
+    if host is None:
+        process, host, port = _start_server(args.workers, args.max_concurrency)
+    try:
+        summary = asyncio.run(run_load(host, port, args.connections,
+                                       args.requests, args.batch))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{summary['requests']} requests ({summary['passwords']} passwords) "
+              f"in {summary['elapsed']}s: {summary['requests_per_second']} req/s")
+        print(f"latency p50 {summary['p50_ms']} ms  p90 {summary['p90_ms']} ms  "
+              f"p99 {summary['p99_ms']} ms  max {summary['max_ms']} ms")
+        print(f"statuses {summary['statuses']}")
+    return 0 if set(summary["statuses"]) <= {200} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
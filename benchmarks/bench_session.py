@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# FortiPass - Incremental Session Benchmark
+
+"""
+Compare per-keystroke cost of AnalysisSession against full re-analysis.
+
+Types a long passphrase one character at a time and times the last
+keystrokes, then applies random edits and checks every session result
+against PasswordAnalyzer.analyze().
+
+Run from the repository root:
+
+    python benchmarks/bench_session.py [--length 128] [--edits 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fortipass.core.password_analyzer import PasswordAnalyzer
+from fortipass.core.session import AnalysisSession
+
+WORDLIST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "data", "common_passwords.txt")
+
+PASSPHRASE = "correct horse battery staple Tr0ub4dor&3 summer2023 qwerty "
+
+
+def time_typing(analyzer: PasswordAnalyzer, text: str, tail: int = 16) -> tuple:
+    """
+    Type text one character at a time.
+
+    Returns:
+        Tuple of (full re-analysis, session) mean seconds per keystroke over
+        the last ``tail`` keystrokes
+    """
+    session = AnalysisSession(analyzer)
+    for index in range(len(text) - tail):
+        session.insert(index, text[index])
+
+    started = time.perf_counter()
+    for index in range(len(text) - tail, len(text)):
+        session.insert(index, text[index])
+        session.result()
+    incremental = (time.perf_counter() - started) / tail
+
+    started = time.perf_counter()
+    for index in range(len(text) - tail, len(text)):
+        analyzer.analyze(text[:index + 1])
+    full = (time.perf_counter() - started) / tail
+    return full, incremental
+
+
+def check_edits(analyzer: PasswordAnalyzer, edits: int, seed: int = 7) -> int:
+    """
+    Apply random edits and compare each result with a full analysis.
+
+    Returns:
+        Number of mismatching results
+    """
+    rng = random.Random(seed)
+    alphabet = "abcxyz0123456789QWERTY!@ "
+    tokens = ["password", "qwerty", "1990", "abc", "aaaa", "dragon"]
+    session = AnalysisSession(analyzer)
+    mismatches = 0
+    for _ in range(edits):
+        text = session.text
+        position = rng.randint(0, len(text))
+        if text and rng.random() < 0.4:
+            position = min(position, len(text) - 1)
+            session.delete(position, rng.randint(1, min(3, len(text) - position)))
+        else:
+            chars = rng.choice(tokens) if rng.random() < 0.3 else rng.choice(alphabet)
+            session.insert(position, chars)
+        if len(session) > 96:
+            session.set_text(session.text[:48])
+        if session.result().to_dict() != analyzer.analyze(session.text).to_dict():
+            mismatches += 1
+    return mismatches
+
+
+def main(argv: list = None) -> int:
+    """Run the benchmark and the differential check."""
+    parser = argparse.ArgumentParser(description="Benchmark incremental re-analysis.")
+    parser.add_argument("--length", type=int, default=128,
+                        help="Passphrase length to type (default: %(default)s)")
+    parser.add_argument("--edits", type=int, default=2000,
+                        help="Random edits for the differential check (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    analyzer = PasswordAnalyzer(WORDLIST)
+    analyzer.preload()
+
+    length = 16
+    while length <= args.length:
+        text = (PASSPHRASE * (length // len(PASSPHRASE) + 1))[:length]
+        full, incremental = time_typing(analyzer, text, min(16, length))
+        print(f"{length:4d} chars  full {full * 1e3:7.3f} ms/key  "
+              f"session {incremental * 1e3:7.3f} ms/key  ({full / incremental:5.1f}x)")
+        length *= 2
+
+    mismatches = check_edits(analyzer, args.edits)
+    print(f"{args.edits} random edits: {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
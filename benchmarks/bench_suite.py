@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# FortiPass - Benchmark Suite
+
+"""
+Time the analyzer, generator and report paths on synthetic corpora and
+write the results as JSON, so runs can be compared across commits.
+
+Cases are grouped as:
+
+- load: wordlist loading and matcher construction
+- analyze: analyze() over short weak, long random, passphrase-like and
+  bundled common passwords, and over inputs built to trigger each pattern
+  type
+- generate: generate_strong_password() across lengths and option sets, and
+  generate_many() for the same lengths
+- report: ReportGenerator.export_json() and export_pdf()
+
+Every case reports the best and median seconds per item over several
+repeats. With ``--baseline`` the run is compared against an earlier JSON
+file, and the script exits 1 if any case is slower than the baseline by
+more than ``--threshold``.
+
+Run from the repository root:
+    
+    python benchmarks/bench_suite.py --output bench.json
+    python benchmarks/bench_suite.py --baseline bench.json --threshold 0.25
+    python benchmarks/bench_suite.py --filter analyze/ --quick
+"""
+
+import argparse
+import atexit
+import datetime
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fortipass.core import password_analyzer
+from fortipass.core.password_analyzer import PasswordAnalyzer
+from fortipass.utils.report_generator import ReportGenerator
+
+WORDLIST = os.path.join(ROOT, "data", "common_passwords.txt")
+
+# Version of the JSON layout written by this script
+SCHEMA = 1
+
+# Passwords per analyze corpus
+CORPUS_SIZE = 200
+
+_SYMBOLS = "!@#$%&*-_."
+
+
+def _read_wordlist() -> list:
+    """Return the bundled common passwords in file order."""
+    with open(WORDLIST, "r", encoding="utf-8", errors="ignore") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def build_corpora(seed: int = 19) -> dict:
+    """
+    Build the deterministic analyze corpora.
+    
+    Returns:
+        Mapping of corpus name to a list of passwords
+    """
+    rng = random.Random(seed)
+    common = _read_wordlist()
+    words = [word for word in common if word.isalpha() and 4 <= len(word) <= 8]
+    alphabet = string.ascii_letters + string.digits + _SYMBOLS
+    
+    def many(make) -> list:
+        return [make() for _ in range(CORPUS_SIZE)]
+    
+    def date() -> str:
+        return f"{rng.randint(1, 28):02d}{rng.randint(1, 12):02d}{rng.randint(1950, 2024)}"
+    
+    return {
+        "weak_short": many(lambda: rng.choice(words)[:6] + str(rng.randint(0, 999))),
+        "long_random": many(lambda: "".join(rng.choice(alphabet)
+                                            for _ in range(rng.randint(32, 64)))),
+        "passphrase": many(lambda: rng.choice(" -_.").join(
+            rng.choice(words) for _ in range(rng.randint(4, 6)))),
+        "common": common[:CORPUS_SIZE],
+        # Each pattern corpus wraps the pattern in random filler so the
+        # other detectors still run over realistic text
+        "pattern_dictionary": many(lambda: rng.choice(_SYMBOLS) + rng.choice(words) +
+                                   str(rng.randint(10, 99))),
+        "pattern_keyboard": many(lambda: rng.choice(["qwerty", "asdfgh", "zxcvbn", "qazwsx"]) +
+                                 rng.choice(_SYMBOLS) + str(rng.randint(10, 99))),
+        "pattern_sequential": many(lambda: rng.choice(["abcdef", "123456", "uvwxyz", "456789"]) +
+                                   rng.choice(_SYMBOLS) + rng.choice(string.ascii_uppercase)),
+        "pattern_repeated_chars": many(lambda: rng.choice(string.ascii_letters) * rng.randint(3, 6) +
+                                       rng.choice(_SYMBOLS) + str(rng.randint(10, 99))),
+        "pattern_date": many(lambda: rng.choice(string.ascii_uppercase) + date() +
+                             rng.choice(_SYMBOLS)),
+        "pattern_repeated_sequence": many(lambda: "".join(
+            rng.choice(alphabet) for _ in range(rng.randint(2, 4))) * rng.randint(2, 4)),
+    }
+
+
+def build_cases(directory: str) -> list:
+    """
+    Build the benchmark cases.
+    
+    Args:
+        directory: Scratch directory for exported reports
+    
+    Returns:
+        List of (name, items per call, callable or skip reason) tuples
+    """
+    cases = []
+    
+    # Loading is lazy: the constructor only records paths, so the cost of
+    # a fresh analyzer is split into reading the wordlist and building the
+    # substring automaton from it. Built automata are shared per wordlist
+    # file, so the shared cache is cleared to time a cold build
+    def preload_cold():
+        password_analyzer._MATCHERS.clear()
+        PasswordAnalyzer(WORDLIST).preload()
+    
+    cases.append(("load/wordlist", 1, lambda: PasswordAnalyzer(WORDLIST).common_words))
+    cases.append(("load/preload", 1, preload_cold))
+    
+    analyzer = PasswordAnalyzer(WORDLIST)
+    analyzer.preload()
+    for name, passwords in build_corpora().items():
+        def analyze_all(passwords=passwords):
+            for password in passwords:
+                analyzer.analyze(password)
+        cases.append((f"analyze/{name}", len(passwords), analyze_all))
+    
+    options = {
+        "all": {},
+        "lower": {"include_uppercase": False, "include_digits": False,
+                  "include_symbols": False},
+        "alnum": {"include_symbols": False},
+    }
+    for length in (8, 16, 32, 64):
+        for label, kwargs in options.items():
+            def generate(length=length, kwargs=kwargs):
+                for _ in range(100):
+                    analyzer.generate_strong_password(length, **kwargs)
+            cases.append((f"generate/{label}/{length}", 100, generate))
+        cases.append((f"generate_many/all/{length}", 1000,
+                      lambda length=length: list(analyzer.generate_many(1000, length))))
+    
+    reports = ReportGenerator()
+    results = analyzer.analyze("Summer2023!qwerty")
+    json_path = os.path.join(directory, "report.json")
+    pdf_path = os.path.join(directory, "report.pdf")
+    cases.append(("report/json", 1, lambda: reports.export_json(results, json_path)))
+    try:
+        import reportlab  # noqa: F401
+    except ImportError:
+        cases.append(("report/pdf", 1, "reportlab is not installed"))
+    else:
+        cases.append(("report/pdf", 1, lambda: reports.export_pdf(results, pdf_path)))
+    return cases
+
+
+def time_case(function, items: int, repeat: int, min_time: float) -> dict:
+    """
+    Time a callable, calibrating the number of calls per repeat.
+    
+    Args:
+        function: Callable to time
+        items: Items processed per call, used to report per-item cost
+        repeat: Number of timed repeats
+        min_time: Minimum seconds per repeat
+    
+    Returns:
+        Result entry for the JSON output
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - started) / (number * items))
+    best = min(samples)
+    return {
+        "seconds_per_item": best,
+        "median_seconds_per_item": statistics.median(samples),
+        "items_per_second": 1.0 / best if best > 0 else None,
+        "calls_per_repeat": number,
+        "items_per_call": items,
+        "repeat": repeat,
+    }
+
+
+def _git_commit() -> str:
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        output = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                universal_newlines=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare two runs case by case.
+    
+    Args:
+        current: Result document of this run
+        baseline: Result document to compare against
+        threshold: Allowed slowdown as a fraction (0.25 allows 25%)
+    
+    Returns:
+        List of (name, baseline seconds, current seconds, ratio, regressed)
+        tuples for cases timed in both runs
+    """
+    previous = baseline.get("results", {})
+    rows = []
+    for name, entry in current["results"].items():
+        old = previous.get(name)
+        if not old or "seconds_per_item" not in old or "seconds_per_item" not in entry:
+            continue
+        ratio = entry["seconds_per_item"] / old["seconds_per_item"]
+        rows.append((name, old["seconds_per_item"], entry["seconds_per_item"],
+                     ratio, ratio > 1.0 + threshold))
+    return rows
+
+
+def _format_seconds(seconds: float) -> str:
+    """Format a duration with a readable unit."""
+    if seconds >= 1.0:
+        return f"{seconds:8.3f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.3f} ms"
+    return f"{seconds * 1e6:8.2f} us"
+
+
+def main(argv: list = None) -> int:
+    """Run the suite, write JSON and compare against a baseline if given."""
+    parser = argparse.ArgumentParser(description="Run the FortiPass benchmark suite.")
+    parser.add_argument("--output", "-o", default=None,
+                        help="Write results as JSON to this file ('-' for stdout)")
+    parser.add_argument("--baseline", default=None,
+                        help="Earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown before a case counts as a regression "
+                             "(default: %(default)s)")
+    parser.add_argument("--filter", default=None,
+                        help="Only run cases whose name matches this regular expression")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Timed repeats per case (default: %(default)s)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds per repeat (default: %(default)s)")
+    parser.add_argument("--quick", action="store_true",
+                        help="Smoke run: 2 repeats of at least 0.02 s each")
+    args = parser.parse_args(argv)
+    
+    if args.quick:
+        args.repeat, args.min_time = 2, 0.02
+    
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f"bench_suite: cannot read baseline: {e}\n")
+            return 2
+    
+    pattern = re.compile(args.filter) if args.filter else None
+    document = {
+        "schema": SCHEMA,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "settings": {"repeat": args.repeat, "min_time": args.min_time},
+        "results": {},
+    }
+    
+    # Progress goes to stderr so '--output -' stays valid JSON
+    log = sys.stderr if args.output == "-" else sys.stdout
+    directory = tempfile.mkdtemp(prefix="fortipass-bench-")
+    atexit.register(shutil.rmtree, directory, True)
+    for name, items, function in build_cases(directory):
+        if pattern and not pattern.search(name):
+            continue
+        if isinstance(function, str):
+            document["results"][name] = {"skipped": function}
+            print(f"{name:32s}  skipped: {function}", file=log)
+            continue
+        entry = time_case(function, items, args.repeat, args.min_time)
+        document["results"][name] = entry
+        print(f"{name:32s}  {_format_seconds(entry['seconds_per_item'])}/item  "
+              f"median {_format_seconds(entry['median_seconds_per_item'])}", file=log)
+    
+    if args.output == "-":
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+    
+    if baseline is None:
+        return 0
+    
+    rows = compare(document, baseline, args.threshold)
+    regressions = [row for row in rows if row[4]]
+    print(f"\nCompared with {args.baseline} ({baseline.get('commit') or 'unknown commit'}):",
+          file=log)
+    for name, old, new, ratio, regressed in rows:
+        marker = "REGRESSION" if regressed else ""
+        print(f"{name:32s}  {_format_seconds(old)} -> {_format_seconds(new)}  "
+              f"{ratio:6.2f}x  {marker}", file=log)
+    print(f"{len(regressions)} of {len(rows)} cases slower than "
+          f"{1.0 + args.threshold:.2f}x baseline", file=log)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
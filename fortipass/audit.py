@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# FortiPass - Headless Batch Auditor
+# Command-line entry point for auditing password lists without the GUI
+
+"""
+Stream a password list through the analysis engine.
+
+Passwords are read lazily from a file or stdin and results are written as
+they complete, so memory stays bounded by the worker window regardless of
+input size. Plaintext passwords are never written to the output.
+
+Input is decoded as UTF-8 with surrogateescape, so bytes that are not valid
+UTF-8 are kept rather than dropped: such passwords are audited exactly as
+they appear on file, user names are written back byte for byte, and the
+number of affected lines is reported on stderr.
+
+Examples:
+
+    fortipass-audit passwords.txt > results.jsonl
+    fortipass-audit dump.txt --input-format userpass --workers 8
+    fortipass-audit users.csv --input-format csv --column password --output-format csv
+    cat passwords.txt | fortipass-audit - --fields strength_score,strength_category
+
+This module must not import PyQt5 or reportlab.
+"""
+
+import argparse
+import csv
+import importlib.util
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from fortipass.core.batch import BatchAnalyzer
+from fortipass.core.budget import AnalysisBudget
+from fortipass.core.password_analyzer import PasswordAnalyzer
+from fortipass.core.results import RESULT_FIELDS
+from fortipass.utils.aggregate_report import AggregateReport
+
+DEFAULT_WORDLIST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "data", "common_passwords.txt")
+
+INPUT_FORMATS = ("lines", "csv", "userpass")
+OUTPUT_FORMATS = ("jsonl", "csv")
+
+# Seconds between progress lines on stderr
+_PROGRESS_INTERVAL = 2.0
+
+# Characters surrogateescape substitutes for undecodable input bytes
+_ESCAPED_BYTE_RE = re.compile("[\udc80-\udcff]")
+
+
+class InputRecord:
+    """One password read from the input, with where it came from."""
+    
+    __slots__ = ("line", "user", "password")
+    
+    def __init__(self, line: int, user: Optional[str], password: str):
+        """
+        Create a record.
+        
+        Args:
+            line: 1-based line number in the input
+            user: Account name for user:password input, otherwise None
+            password: Plaintext password
+        """
+        self.line = line
+        self.user = user
+        self.password = password
+
+
+def read_lines(stream: TextIO) -> Iterator[InputRecord]:
+    """Yield one record per non-empty line; the whole line is the password."""
+    for number, line in enumerate(stream, 1):
+        password = line.rstrip("\r\n")
+        if password:
+            yield InputRecord(number, None, password)
+
+
+def read_userpass(stream: TextIO, separator: str = ":") -> Iterator[InputRecord]:
+    """
+    Yield records from ``user<separator>password`` lines.
+    
+    The line is split on the first separator, so passwords may contain it.
+    Lines without a separator are skipped.
+    """
+    for number, line in enumerate(stream, 1):
+        user, found, password = line.rstrip("\r\n").partition(separator)
+        if found and password:
+            yield InputRecord(number, user, password)
+
+
+def read_csv(stream: TextIO, column: str = "0", delimiter: str = ",",
+             user_column: Optional[str] = None) -> Iterator[InputRecord]:
+    """
+    Yield records from one column of a CSV file.
+    
+    Args:
+        stream: Text stream to read
+        column: Zero-based column index, or a header name (the first row is
+            then treated as the header)
+        delimiter: Field delimiter
+        user_column: Optional column, by index or header name, holding the
+            account name
+    """
+    reader = csv.reader(stream, delimiter=delimiter)
+    header = None
+    if not column.isdigit() or (user_column is not None and not user_column.isdigit()):
+        header = next(reader, None)
+        if header is None:
+            return
+    password_index = _column_index(column, header)
+    user_index = _column_index(user_column, header) if user_column is not None else None
+    
+    for row in reader:
+        if password_index >= len(row) or not row[password_index]:
+            continue
+        user = row[user_index] if user_index is not None and user_index < len(row) else None
+        yield InputRecord(reader.line_num, user, row[password_index])
+
+
+def _column_index(column: str, header: Optional[List[str]]) -> int:
+    """Resolve a column given by index or header name."""
+    if column.isdigit():
+        return int(column)
+    try:
+        return header.index(column)
+    except ValueError:
+        raise ValueError(f"Column not found in CSV header: {column}")
+
+
+def _record_fields(record: InputRecord) -> Dict[str, Any]:
+    """Identifying fields written alongside each result."""
+    data = {"line": record.line}
+    if record.user is not None:
+        data["user"] = record.user
+    return data
+
+
+class JsonLinesWriter:
+    """Write one JSON object per result."""
+    
+    def __init__(self, stream: TextIO):
+        """
+        Args:
+            stream: Output text stream; results already carry only the
+                requested keys
+        """
+        self.stream = stream
+    
+    def write(self, record: InputRecord, result) -> None:
+        """Write the result for one input record."""
+        data = _record_fields(record)
+        data.update(result.to_dict())
+        self.stream.write(json.dumps(data, ensure_ascii=False))
+        self.stream.write("\n")
+
+
+class CsvWriter:
+    """Write results as CSV rows with flattened patterns and feedback."""
+    
+    def __init__(self, stream: TextIO, fields: Optional[Iterable[str]]):
+        """
+        Args:
+            stream: Output text stream
+            fields: Result keys to write, or None for all of them
+        """
+        wanted = RESULT_FIELDS if fields is None else [
+            key for key in RESULT_FIELDS if key in fields]
+        self.columns = ["line", "user"] + list(wanted)
+        self.writer = csv.writer(stream)
+        self.writer.writerow(self.columns)
+    
+    def write(self, record: InputRecord, result) -> None:
+        """Write the result for one input record."""
+        row = [record.line, record.user if record.user is not None else ""]
+        for key in self.columns[2:]:
+            value = result.get(key)
+            if key == "patterns":
+                value = ";".join(pattern.type.value for pattern in value)
+            elif key == "feedback":
+                value = " | ".join(value)
+            row.append("" if value is None else value)
+        self.writer.writerow(row)
+
+
+class ProgressReporter:
+    """Periodic progress and throughput lines on stderr."""
+    
+    def __init__(self, stream: TextIO, interval: float = _PROGRESS_INTERVAL):
+        """
+        Args:
+            stream: Stream to report on, normally sys.stderr
+            interval: Seconds between progress lines
+        """
+        self.stream = stream
+        self.interval = interval
+        self.started_at = time.perf_counter()
+        self._last_report = self.started_at
+    
+    def update(self, processed: int) -> None:
+        """Report progress if the interval has elapsed."""
+        now = time.perf_counter()
+        if now - self._last_report < self.interval:
+            return
+        self._last_report = now
+        elapsed = now - self.started_at
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        self.stream.write(f"fortipass-audit: {processed:,} passwords, "
+                          f"{elapsed:.1f}s, {rate:,.0f}/s\n")
+        self.stream.flush()
+
+
+def count_undecodable(records: Iterable[InputRecord],
+                      counts: Dict[str, int]) -> Iterator[InputRecord]:
+    """
+    Pass records through, counting those with bytes that were not UTF-8.
+    
+    Args:
+        records: Records read from a surrogateescape-decoded stream
+        counts: Mapping whose "undecodable" entry is incremented
+    """
+    for record in records:
+        if (_ESCAPED_BYTE_RE.search(record.password) or
+                (record.user is not None and _ESCAPED_BYTE_RE.search(record.user))):
+            counts["undecodable"] = counts.get("undecodable", 0) + 1
+        yield record
+
+
+def _open_input(path: str) -> TextIO:
+    """Open the input file, or wrap stdin for '-'."""
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8",
+                                errors="surrogateescape", newline="")
+    return open(path, "r", encoding="utf-8", errors="surrogateescape", newline="")
+
+
+def _open_output(path: Optional[str]) -> TextIO:
+    """Open the output file, or wrap stdout for None and '-'."""
+    # surrogateescape writes undecodable input bytes in user names back as is
+    if path is None or path == "-":
+        sys.stdout.flush()
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8",
+                                errors="surrogateescape", newline="")
+    return open(path, "w", encoding="utf-8", errors="surrogateescape", newline="")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Create the command-line parser."""
+    parser = argparse.ArgumentParser(
+        prog="fortipass-audit",
+        description="Audit a password list with FortiPass and stream the results."
+    )
+    parser.add_argument("input", help="Input file, or '-' for stdin")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Output file (default: stdout)")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, default="lines",
+                        help="Input layout (default: %(default)s)")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, default="jsonl",
+                        help="Output layout (default: %(default)s)")
+    parser.add_argument("--column", default="0",
+                        help="CSV password column, by index or header name (default: %(default)s)")
+    parser.add_argument("--user-column", default=None,
+                        help="CSV account name column, by index or header name")
+    parser.add_argument("--delimiter", default=",",
+                        help="CSV field delimiter (default: %(default)r)")
+    parser.add_argument("--separator", default=":",
+                        help="user/password separator for userpass input (default: %(default)r)")
+    parser.add_argument("--fields", default=None,
+                        help="Comma-separated result fields to compute (default: all)")
+    parser.add_argument("--wordlist", default=DEFAULT_WORDLIST,
+                        help="Common password wordlist (default: bundled list)")
+    parser.add_argument("--index", default=None, help="Prebuilt dictionary index")
+    parser.add_argument("--bloom", default=None, help="Bloom filter built over the dictionary")
+    parser.add_argument("--breach-store", default=None,
+                        help="Directory of SHA-1 range shards for breach screening")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="Passwords per worker task (default: %(default)s)")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="Score pattern-free passwords with NumPy (if installed)")
+    parser.add_argument("--summary-json", default=None,
+                        help="Also write an aggregate summary of all results as JSON")
+    parser.add_argument("--summary-pdf", default=None,
+                        help="Also write an aggregate summary with charts as PDF (needs reportlab)")
+    parser.add_argument("--top-k", type=int, default=25,
+                        help="Weakest accounts listed in the summary (default: %(default)s)")
+    parser.add_argument("--max-chars", type=int, default=None,
+                        help="Inspect at most this many characters per password")
+    parser.add_argument("--max-matches", type=int, default=None,
+                        help="Keep at most this many pattern matches per password")
+    parser.add_argument("--time-budget-ms", type=float, default=None,
+                        help="Skip expensive stages once an analysis takes this long")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Suppress progress and summary output on stderr")
+    return parser
+
+
+def _read_records(args: argparse.Namespace, stream: TextIO) -> Iterator[InputRecord]:
+    """Select the reader for the requested input format."""
+    if args.input_format == "csv":
+        return read_csv(stream, args.column, args.delimiter, args.user_column)
+    if args.input_format == "userpass":
+        return read_userpass(stream, args.separator)
+    return read_lines(stream)
+
+
+def audit(records: Iterable[InputRecord], engine: BatchAnalyzer, writer,
+          progress: Optional[ProgressReporter] = None,
+          report: Optional[AggregateReport] = None) -> int:
+    """
+    Analyze records and write each result as it completes.
+    
+    Records waiting for their results are kept in a queue that never grows
+    beyond the engine's in-flight window.
+    
+    Args:
+        records: Input records, consumed lazily
+        engine: Ordered batch engine to run the analysis
+        writer: JsonLinesWriter or CsvWriter
+        progress: Optional stderr progress reporter
+        report: Optional aggregate report fed every result, labelled by
+            user name or line number
+    
+    Returns:
+        Number of passwords audited
+    """
+    waiting = deque()
+    
+    def passwords() -> Iterator[str]:
+        for record in records:
+            waiting.append(record)
+            yield record.password
+    
+    processed = 0
+    for result in engine.analyze(passwords()):
+        record = waiting.popleft()
+        writer.write(record, result)
+        if report is not None:
+            report.add(result, record.user if record.user is not None else f"line {record.line}")
+        processed += 1
+        if progress is not None:
+            progress.update(processed)
+    return processed
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point for the batch auditor."""
+    args = _build_parser().parse_args(argv)
+    
+    fields = None
+    if args.fields:
+        fields = [name.strip() for name in args.fields.split(",") if name.strip()]
+    
+    try:
+        budget = None
+        if (args.max_chars is not None or args.max_matches is not None or
+                args.time_budget_ms is not None):
+            budget = AnalysisBudget(
+                args.max_chars, args.max_matches,
+                None if args.time_budget_ms is None else args.time_budget_ms / 1000.0)
+        analyzer = PasswordAnalyzer(
+            args.wordlist if args.wordlist and os.path.exists(args.wordlist) else None,
+            index_path=args.index, bloom_path=args.bloom,
+            breach_store_path=args.breach_store, budget=budget
+        )
+        engine = BatchAnalyzer(analyzer=analyzer, workers=args.workers,
+                               chunk_size=args.chunk_size, ordered=True, fields=fields,
+                               vectorized=args.vectorized)
+        report = None
+        if args.summary_json or args.summary_pdf:
+            if args.summary_pdf and importlib.util.find_spec("reportlab") is None:
+                raise ValueError("--summary-pdf requires reportlab (pip install reportlab)")
+            report = AggregateReport(top_k=args.top_k)
+        source = _open_input(args.input)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"fortipass-audit: {e}\n")
+        return 2
+    
+    output = _open_output(args.output)
+    progress = None if args.quiet else ProgressReporter(sys.stderr)
+    counts = {}
+    
+    try:
+        if args.output_format == "csv":
+            writer = CsvWriter(output, engine.fields)
+        else:
+            writer = JsonLinesWriter(output)
+        records = count_undecodable(_read_records(args, source), counts)
+        audit(records, engine, writer, progress, report)
+        # Summaries are written once every result has been counted
+        if report is not None and args.summary_json:
+            report.export_json(args.summary_json)
+        if report is not None and args.summary_pdf:
+            report.export_pdf(args.summary_pdf)
+    except BrokenPipeError:
+        # Downstream consumer (e.g. head) closed the pipe; stop quietly and
+        # keep the interpreter from failing on its final stdout flush.
+        # BrokenPipeError is an OSError, so this must come first
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"fortipass-audit: {e}\n")
+        return 2
+    finally:
+        if args.input == "-":
+            # The wrapper from _open_input() does not own sys.stdin.buffer
+            source.detach()
+        else:
+            source.close()
+        if args.output is None or args.output == "-":
+            # The wrapper from _open_output() does not own sys.stdout.buffer
+            output.flush()
+            output.detach()
+        else:
+            output.close()
+    
+    undecodable = counts.get("undecodable", 0)
+    if undecodable:
+        # Reported even with --quiet: these passwords are not valid UTF-8
+        sys.stderr.write(f"fortipass-audit: warning: {undecodable:,} record(s) contained "
+                         f"bytes that are not valid UTF-8; they were audited as raw bytes\n")
+    if not args.quiet:
+        sys.stderr.write(f"fortipass-audit: {engine.stats.report()}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
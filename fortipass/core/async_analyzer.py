@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# FortiPass - Asynchronous Analysis Facade
+
+"""
+asyncio front end for PasswordAnalyzer.
+
+Analysis is CPU-bound, so calling analyze() directly from a coroutine
+stalls the event loop. AsyncPasswordAnalyzer runs it on an executor
+instead. With micro-batching enabled, analyze() calls that arrive within a
+few milliseconds of each other are coalesced into one executor call, which
+amortizes the dispatch cost (significant for process pools) over the batch.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from fortipass.core import batch
+from fortipass.core.password_analyzer import PasswordAnalyzer
+from fortipass.core.results import AnalysisResult
+
+# Executor shared by every facade that is not given one
+_shared_executor = None
+
+# Analyzers built inside this worker process, by PasswordAnalyzer.config()
+_worker_analyzers = {}
+
+
+def _get_shared_executor() -> Executor:
+    """Return the process-wide default thread pool, creating it on first use."""
+    global _shared_executor
+    if _shared_executor is None:
+        _shared_executor = ThreadPoolExecutor(thread_name_prefix="fortipass")
+    return _shared_executor
+
+
+def _analyze_in_worker(config: tuple, passwords: List[str],
+                       fields: Optional[frozenset]) -> List[AnalysisResult]:
+    """
+    Analyze a batch inside a process pool worker.
+    
+    Works in any process pool. Workers started by process_executor() reuse
+    the analyzer it installed when its configuration matches; other workers
+    build one from config on their first batch and keep it.
+    """
+    analyzer = _worker_analyzers.get(config)
+    if analyzer is None:
+        try:
+            analyzer = batch.worker_analyzer()
+        except RuntimeError:
+            analyzer = None
+        if analyzer is None or analyzer.config() != config:
+            analyzer = PasswordAnalyzer(**dict(config))
+            analyzer.preload()
+        _worker_analyzers[config] = analyzer
+    return [analyzer._analyze(password, fields) for password in passwords]
+
+
+def process_executor(analyzer: PasswordAnalyzer, workers: int = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool whose workers hold a copy of the analyzer.
+    
+    Args:
+        analyzer: Analyzer to install in every worker
+        workers: Number of worker processes (defaults to the CPU count)
+    
+    Returns:
+        Executor suitable for AsyncPasswordAnalyzer(executor=...)
+    """
+    analyzer.preload()
+    return ProcessPoolExecutor(workers, initializer=batch.init_worker,
+                               initargs=(analyzer, None))
+
+
+class BatchMetrics:
+    """Queue depth and batch size counters for micro-batching."""
+    
+    def __init__(self):
+        """Initialize empty counters."""
+        self.requests = 0
+        self.batches = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.max_batch_size = 0
+        self.in_flight_batches = 0
+        self.total_wait = 0.0
+        # Batch size -> number of batches of that size
+        self.batch_sizes = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the counters as a dictionary."""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight_batches": self.in_flight_batches,
+            "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "mean_wait_ms": round(self.total_wait / self.requests * 1000, 3) if self.requests else 0.0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items()))
+        }
+
+
+class AsyncPasswordAnalyzer:
+    """
+    Awaitable wrapper around PasswordAnalyzer.
+    Work runs on an executor so the event loop stays responsive.
+    """
+    
+    def __init__(self, analyzer: PasswordAnalyzer = None, wordlist_path: str = None,
+                 executor: Executor = None, batch_window: float = None,
+                 max_batch_size: int = 256):
+        """
+        Initialize the facade.
+        
+        Args:
+            analyzer: Preconfigured analyzer. Takes precedence over
+                wordlist_path.
+            wordlist_path: Path to the dictionary file of common passwords
+            executor: Executor to run analysis on. Defaults to a thread pool
+                shared by all facades. A ProcessPoolExecutor gives true
+                parallelism; workers rebuild the analyzer from its config()
+                unless the pool came from process_executor(), which
+                installs it up front.
+            batch_window: Seconds to wait for more analyze() calls before
+                dispatching a batch (e.g. 0.002). None disables micro-batching.
+            max_batch_size: Dispatch a batch as soon as it reaches this size
+        """
+        if batch_window is not None and batch_window < 0:
+            raise ValueError("batch_window must not be negative")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.analyzer = analyzer if analyzer is not None else PasswordAnalyzer(wordlist_path)
+        self.executor = executor
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.metrics = BatchMetrics()
+        # Requested fields -> list of (password, future, enqueue time)
+        self._pending = {}
+        self._timers = {}
+        # Dispatched batches; the event loop only keeps weak references
+        self._tasks = set()
+        # Process pools get a picklable module-level function and the
+        # analyzer's configuration instead of the analyzer itself
+        self._in_process = isinstance(executor, ProcessPoolExecutor)
+        self._config = self.analyzer.config()
+        if not self._in_process:
+            self.analyzer.preload()
+    
+    async def analyze(self, password: str, fields: Optional[Iterable[str]] = None) -> AnalysisResult:
+        """
+        Analyze one password without blocking the event loop.
+        
+        Args:
+            password: The password to analyze
+            fields: Optional subset of result keys to compute
+        
+        Returns:
+            AnalysisResult for the password
+        """
+        wanted = self.analyzer._resolve_fields(fields)
+        if self.batch_window is None:
+            results = await self._run([password], wanted)
+            return results[0]
+        return await self._enqueue(password, wanted)
+    
+    async def analyze_many(self, passwords: Iterable[str], chunk_size: int = 1000,
+                           fields: Optional[Iterable[str]] = None) -> AsyncIterator[AnalysisResult]:
+        """
+        Analyze a stream of passwords, yielding one result per input.
+        
+        Each chunk is a single executor call, so micro-batching is not used.
+        
+        Args:
+            passwords: Iterable of passwords to analyze; consumed lazily
+            chunk_size: Number of passwords sent to the executor at a time
+            fields: Optional subset of result keys to compute
+        
+        Yields:
+            AnalysisResult for each password, in input order
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        wanted = self.analyzer._resolve_fields(fields)
+        chunk = []
+        for password in passwords:
+            chunk.append(password)
+            if len(chunk) >= chunk_size:
+                for result in await self._run(chunk, wanted):
+                    yield result
+                chunk = []
+        if chunk:
+            for result in await self._run(chunk, wanted):
+                yield result
+    
+    async def _run(self, passwords: List[str], fields: Optional[frozenset]) -> List[AnalysisResult]:
+        """Analyze a list of passwords on the executor."""
+        loop = asyncio.get_running_loop()
+        executor = self.executor or _get_shared_executor()
+        if self._in_process:
+            return await loop.run_in_executor(executor, _analyze_in_worker, self._config,
+                                              passwords, fields)
+        return await loop.run_in_executor(executor, self._analyze_batch, passwords, fields)
+    
+    def _analyze_batch(self, passwords: List[str], fields: Optional[frozenset]) -> List[AnalysisResult]:
+        """Analyze a batch in an executor thread."""
+        analyzer = self.analyzer
+        return [analyzer._analyze(password, fields) for password in passwords]
+    
+    def _enqueue(self, password: str, fields: Optional[frozenset]) -> "asyncio.Future":
+        """Add a password to the pending batch for its field set."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(fields, [])
+        pending.append((password, future, time.perf_counter()))
+        
+        metrics = self.metrics
+        metrics.queue_depth += 1
+        metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
+        
+        if len(pending) >= self.max_batch_size:
+            self._flush(fields)
+        elif fields not in self._timers:
+            self._timers[fields] = loop.call_later(self.batch_window, self._flush, fields)
+        return future
+    
+    def _flush(self, fields: Optional[frozenset]) -> None:
+        """Dispatch the pending batch for a field set."""
+        timer = self._timers.pop(fields, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(fields, None)
+        if not pending:
+            return
+        
+        metrics = self.metrics
+        size = len(pending)
+        now = time.perf_counter()
+        metrics.queue_depth -= size
+        metrics.requests += size
+        metrics.batches += 1
+        metrics.max_batch_size = max(metrics.max_batch_size, size)
+        metrics.batch_sizes[size] = metrics.batch_sizes.get(size, 0) + 1
+        metrics.total_wait += sum(now - queued_at for _, _, queued_at in pending)
+        
+        task = asyncio.ensure_future(self._dispatch(pending, fields))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _dispatch(self, pending: List[tuple], fields: Optional[frozenset]) -> None:
+        """Run one coalesced batch and resolve its futures."""
+        self.metrics.in_flight_batches += 1
+        try:
+            results = await self._run([password for password, _, _ in pending], fields)
+        except Exception as e:
+            for _, future, _ in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.metrics.in_flight_batches -= 1
+        for (_, future, _), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def flush(self) -> None:
+        """Dispatch every pending batch immediately."""
+        for fields in list(self._pending):
+            self._flush(fields)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return micro-batching metrics as a dictionary."""
+        return self.metrics.to_dict()
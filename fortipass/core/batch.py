@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# FortiPass - Parallel Batch Analysis Engine
+
+import os
+import queue
+import sys
+import time
+from collections import deque
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+from fortipass.core.password_analyzer import PasswordAnalyzer
+
+# Analyzer used inside worker processes. Under the "fork" start method it is
+# set in the parent before the pool starts so children inherit it without
+# re-reading the wordlist; otherwise each worker builds its own from the
+# analyzer's config().
+_worker_analyzer = None
+_worker_fields = None
+# Optional NumPy front end (fortipass.core.vectorized), shared the same way
+_worker_vectorizer = None
+
+
+def init_worker(analyzer: Optional[PasswordAnalyzer], fields: Optional[frozenset] = None,
+                vectorizer=None) -> None:
+    """
+    Install the shared analyzer in a freshly started worker process.
+    
+    Pass it as the initializer of any process pool whose tasks call
+    worker_analyzer(). Under the "fork" start method, an analyzer set in
+    the parent before the pool starts is inherited and None may be passed.
+    
+    Args:
+        analyzer: Analyzer for this worker, or None to keep the inherited one
+        fields: Result keys computed by the batch engine's chunks
+        vectorizer: Optional fortipass.core.vectorized front end
+    """
+    global _worker_analyzer, _worker_fields, _worker_vectorizer
+    if analyzer is not None:
+        _worker_analyzer = analyzer
+    if vectorizer is not None:
+        _worker_vectorizer = vectorizer
+    _worker_fields = fields
+
+
+def init_worker_from_config(config: tuple, fields: Optional[frozenset] = None,
+                            vectorized: bool = False) -> None:
+    """
+    Build an analyzer from PasswordAnalyzer.config() and install it.
+    
+    The initializer for pools whose workers do not inherit the parent's
+    memory: each worker loads the wordlist itself instead of receiving the
+    loaded analyzer in a pickle.
+    
+    Args:
+        config: Result of config() on the parent's analyzer
+        fields: Result keys computed by the batch engine's chunks
+        vectorized: Also install a fortipass.core.vectorized front end
+    """
+    analyzer = PasswordAnalyzer(**dict(config))
+    analyzer.preload()
+    vectorizer = None
+    if vectorized:
+        from fortipass.core import vectorized as vector_path
+        vectorizer = vector_path.VectorizedAnalyzer(analyzer)
+    init_worker(analyzer, fields, vectorizer)
+
+
+def pool_context():
+    """
+    Return the multiprocessing context for worker pools.
+    
+    "fork" is used on Linux only, where children inherit the preloaded
+    analyzer for free. Elsewhere the platform default applies; macOS
+    defaults to "spawn" because forking a process that has used system
+    frameworks or threads is unsafe there.
+    """
+    import multiprocessing
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def worker_analyzer() -> PasswordAnalyzer:
+    """
+    Return the analyzer installed by init_worker() in this worker process.
+    
+    Raises:
+        RuntimeError: If the pool was not started with init_worker()
+    """
+    if _worker_analyzer is None:
+        raise RuntimeError("No analyzer in this process; start the pool with "
+                           "initializer=init_worker")
+    return _worker_analyzer
+
+
+def _analyze_chunk(task: tuple) -> tuple:
+    """Analyze one chunk of passwords inside a worker process."""
+    index, passwords = task
+    fields = _worker_fields
+    if _worker_vectorizer is not None:
+        return index, _worker_vectorizer.analyze_chunk(passwords, fields)
+    analyzer = _worker_analyzer
+    return index, [analyzer._analyze(password, fields) for password in passwords]
+
+
+class BatchStats:
+    """Throughput statistics for a batch run."""
+    
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.total = 0
+        self.chunks = 0
+        self.started_at = None
+        self.finished_at = None
+    
+    @property
+    def elapsed(self) -> float:
+        """Seconds elapsed since the run started."""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+    
+    @property
+    def passwords_per_second(self) -> float:
+        """Average throughput of the run."""
+        elapsed = self.elapsed
+        return self.total / elapsed if elapsed > 0 else 0.0
+    
+    def report(self) -> str:
+        """Return a human readable throughput summary."""
+        return (f"{self.total} passwords in {self.elapsed:.2f}s "
+                f"({self.passwords_per_second:,.0f} passwords/second)")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            "total": self.total,
+            "chunks": self.chunks,
+            "elapsed": round(self.elapsed, 6),
+            "passwords_per_second": round(self.passwords_per_second, 2)
+        }
+
+
+class BatchAnalyzer:
+    """
+    Multi-core batch engine around PasswordAnalyzer.
+    Dispatches chunks of passwords to a process pool and streams results back.
+    """
+    
+    def __init__(self, wordlist_path: str = None, analyzer: PasswordAnalyzer = None,
+                 workers: int = None, chunk_size: int = 1000, ordered: bool = True,
+                 fields: Optional[Iterable[str]] = None, vectorized: bool = False):
+        """
+        Initialize the batch engine.
+        
+        Args:
+            wordlist_path: Path to the dictionary file of common passwords
+            analyzer: Preconfigured analyzer to share with workers. Takes
+                precedence over wordlist_path.
+            workers: Number of worker processes (defaults to the CPU count)
+            chunk_size: Number of passwords sent to a worker per task
+            ordered: Yield results in input order. When False, chunks are
+                streamed back as soon as they complete.
+            fields: Optional subset of result keys to compute
+            vectorized: Score pattern-free passwords with NumPy array
+                operations (see fortipass.core.vectorized). Ignored when
+                NumPy is not installed. Larger chunks amortize better.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        
+        # The dictionary is loaded exactly once, in the parent process
+        self.analyzer = analyzer if analyzer is not None else PasswordAnalyzer(wordlist_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.ordered = ordered
+        # Chunks queued ahead of the consumer; bounds memory on huge inputs
+        self.max_in_flight = self.workers * 2
+        self.fields = self.analyzer._resolve_fields(fields)
+        self.stats = BatchStats()
+        
+        self.vectorizer = None
+        if vectorized:
+            from fortipass.core import vectorized as vector_path
+            if vector_path.HAS_NUMPY:
+                self.vectorizer = vector_path.VectorizedAnalyzer(self.analyzer)
+    
+    def analyze(self, passwords: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze passwords across the process pool.
+        
+        Args:
+            passwords: Iterable of passwords to analyze; consumed lazily
+        
+        Yields:
+            Analysis result dictionaries
+        """
+        for _, results in self.analyze_chunks(passwords):
+            for result in results:
+                yield result
+    
+    def analyze_chunks(self, passwords: Iterable[str]) -> Iterator[tuple]:
+        """
+        Analyze passwords across the process pool, yielding whole chunks.
+        
+        Args:
+            passwords: Iterable of passwords to analyze; consumed lazily
+        
+        Yields:
+            Tuples of (chunk index, list of results). Chunk indexes are
+            increasing unless the engine runs unordered.
+        """
+        global _worker_analyzer, _worker_vectorizer
+        
+        self.stats = BatchStats()
+        self.stats.started_at = time.perf_counter()
+        
+        tasks = self._iter_tasks(passwords)
+        
+        if self.workers == 1:
+            # Avoid process overhead entirely for single-worker runs
+            for index, chunk in tasks:
+                if self.vectorizer is not None:
+                    results = self.vectorizer.analyze_chunk(chunk, self.fields)
+                else:
+                    results = [self.analyzer._analyze(password, self.fields)
+                               for password in chunk]
+                self._record(results)
+                yield index, results
+            self.stats.finished_at = time.perf_counter()
+            return
+        
+        # Load the wordlist and matcher once here rather than in every worker
+        self.analyzer.preload()
+        
+        context = pool_context()
+        if context.get_start_method() == "fork":
+            _worker_analyzer = self.analyzer
+            _worker_vectorizer = self.vectorizer
+            initializer, initargs = init_worker, (None, self.fields)
+        else:
+            initializer = init_worker_from_config
+            initargs = (self.analyzer.config(), self.fields, self.vectorizer is not None)
+        
+        pool = context.Pool(self.workers, initializer=initializer, initargs=initargs)
+        try:
+            if self.ordered:
+                completed = self._run_ordered(pool, tasks)
+            else:
+                completed = self._run_unordered(pool, tasks)
+            for index, results in completed:
+                self._record(results)
+                yield index, results
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+            _worker_analyzer = None
+            _worker_vectorizer = None
+            self.stats.finished_at = time.perf_counter()
+    
+    def _run_ordered(self, pool, tasks: Iterator[tuple]) -> Iterator[tuple]:
+        """Yield chunk results in submission order with a bounded window."""
+        pending = deque()
+        for task in islice(tasks, self.max_in_flight):
+            pending.append(pool.apply_async(_analyze_chunk, (task,)))
+        while pending:
+            result = pending.popleft().get()
+            for task in islice(tasks, 1):
+                pending.append(pool.apply_async(_analyze_chunk, (task,)))
+            yield result
+    
+    def _run_unordered(self, pool, tasks: Iterator[tuple]) -> Iterator[tuple]:
+        """Yield chunk results as they complete with a bounded window."""
+        done = queue.Queue()
+        in_flight = 0
+        for task in islice(tasks, self.max_in_flight):
+            pool.apply_async(_analyze_chunk, (task,), callback=done.put, error_callback=done.put)
+            in_flight += 1
+        while in_flight:
+            result = done.get()
+            in_flight -= 1
+            if isinstance(result, BaseException):
+                raise result
+            for task in islice(tasks, 1):
+                pool.apply_async(_analyze_chunk, (task,), callback=done.put, error_callback=done.put)
+                in_flight += 1
+            yield result
+    
+    def _iter_tasks(self, passwords: Iterable[str]) -> Iterator[tuple]:
+        """Split the input into indexed chunks."""
+        iterator = iter(passwords)
+        index = 0
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield index, chunk
+            index += 1
+    
+    def _record(self, results: List[Dict[str, Any]]) -> None:
+        """Update throughput statistics after a chunk completes."""
+        self.stats.total += len(results)
+        self.stats.chunks += 1
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# FortiPass - Bloom Filter Prefilter
+
+"""
+Probabilistic fast-reject filter for dictionary lookups.
+
+A Bloom filter answers "definitely not present" or "possibly present". The
+analyzer consults it before the exact dictionary stores so that the common
+case, a password that is in no breach list, never touches them. At a 1%
+false-positive rate the filter needs about 9.6 bits per entry, so a
+billion-entry corpus fits in roughly 1.2 GB.
+
+Build a filter from a wordlist with:
+
+    python -m fortipass.core.bloom wordlist.txt wordlist.fpbloom --error-rate 0.01
+"""
+
+import hashlib
+import math
+import mmap
+import struct
+import sys
+from typing import Iterable, List
+
+from fortipass.core.dictionary_index import read_wordlist
+
+# File layout: header followed by the raw bit array
+BLOOM_MAGIC = b"FPBLOOM1"
+_HEADER = struct.Struct("<8sIIQQd")
+BLOOM_VERSION = 1
+
+
+def optimal_parameters(capacity: int, error_rate: float) -> tuple:
+    """
+    Compute the bit count and hash count for a target false-positive rate.
+    
+    Args:
+        capacity: Expected number of entries
+        error_rate: Desired false-positive probability (0 < rate < 1)
+    
+    Returns:
+        Tuple of (number of bits, number of hash functions)
+    """
+    if capacity < 1:
+        capacity = 1
+    if not 0 < error_rate < 1:
+        raise ValueError("error_rate must be between 0 and 1")
+    bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+    bits = max(8, bits)
+    hashes = max(1, int(round(bits / capacity * math.log(2))))
+    return bits, hashes
+
+
+class BloomFilter:
+    """
+    Bloom filter over lowercased words using double hashing.
+    Supports `in` checks; a miss is definitive, a hit must be confirmed.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Create an empty filter sized for the given capacity.
+        
+        Args:
+            capacity: Expected number of entries
+            error_rate: Desired false-positive probability
+        """
+        self.num_bits, self.num_hashes = optimal_parameters(capacity, error_rate)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.count = 0
+        self.path = None
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._file = None
+    
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """
+        Memory-map a serialized filter.
+        
+        Args:
+            path: Path to a file written by save()
+        
+        Returns:
+            Read-only BloomFilter backed by the mapped file
+        """
+        instance = cls.__new__(cls)
+        instance.path = path
+        instance._file = open(path, "rb")
+        try:
+            instance._bits = mmap.mmap(instance._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            instance._file.close()
+            raise ValueError(f"Invalid Bloom filter: {path}")
+        
+        if len(instance._bits) < _HEADER.size:
+            instance.close()
+            raise ValueError(f"Invalid Bloom filter: {path}")
+        magic, version, hashes, bits, count, rate = _HEADER.unpack_from(instance._bits, 0)
+        if magic != BLOOM_MAGIC or version != BLOOM_VERSION:
+            instance.close()
+            raise ValueError(f"Unsupported Bloom filter format: {path}")
+        if len(instance._bits) != _HEADER.size + (bits + 7) // 8:
+            instance.close()
+            raise ValueError(f"Truncated Bloom filter: {path}")
+        
+        instance.num_bits = bits
+        instance.num_hashes = hashes
+        instance.capacity = count
+        instance.error_rate = rate
+        instance.count = count
+        instance._offset = _HEADER.size
+        return instance
+    
+    def _positions(self, word: str) -> List[int]:
+        """Derive the bit positions for a word with double hashing."""
+        # surrogatepass, like hash_word(), so lone surrogates hash too
+        digest = hashlib.blake2b(word.lower().encode("utf-8", "surrogatepass"),
+                                 digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        bits = self.num_bits
+        return [(first + i * second) % bits for i in range(self.num_hashes)]
+    
+    def add(self, word: str) -> None:
+        """Add a word to the filter."""
+        if self._file is not None:
+            raise RuntimeError("Memory-mapped Bloom filters are read-only")
+        bits = self._bits
+        for position in self._positions(word):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def update(self, words: Iterable[str]) -> None:
+        """Add every word from an iterable."""
+        for word in words:
+            self.add(word)
+    
+    def __contains__(self, word: str) -> bool:
+        """Check whether a word may be present (no false negatives)."""
+        bits = self._bits
+        offset = self._offset if self._file is not None else 0
+        for position in self._positions(word):
+            if not bits[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+    
+    def __len__(self) -> int:
+        """Number of entries added to the filter."""
+        return self.count
+    
+    @property
+    def size_bytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return (self.num_bits + 7) // 8
+    
+    def save(self, path: str) -> None:
+        """
+        Serialize the filter to disk.
+        
+        Args:
+            path: Destination file
+        """
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(BLOOM_MAGIC, BLOOM_VERSION, self.num_hashes,
+                                 self.num_bits, self.count, self.error_rate))
+            f.write(self._bits if self._file is None else self._bits[_HEADER.size:])
+    
+    def close(self) -> None:
+        """Release the mapping of a loaded filter."""
+        if self._file is not None:
+            self._bits.close()
+            self._file.close()
+    
+    def __getstate__(self):
+        """Pickle mapped filters by path so workers share the page cache."""
+        if self.path is not None:
+            return {"path": self.path}
+        return self.__dict__.copy()
+    
+    def __setstate__(self, state):
+        """Restore a pickled filter."""
+        if "path" in state and len(state) == 1:
+            self.__dict__.update(BloomFilter.load(state["path"]).__dict__)
+        else:
+            self.__dict__.update(state)
+
+
+def build_filter(words: Iterable[str], output_path: str, capacity: int,
+                 error_rate: float = 0.01) -> BloomFilter:
+    """
+    Build and save a filter for a collection of words.
+    
+    Args:
+        words: Iterable of dictionary entries
+        output_path: Destination file
+        capacity: Expected number of entries
+        error_rate: Desired false-positive probability
+    
+    Returns:
+        The populated in-memory filter
+    """
+    bloom = BloomFilter(capacity, error_rate)
+    bloom.update(words)
+    bloom.save(output_path)
+    return bloom
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point for building a filter."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Build a FortiPass Bloom filter prefilter from a wordlist."
+    )
+    parser.add_argument("wordlist", help="Input wordlist, one entry per line")
+    parser.add_argument("output", help="Output filter file")
+    parser.add_argument("--error-rate", type=float, default=0.01,
+                        help="Target false-positive rate (default: %(default)s)")
+    parser.add_argument("--capacity", type=int, default=None,
+                        help="Expected entry count (default: count the wordlist)")
+    args = parser.parse_args(argv)
+    
+    capacity = args.capacity
+    if capacity is None:
+        capacity = sum(1 for _ in read_wordlist(args.wordlist))
+    
+    bloom = build_filter(read_wordlist(args.wordlist), args.output, capacity, args.error_rate)
+    print(f"Wrote {bloom.count} entries to {args.output} "
+          f"({bloom.size_bytes} bytes, {bloom.num_hashes} hashes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# FortiPass - Offline Breached Password Store
+
+"""
+Local k-anonymity style store of compromised passwords.
+
+Passwords are kept as SHA-1 hashes sharded by hash prefix, following the
+Pwned Passwords range layout: the file ``ABCDE.txt`` holds one
+``SUFFIX:COUNT`` line for every breached password whose SHA-1 hash starts
+with ``ABCDE``. A lookup reads only the one shard for its prefix, and shards
+are cached in memory with LRU eviction.
+
+build_store() also writes a small JSON manifest recording the format
+version and the prefix length, which BreachStore reads back. Directories
+without one, such as a downloaded range dump, are opened with 5-character
+prefixes. Either way a store whose shard names have a different length is
+refused, since every lookup in it would silently miss.
+
+Build a store from a plaintext wordlist or a ``SHA1:COUNT`` dump with:
+    
+    python -m fortipass.core.breach_store pwned-passwords.txt breach-store/ --hashes
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_PREFIX_LENGTH = 5
+_SHARD_SUFFIX = ".txt"
+_SHARD_NAME_RE = re.compile(r'^[0-9A-Fa-f]+\.txt$')
+
+# Manifest written next to the shards
+STORE_MANIFEST = "fortipass-store.json"
+STORE_FORMAT = "fortipass-breach-store"
+STORE_VERSION = 1
+_HASH_LINE_RE = re.compile(r'^([0-9A-Fa-f]{40})(?::(\d+))?$')
+
+# Entries buffered in memory before being merged into shard files
+_FLUSH_SIZE = 2000000
+
+
+def sha1_hex(password: str) -> str:
+    """
+    Return the uppercase SHA-1 hex digest of a password.
+    
+    Lone surrogates are encoded with surrogatepass, as in ResultCache, so
+    they hash instead of raising.
+    """
+    return hashlib.sha1(password.encode("utf-8", "surrogatepass")).hexdigest().upper()
+
+
+class BreachStore:
+    """
+    Read-only view over a directory of SHA-1 range shards.
+    Shards are loaded on first use and kept in a bounded LRU cache.
+    """
+    
+    def __init__(self, directory: str, cache_size: int = 1024,
+                 prefix_length: Optional[int] = None):
+        """
+        Open a breach store.
+        
+        Args:
+            directory: Directory containing the range shard files
+            cache_size: Maximum number of shards kept in memory
+            prefix_length: Number of hex characters used to name shards;
+                read from the manifest by default
+        """
+        if not os.path.isdir(directory):
+            raise ValueError(f"Breach store directory not found: {directory}")
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+        prefix_length = _resolve_prefix_length(directory, prefix_length)
+        self.directory = directory
+        self.cache_size = cache_size
+        self.prefix_length = prefix_length
+        self._shards = OrderedDict()
+        # Guards the shard cache and counters when shared across worker threads
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def lookup(self, password: str) -> int:
+        """
+        Look up how many times a password appears in the breach corpus.
+        
+        Args:
+            password: Plaintext password (hashed locally, never stored)
+        
+        Returns:
+            Occurrence count, or 0 if the password is not present
+        """
+        return self.lookup_hash(sha1_hex(password))
+    
+    def lookup_hash(self, digest: str) -> int:
+        """
+        Look up a precomputed uppercase SHA-1 hex digest.
+        
+        Args:
+            digest: 40-character SHA-1 hex digest
+        
+        Returns:
+            Occurrence count, or 0 if the hash is not present
+        """
+        digest = digest.upper()
+        prefix = digest[:self.prefix_length]
+        return self._shard(prefix).get(digest[self.prefix_length:], 0)
+    
+    def __contains__(self, password: str) -> bool:
+        """Check whether a password appears in the breach corpus."""
+        return self.lookup(password) > 0
+    
+    def _shard(self, prefix: str) -> Dict[str, int]:
+        """Return the suffix table for a prefix, loading it if needed."""
+        shards = self._shards
+        with self._lock:
+            shard = shards.get(prefix)
+            if shard is not None:
+                shards.move_to_end(prefix)
+                self.hits += 1
+                return shard
+            self.misses += 1
+        
+        # Read outside the lock; two threads missing on one prefix both read
+        # it and the second store wins
+        shard = read_shard(os.path.join(self.directory, prefix + _SHARD_SUFFIX))
+        with self._lock:
+            shards[prefix] = shard
+            shards.move_to_end(prefix)
+            if len(shards) > self.cache_size:
+                shards.popitem(last=False)
+                self.evictions += 1
+        return shard
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Return shard cache statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "cached_shards": len(self._shards),
+            "cache_size": self.cache_size
+        }
+    
+    def clear_cache(self) -> None:
+        """Drop every cached shard."""
+        with self._lock:
+            self._shards.clear()
+    
+    def __getstate__(self):
+        """Pickle the configuration only; caches are rebuilt per process."""
+        return {
+            "directory": self.directory,
+            "cache_size": self.cache_size,
+            "prefix_length": self.prefix_length
+        }
+    
+    def __setstate__(self, state):
+        """Restore a pickled store with an empty cache."""
+        self.__init__(state["directory"], state["cache_size"], state["prefix_length"])
+
+
+def read_manifest(directory: str) -> Optional[Dict[str, int]]:
+    """
+    Read the manifest of a store directory.
+    
+    Returns:
+        The manifest, or None if the directory has none
+    
+    Raises:
+        ValueError: If the manifest is malformed or of another format
+    """
+    path = os.path.join(directory, STORE_MANIFEST)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        raise ValueError(f"Invalid breach store manifest: {path}")
+    if (not isinstance(manifest, dict) or manifest.get("format") != STORE_FORMAT or
+            manifest.get("version") != STORE_VERSION or
+            not _valid_prefix_length(manifest.get("prefix_length"))):
+        raise ValueError(f"Unsupported breach store manifest: {path}")
+    return manifest
+
+
+def _write_manifest(directory: str, prefix_length: int) -> None:
+    """Write the manifest of a store directory."""
+    path = os.path.join(directory, STORE_MANIFEST)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"format": STORE_FORMAT, "version": STORE_VERSION,
+                   "prefix_length": prefix_length}, f)
+        f.write("\n")
+    os.replace(temp_path, path)
+
+
+def _valid_prefix_length(prefix_length) -> bool:
+    """Check that a prefix length leaves a non-empty suffix."""
+    return (isinstance(prefix_length, int) and not isinstance(prefix_length, bool) and
+            1 <= prefix_length < 40)
+
+
+def _resolve_prefix_length(directory: str, prefix_length: Optional[int]) -> int:
+    """
+    Work out the prefix length of a store and check its shard names.
+    
+    Args:
+        directory: Store directory
+        prefix_length: Expected prefix length, or None to use the manifest
+    
+    Returns:
+        The prefix length the store was built with
+    
+    Raises:
+        ValueError: If the manifest, the shard names and prefix_length
+            disagree
+    """
+    manifest = read_manifest(directory)
+    stored = manifest["prefix_length"] if manifest is not None else None
+    if prefix_length is None:
+        prefix_length = stored if stored is not None else DEFAULT_PREFIX_LENGTH
+    elif not _valid_prefix_length(prefix_length):
+        raise ValueError("prefix_length must be between 1 and 39")
+    elif stored is not None and stored != prefix_length:
+        raise ValueError(f"Breach store {directory} uses a prefix length of {stored}, "
+                         f"not {prefix_length}")
+    
+    # Shards share one name length, so the first one found is checked
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if _SHARD_NAME_RE.match(entry.name):
+                found = len(entry.name) - len(_SHARD_SUFFIX)
+                if found != prefix_length:
+                    raise ValueError(f"Breach store {directory} has shards for a prefix "
+                                     f"length of {found}, not {prefix_length}")
+                break
+    return prefix_length
+
+
+def read_shard(path: str) -> Dict[str, int]:
+    """
+    Parse one range shard file.
+    
+    Args:
+        path: Path to a shard file
+    
+    Returns:
+        Mapping of uppercase hash suffix to occurrence count; empty if the
+        shard does not exist
+    """
+    shard = {}
+    try:
+        with open(path, "r", encoding="ascii") as f:
+            for line in f:
+                suffix, _, count = line.strip().partition(":")
+                if suffix:
+                    shard[suffix.upper()] = int(count) if count else 1
+    except FileNotFoundError:
+        pass
+    return shard
+
+
+def _write_shard(path: str, shard: Dict[str, int]) -> None:
+    """Write a shard file with its suffixes in sorted order."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="ascii") as f:
+        for suffix in sorted(shard):
+            f.write(f"{suffix}:{shard[suffix]}\n")
+    os.replace(temp_path, path)
+
+
+def _parse_entries(lines: Iterable[str], hashed: bool) -> Iterator[Tuple[str, int]]:
+    """Turn input lines into (SHA-1 digest, count) pairs."""
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        if hashed:
+            match = _HASH_LINE_RE.match(line.strip())
+            if not match:
+                continue
+            yield match.group(1).upper(), int(match.group(2) or 1)
+        else:
+            yield sha1_hex(line), 1
+
+
+def build_store(entries: Iterable[Tuple[str, int]], directory: str,
+                prefix_length: int = DEFAULT_PREFIX_LENGTH,
+                flush_size: int = _FLUSH_SIZE) -> int:
+    """
+    Write (SHA-1 digest, count) pairs into range shard files.
+    
+    Counts for the same hash are summed, including across repeated builds
+    into the same directory, which must use the same prefix length. Memory
+    is bounded by flush_size.
+    
+    Args:
+        entries: Iterable of (uppercase SHA-1 hex digest, count) pairs
+        directory: Output directory, created if missing
+        prefix_length: Number of hex characters used to name shards
+        flush_size: Entries buffered before merging into shard files
+    
+    Returns:
+        Number of entries processed
+    
+    Raises:
+        ValueError: If the directory holds a store with another prefix length
+    """
+    if not _valid_prefix_length(prefix_length):
+        raise ValueError("prefix_length must be between 1 and 39")
+    os.makedirs(directory, exist_ok=True)
+    _resolve_prefix_length(directory, prefix_length)
+    _write_manifest(directory, prefix_length)
+    pending = {}
+    buffered = 0
+    processed = 0
+    
+    for digest, count in entries:
+        prefix, suffix = digest[:prefix_length], digest[prefix_length:]
+        shard = pending.get(prefix)
+        if shard is None:
+            shard = pending[prefix] = {}
+        shard[suffix] = shard.get(suffix, 0) + count
+        buffered += 1
+        processed += 1
+        if buffered >= flush_size:
+            _merge_pending(pending, directory)
+            buffered = 0
+    
+    _merge_pending(pending, directory)
+    return processed
+
+
+def _merge_pending(pending: Dict[str, Dict[str, int]], directory: str) -> None:
+    """Merge buffered shard updates into the files on disk."""
+    for prefix, updates in pending.items():
+        path = os.path.join(directory, prefix + _SHARD_SUFFIX)
+        shard = read_shard(path)
+        for suffix, count in updates.items():
+            shard[suffix] = shard.get(suffix, 0) + count
+        _write_shard(path, shard)
+    pending.clear()
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point for building a breach store."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Build a FortiPass offline breached-password store."
+    )
+    parser.add_argument("input", help="Plaintext wordlist, or SHA1:COUNT lines with --hashes")
+    parser.add_argument("output", help="Output directory for range shards")
+    parser.add_argument("--hashes", action="store_true",
+                        help="Input lines are SHA1[:COUNT] rather than plaintext")
+    parser.add_argument("--prefix-length", type=int, default=DEFAULT_PREFIX_LENGTH,
+                        help="Hex characters per shard name (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    try:
+        # Undecodable bytes are kept as surrogate escapes, matching lookups of
+        # the same bytes from an audit
+        with open(args.input, "r", encoding="utf-8", errors="surrogateescape") as f:
+            count = build_store(_parse_entries(f, args.hashes), args.output,
+                                args.prefix_length)
+    except ValueError as e:
+        sys.stderr.write(f"fortipass.core.breach_store: {e}\n")
+        return 2
+    print(f"Stored {count} entries in {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# FortiPass - Analysis Budget
+
+"""
+Bounded-latency analysis.
+
+An AnalysisBudget on a PasswordAnalyzer limits the work one analyze() call
+may do:
+
+- max_chars: only the first max_chars characters are inspected
+- max_matches: at most max_matches dictionary/keyboard substring matches
+  and repeated-sequence runs are kept, and at most max_matches segments
+  enter the guess search
+- max_seconds: once this much wall-clock time has passed, the repeated
+  sequence detector is skipped and the guess estimate falls back to the
+  entropy-based one; the guess search also stops mid-way. The limit is
+  checked between stages, so it is soft: scanning and matching always
+  finish. Combine it with max_chars, which bounds those.
+
+The cheap checks (length, character classes, entropy, dictionary, breach,
+date, keyboard, repeated and sequential characters) always run on the
+inspected text. Expensive stages come last. A result that hit any limit is
+still complete and valid, and carries ``partial=True``. When max_chars cut
+the password short, ``length`` is the full length and ``analyzed_length``
+the number of inspected characters, which every other field describes.
+"""
+
+import time
+from typing import List, Optional
+
+
+class BudgetExceeded(Exception):
+    """Raised inside a long-running stage when the time budget runs out."""
+
+
+class AnalysisBudget:
+    """Limits on the work a single analysis may do."""
+    
+    def __init__(self, max_chars: Optional[int] = None, max_matches: Optional[int] = None,
+                 max_seconds: Optional[float] = None):
+        """
+        Initialize the budget. Every limit is optional.
+        
+        Args:
+            max_chars: Characters inspected per password
+            max_matches: Substring matches, repeated-sequence runs and guess
+                segments kept
+            max_seconds: Wall-clock time per analysis before expensive
+                stages are skipped
+        """
+        if max_chars is not None and max_chars < 1:
+            raise ValueError("max_chars must be at least 1")
+        if max_matches is not None and max_matches < 0:
+            raise ValueError("max_matches must not be negative")
+        if max_seconds is not None and max_seconds <= 0:
+            raise ValueError("max_seconds must be positive")
+        self.max_chars = max_chars
+        self.max_matches = max_matches
+        self.max_seconds = max_seconds
+    
+    def __repr__(self) -> str:
+        return (f"AnalysisBudget(max_chars={self.max_chars!r}, "
+                f"max_matches={self.max_matches!r}, max_seconds={self.max_seconds!r})")
+    
+    def _limits(self) -> tuple:
+        """The limits as a tuple, for comparison and hashing."""
+        return self.max_chars, self.max_matches, self.max_seconds
+    
+    def __eq__(self, other) -> bool:
+        # Compared by value, so a budget still matches after pickling
+        if not isinstance(other, AnalysisBudget):
+            return NotImplemented
+        return self._limits() == other._limits()
+    
+    def __hash__(self) -> int:
+        return hash(self._limits())
+    
+    def start(self) -> "BudgetState":
+        """Return the state for one analysis, starting its clock."""
+        deadline = None
+        if self.max_seconds is not None:
+            deadline = time.perf_counter() + self.max_seconds
+        return BudgetState(self.max_chars, self.max_matches, deadline)
+
+
+class BudgetState:
+    """Remaining budget of one analysis and whether any limit was hit."""
+    
+    __slots__ = ("max_chars", "max_matches", "deadline", "partial")
+    
+    def __init__(self, max_chars: Optional[int], max_matches: Optional[int],
+                 deadline: Optional[float]):
+        """
+        Initialize the state.
+        
+        Args:
+            max_chars: Characters inspected, or None
+            max_matches: Items kept by limit(), or None
+            deadline: time.perf_counter() value at which time runs out, or None
+        """
+        self.max_chars = max_chars
+        self.max_matches = max_matches
+        self.deadline = deadline
+        self.partial = False
+    
+    def truncate(self, password: str) -> str:
+        """Return the part of the password to inspect."""
+        if self.max_chars is not None and len(password) > self.max_chars:
+            self.partial = True
+            return password[:self.max_chars]
+        return password
+    
+    def limit(self, items: List) -> List:
+        """Return at most max_matches items, in order."""
+        if self.max_matches is not None and len(items) > self.max_matches:
+            self.partial = True
+            return items[:self.max_matches]
+        return items
+    
+    def expired(self) -> bool:
+        """Check the clock, marking the result partial once time is up."""
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            self.partial = True
+            return True
+        return False
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# FortiPass - Memory-Mapped Dictionary Index
+
+"""
+Prebuilt, memory-mapped index of common or breached passwords.
+
+The index is a fixed-layout binary file holding the sorted 64-bit BLAKE2b
+hashes of every lowercased entry. Opening it costs a single mmap() call,
+lookups are a binary search over the mapped pages, and the operating system
+shares those pages between every process that opens the same file.
+
+Build an index from a wordlist with:
+    
+    python -m fortipass.core.dictionary_index wordlist.txt wordlist.fpidx
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List
+
+# File layout: header followed by `count` little-endian uint64 hashes
+INDEX_MAGIC = b"FPDIDX1\0"
+_HEADER = struct.Struct("<8sII Q")
+_HASH = struct.Struct("<Q")
+INDEX_VERSION = 1
+
+# Hashes sorted in memory per run before spilling to disk during a build
+_RUN_SIZE = 4000000
+
+
+def hash_word(word: str) -> int:
+    """
+    Hash a dictionary entry the way the index stores it.
+    
+    Args:
+        word: Entry to hash; lowercased before hashing. Lone surrogates
+            (from JSON or surrogateescape-decoded input) are encoded as is
+    
+    Returns:
+        64-bit integer hash
+    """
+    digest = hashlib.blake2b(word.lower().encode("utf-8", "surrogatepass"),
+                             digest_size=8).digest()
+    return _HASH.unpack(digest)[0]
+
+
+class DictionaryIndex:
+    """
+    Read-only view over a prebuilt dictionary index file.
+    Supports `in` checks and len() like the set it replaces.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open and map an index file.
+        
+        Args:
+            path: Path to a file produced by build_index()
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Zero-length files cannot be mapped
+            self._file.close()
+            raise ValueError(f"Invalid dictionary index: {path}")
+        
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Invalid dictionary index: {path}")
+        magic, version, width, count = _HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or width != _HASH.size:
+            self.close()
+            raise ValueError(f"Unsupported dictionary index format: {path}")
+        if len(self._map) != _HEADER.size + count * _HASH.size:
+            self.close()
+            raise ValueError(f"Truncated dictionary index: {path}")
+        
+        self._count = count
+        # A typed view lets bisect run in C on little-endian hosts
+        if sys.byteorder == "little":
+            self._hashes = memoryview(self._map)[_HEADER.size:].cast("Q")
+        else:
+            self._hashes = None
+    
+    def __len__(self) -> int:
+        """Number of entries in the index."""
+        return self._count
+    
+    def __contains__(self, word: str) -> bool:
+        """Check whether a word (case-insensitive) is in the index."""
+        return self.contains_hash(hash_word(word))
+    
+    def contains_hash(self, value: int) -> bool:
+        """Check whether a precomputed hash is in the index."""
+        if self._hashes is not None:
+            position = bisect_left(self._hashes, value)
+            return position < self._count and self._hashes[position] == value
+        
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            probe = _HASH.unpack_from(self._map, _HEADER.size + middle * _HASH.size)[0]
+            if probe < value:
+                low = middle + 1
+            else:
+                high = middle
+        return (low < self._count and
+                _HASH.unpack_from(self._map, _HEADER.size + low * _HASH.size)[0] == value)
+    
+    def close(self) -> None:
+        """Unmap the index and close the underlying file."""
+        hashes = getattr(self, "_hashes", None)
+        if hashes is not None:
+            hashes.release()
+            self._hashes = None
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+    
+    def __getstate__(self):
+        """Pickle by path so worker processes map the same pages."""
+        return {"path": self.path}
+    
+    def __setstate__(self, state):
+        """Re-open the index in the receiving process."""
+        self.__init__(state["path"])
+
+
+def read_wordlist(wordlist_path: str) -> Iterator[str]:
+    """
+    Yield the non-empty entries of a wordlist file.
+    
+    Undecodable bytes are kept as surrogate escapes, so an entry is stored
+    exactly as an audit of the same bytes looks it up.
+    """
+    with open(wordlist_path, "r", encoding="utf-8", errors="surrogateescape") as f:
+        for line in f:
+            word = line.strip()
+            if word:
+                yield word
+
+
+def _write_run(hashes: array, directory: str) -> str:
+    """Sort one in-memory run of hashes and spill it to a temporary file."""
+    import tempfile
+    
+    hashes = array("Q", sorted(hashes))
+    if sys.byteorder != "little":
+        hashes.byteswap()
+    handle, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(handle, "wb") as f:
+        hashes.tofile(f)
+    return path
+
+
+def _iter_run(path: str) -> Iterator[int]:
+    """Stream the hashes back out of a spilled run file."""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(_HASH.size * 65536)
+            if not block:
+                return
+            for (value,) in _HASH.iter_unpack(block):
+                yield value
+
+
+def build_index(words: Iterable[str], output_path: str, run_size: int = _RUN_SIZE) -> int:
+    """
+    Compile words into a sorted, deduplicated index file.
+    
+    Memory use is bounded by run_size: hashes are sorted in runs, spilled
+    to temporary files and merged, so corpora far larger than RAM can be
+    indexed.
+    
+    Args:
+        words: Iterable of dictionary entries
+        output_path: Destination index file
+        run_size: Hashes sorted in memory before spilling to disk
+    
+    Returns:
+        Number of distinct entries written
+    """
+    import heapq
+    
+    directory = os.path.dirname(os.path.abspath(output_path))
+    runs = []
+    try:
+        current = array("Q")
+        for word in words:
+            current.append(hash_word(word))
+            if len(current) >= run_size:
+                runs.append(_write_run(current, directory))
+                current = array("Q")
+        if current or not runs:
+            runs.append(_write_run(current, directory))
+        
+        count = 0
+        temp_path = output_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, _HASH.size, 0))
+            buffer = array("Q")
+            previous = None
+            for value in heapq.merge(*(_iter_run(path) for path in runs)):
+                if value == previous:
+                    continue
+                previous = value
+                buffer.append(value)
+                if len(buffer) >= 65536:
+                    count += _flush(buffer, f)
+            count += _flush(buffer, f)
+            
+            # Patch the entry count into the header once it is known
+            f.seek(0)
+            f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, _HASH.size, count))
+        os.replace(temp_path, output_path)
+        return count
+    finally:
+        for path in runs:
+            os.remove(path)
+
+
+def _flush(buffer: array, f) -> int:
+    """Write buffered hashes in little-endian order and empty the buffer."""
+    written = len(buffer)
+    if sys.byteorder != "little":
+        buffer.byteswap()
+    buffer.tofile(f)
+    del buffer[:]
+    return written
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point for building an index."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Compile a wordlist into a memory-mapped FortiPass dictionary index."
+    )
+    parser.add_argument("wordlist", help="Input wordlist, one entry per line")
+    parser.add_argument("output", help="Output index file")
+    parser.add_argument("--run-size", type=int, default=_RUN_SIZE,
+                        help="Hashes sorted in memory per run (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    count = build_index(read_wordlist(args.wordlist), args.output, args.run_size)
+    print(f"Wrote {count} entries to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
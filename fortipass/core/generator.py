@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# FortiPass - Bulk Password Generation
+
+"""
+Generate many passwords from one buffered CSPRNG stream.
+
+generate_strong_password() draws every character with secrets.choice() and
+regenerates the whole password until each requested character class shows
+up. The result is uniform over all passwords of the given length that
+contain every class. Here the same distribution is produced without retries.
+
+PasswordSampler counts the valid passwords W of a length by
+inclusion-exclusion over the missing classes. It then maps an index in
+[0, W) to a password one position at a time. At each position the
+remaining indices are split into blocks by the class of the next character,
+each block sized by how many valid completions follow it. Every index
+decodes to a distinct password that contains every class, so a uniform
+index gives a uniform valid password.
+
+Indices are read from a RandomBuffer, which takes os.urandom() in large
+blocks and rejects values outside [0, W) instead of reducing them modulo W,
+so no password is favoured. Fewer than half of the draws are rejected, and
+a rejection costs a few bytes, never a partial password.
+"""
+
+import os
+import string
+from typing import Iterator, List, Sequence
+
+# Bytes read from os.urandom() at a time
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class RandomBuffer:
+    """Uniform random integers drawn from buffered os.urandom() output."""
+    
+    __slots__ = ("_size", "_data", "_position")
+    
+    def __init__(self, size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Initialize the buffer.
+        
+        Args:
+            size: Bytes read from os.urandom() per refill
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._size = size
+        self._data = b""
+        self._position = 0
+    
+    def take(self, count: int) -> bytes:
+        """Return the next count random bytes."""
+        end = self._position + count
+        if end > len(self._data):
+            # Keep the unread tail; bytes are never handed out twice
+            self._data = self._data[self._position:] + os.urandom(max(self._size, count))
+            self._position, end = 0, count
+        chunk = self._data[self._position:end]
+        self._position = end
+        return chunk
+    
+    def below(self, bound: int) -> int:
+        """
+        Return a uniform random integer in [0, bound).
+        
+        Args:
+            bound: Exclusive upper limit, at least 1
+        
+        Returns:
+            The random integer
+        """
+        bits = (bound - 1).bit_length()
+        size = (bits + 7) // 8
+        mask = (1 << bits) - 1
+        while True:
+            value = int.from_bytes(self.take(size), "big") & mask
+            if value < bound:
+                return value
+
+
+class PasswordSampler:
+    """Uniform sampler over passwords that contain every given character class."""
+    
+    def __init__(self, classes: Sequence[str]):
+        """
+        Initialize the sampler.
+        
+        Args:
+            classes: Disjoint, non-empty character classes; every password
+                contains at least one character of each
+        """
+        if not classes or not all(classes):
+            raise ValueError("at least one non-empty character class is required")
+        if len(set("".join(classes))) != sum(len(members) for members in classes):
+            raise ValueError("character classes must be disjoint")
+        self.classes = tuple(classes)
+        self.alphabet = "".join(self.classes)
+        # Two characters per division once every class is present
+        self._pairs = [first + second for first in self.alphabet for second in self.alphabet]
+        self._steps = {}
+    
+    def count(self, length: int) -> int:
+        """Return the number of valid passwords of a length."""
+        return self._table(length)[1]
+    
+    def _table(self, length: int) -> tuple:
+        """
+        Return the decoding table for a length, building it on first use.
+        
+        Returns:
+            (steps, total) where steps[r][mask] lists (bit, members,
+            completions, block) for each class of the next character when
+            r characters remain and the classes in mask are still missing
+        """
+        table = self._steps.get(length)
+        if table is not None:
+            return table
+        if length < len(self.classes):
+            raise ValueError(f"length must be at least {len(self.classes)} "
+                             f"to include every character class")
+        
+        full = (1 << len(self.classes)) - 1
+        sizes = [len(members) for members in self.classes]
+        alphabet = len(self.alphabet)
+        # Characters outside each subset of classes; strings of length r
+        # that miss none of the classes in mask number
+        # sum over subsets S of mask of (-1)^|S| * (alphabet - size(S))^r
+        outside = []
+        for subset in range(full + 1):
+            excluded = sum(size for bit, size in enumerate(sizes) if subset & (1 << bit))
+            outside.append((alphabet - excluded, -1 if bin(subset).count("1") % 2 else 1))
+        subsets = [[subset for subset in range(full + 1) if subset & mask == subset]
+                   for mask in range(full + 1)]
+        
+        counts = []
+        for remaining in range(length + 1):
+            counts.append([sum(outside[subset][1] * outside[subset][0] ** remaining
+                               for subset in subsets[mask])
+                           for mask in range(full + 1)])
+        
+        steps = [None]
+        for remaining in range(1, length + 1):
+            row = []
+            for mask in range(full + 1):
+                options = []
+                for bit, members in enumerate(self.classes):
+                    completions = counts[remaining - 1][mask & ~(1 << bit)]
+                    if completions:
+                        options.append((bit, members, completions,
+                                        len(members) * completions))
+                row.append(tuple(options))
+            steps.append(row)
+        
+        table = self._steps[length] = (steps, counts[length][full])
+        return table
+    
+    def decode(self, index: int, length: int) -> str:
+        """
+        Return the password with a given index.
+        
+        Args:
+            index: Integer in [0, count(length))
+            length: Password length
+        
+        Returns:
+            The password; distinct indices give distinct passwords
+        """
+        steps, total = self._table(length)
+        if not 0 <= index < total:
+            raise ValueError("index out of range")
+        alphabet = self.alphabet
+        pairs = self._pairs
+        mask = (1 << len(self.classes)) - 1
+        chars = []
+        for remaining in range(length, 0, -1):
+            if not mask:
+                # Every class is present; the rest is the index in base size
+                for _ in range(remaining // 2):
+                    index, digit = divmod(index, len(pairs))
+                    chars.append(pairs[digit])
+                if remaining % 2:
+                    chars.append(alphabet[index])
+                break
+            for bit, members, completions, block in steps[remaining][mask]:
+                if index < block:
+                    position, index = divmod(index, completions)
+                    chars.append(members[position])
+                    mask &= ~(1 << bit)
+                    break
+                index -= block
+        return "".join(chars)
+    
+    def sample(self, length: int, source: RandomBuffer) -> str:
+        """Return a uniformly chosen valid password of a length."""
+        return self.decode(source.below(self.count(length)), length)
+
+
+def character_classes(include_uppercase: bool = True, include_digits: bool = True,
+                      include_symbols: bool = True) -> List[str]:
+    """Return the character classes used by the password generators."""
+    classes = [string.ascii_lowercase]
+    if include_uppercase:
+        classes.append(string.ascii_uppercase)
+    if include_digits:
+        classes.append(string.digits)
+    if include_symbols:
+        classes.append(string.punctuation)
+    return classes
+
+
+def generate_passwords(count: int, length: int = 16, include_uppercase: bool = True,
+                       include_digits: bool = True, include_symbols: bool = True,
+                       buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[str]:
+    """
+    Generate passwords lazily from one random buffer.
+    
+    Args:
+        count: Number of passwords
+        length: Password length
+        include_uppercase: Include uppercase letters
+        include_digits: Include digits
+        include_symbols: Include special symbols
+        buffer_size: Bytes read from os.urandom() at a time
+    
+    Returns:
+        Iterator over count passwords, each containing lowercase letters and
+        every included class
+    """
+    if count < 0:
+        raise ValueError("count must not be negative")
+    sampler = PasswordSampler(character_classes(include_uppercase, include_digits,
+                                                include_symbols))
+    # Check the length before the first password is requested
+    sampler.count(length)
+    
+    def stream() -> Iterator[str]:
+        # Each call gets its own buffer, so forked workers never share one
+        source = RandomBuffer(buffer_size)
+        for _ in range(count):
+            yield sampler.sample(length, source)
+    
+    return stream()
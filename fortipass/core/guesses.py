@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# FortiPass - Minimum-Guess Decomposition Estimator
+
+"""
+zxcvbn-style guess estimation.
+
+The password is covered by a sequence of non-overlapping segments, each
+either a matched pattern (dictionary word, keyboard walk, sequence, repeat,
+date) or a brute-forced run of characters. Dynamic programming over the
+match spans finds the cover that minimizes
+
+    guesses = l! * prod(segment guesses) + MIN_GUESSES_BEFORE_GROWING ** (l - 1)
+
+where l is the number of segments. All arithmetic is done in log10 so long
+inputs never overflow.
+
+Each DP column costs O(matches ending there * MAX_SEGMENTS): the cheapest
+brute-force run ending at a column is looked up from a running minimum
+instead of trying every earlier start, so the search is linear in the
+length. Columns where no match starts or ends are skipped. Only the first
+MAX_ESTIMATE_LENGTH characters are searched; any characters after them are
+counted as brute force.
+"""
+
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fortipass.core.budget import BudgetExceeded
+
+# Guess model constants (values follow zxcvbn)
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_BEFORE_GROWING = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+KEYBOARD_STARTING_POSITIONS = 94
+KEYBOARD_AVERAGE_DEGREE = 4.6
+REFERENCE_YEAR = 2023
+MIN_YEAR_SPACE = 20
+
+# Upper bound on segments tracked per position; keeps the DP at O(n * m)
+MAX_SEGMENTS = 32
+
+# Characters searched for matches; later characters are brute-forced
+MAX_ESTIMATE_LENGTH = 256
+
+_LOG10_BRUTEFORCE = math.log10(BRUTEFORCE_CARDINALITY)
+_LOG10_GROWTH = math.log10(MIN_GUESSES_BEFORE_GROWING)
+_LOG10_MIN_SINGLE = math.log10(MIN_SUBMATCH_GUESSES_SINGLE_CHAR)
+_LOG10_MIN_MULTI = math.log10(MIN_SUBMATCH_GUESSES_MULTI_CHAR)
+# Brute-force segments must beat the submatch floors by at least one guess.
+# Only the single-character floor can bind: two brute-forced characters
+# already cost 100 guesses
+_LOG10_MIN_BRUTEFORCE_SINGLE = math.log10(MIN_SUBMATCH_GUESSES_SINGLE_CHAR + 1)
+
+# Brute-force start minima before the first column: start 0, no segments
+_INITIAL_OPEN = {0: (0.0, 0)}
+
+
+def _log10_add(a: float, b: float) -> float:
+    """Return log10(10**a + 10**b) without leaving log space."""
+    if a < b:
+        a, b = b, a
+    return a + math.log10(1 + 10 ** (b - a))
+
+
+def uppercase_variations(token: str) -> int:
+    """
+    Count the capitalization variants an attacker would try for a word.
+    
+    Args:
+        token: Matched substring in its original case
+    
+    Returns:
+        Multiplier applied to the word's base guesses
+    """
+    if token == token.lower():
+        return 1
+    upper = sum(1 for char in token if char.isupper())
+    lower = sum(1 for char in token if char.islower())
+    if upper == 0:
+        return 1
+    # Common capitalizations: first letter, last letter or all caps
+    if lower == 0 or (upper == 1 and (token[0].isupper() or token[-1].isupper())):
+        return 2
+    variations = 0
+    for i in range(1, min(upper, lower) + 1):
+        variations += _comb(upper + lower, i)
+    return variations
+
+
+def _comb(n: int, k: int) -> int:
+    """Binomial coefficient (math.comb needs Python 3.8)."""
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+
+def dictionary_guesses(token: str, rank: int) -> float:
+    """Guesses for a dictionary word given its frequency rank."""
+    return rank * uppercase_variations(token)
+
+
+def keyboard_guesses(token: str) -> float:
+    """Guesses for a straight keyboard walk of the token's length."""
+    length = len(token)
+    guesses = KEYBOARD_STARTING_POSITIONS * KEYBOARD_AVERAGE_DEGREE * max(1, length - 1)
+    return guesses * uppercase_variations(token)
+
+
+def sequence_guesses(token: str) -> float:
+    """Guesses for an ascending run such as 'abc' or '123'."""
+    first = token[0].lower()
+    if first in ("a", "1", "0"):
+        base = 4
+    elif token.isdigit():
+        base = 10
+    else:
+        base = 26
+    return base * len(token)
+
+
+def repeat_guesses(unit: str, count: int) -> float:
+    """Guesses for a unit repeated count times, brute-forcing the unit."""
+    return (BRUTEFORCE_CARDINALITY ** len(unit)) * count
+
+
+def date_guesses(token: str) -> float:
+    """Guesses for a date-like digit run."""
+    if len(token) == 4 and token[:2] in ("19", "20"):
+        return max(abs(int(token) - REFERENCE_YEAR), MIN_YEAR_SPACE)
+    if len(token) == 4:
+        return 366
+    return 12
+
+
+class GuessEstimate:
+    """Result of a minimum-guess decomposition."""
+    
+    __slots__ = ("guesses_log10", "segments")
+    
+    def __init__(self, guesses_log10: float, segments: List[Tuple[int, int, str]]):
+        """
+        Store an estimate.
+        
+        Args:
+            guesses_log10: log10 of the estimated guess count
+            segments: (start, end, kind) for each segment of the best cover
+        """
+        self.guesses_log10 = guesses_log10
+        self.segments = segments
+    
+    @property
+    def guesses(self) -> float:
+        """Estimated guess count (may be inf for very long inputs)."""
+        try:
+            return 10 ** self.guesses_log10
+        except OverflowError:
+            return math.inf
+
+
+def estimate_guesses(length: int, candidates: List[Tuple[int, int, float, str]],
+                     deadline: Optional[float] = None) -> GuessEstimate:
+    """
+    Find the minimum-guess cover of a password.
+    
+    Args:
+        length: Password length
+        candidates: (start, end, guesses, kind) for every matched segment
+        deadline: time.perf_counter() value after which the search stops
+    
+    Returns:
+        GuessEstimate for the best decomposition
+    
+    Raises:
+        BudgetExceeded: If the deadline passes before the search finishes
+    """
+    if length == 0:
+        return GuessEstimate(0.0, [])
+    
+    covered = min(length, MAX_ESTIMATE_LENGTH)
+    ending_at, starts = _group_by_end(covered, candidates)
+    best = [{0: (0.0, None, None, None)}]
+    opens = [_INITIAL_OPEN]
+    _fill_columns(best, opens, ending_at, starts, 1, covered, deadline)
+    return _best_cover(best, covered, length)
+
+
+class GuessLattice:
+    """
+    Minimum-guess DP that keeps its columns between calls.
+    
+    Column k of the DP only depends on candidates ending at or before k, so
+    when a password is edited, columns in front of the first changed
+    candidate are reused and only the rest are recomputed. Appending to a
+    long password costs one column instead of the whole table.
+    """
+    
+    def __init__(self):
+        """Initialize an empty lattice."""
+        self._ending_at = [[]]
+        self._starts = bytearray(1)
+        self._best = [{0: (0.0, None, None, None)}]
+        self._opens = [_INITIAL_OPEN]
+    
+    def update(self, length: int, candidates: List[Tuple[int, int, float, str]]) -> GuessEstimate:
+        """
+        Estimate guesses for the current password, reusing unchanged columns.
+        
+        Args:
+            length: Password length
+            candidates: (start, end, guesses, kind) for every matched segment
+        
+        Returns:
+            GuessEstimate identical to estimate_guesses(length, candidates)
+        """
+        if length == 0:
+            self._ending_at = [[]]
+            self._starts = bytearray(1)
+            del self._best[1:]
+            del self._opens[1:]
+            return GuessEstimate(0.0, [])
+        
+        covered = min(length, MAX_ESTIMATE_LENGTH)
+        ending_at, starts = _group_by_end(covered, candidates)
+        previous, previous_starts = self._ending_at, self._starts
+        first = 1
+        limit = min(len(previous), len(ending_at))
+        while (first < limit and ending_at[first] == previous[first] and
+               starts[first] == previous_starts[first]):
+            first += 1
+        # The last column may have been skipped while it was not the last
+        first = min(first, covered)
+        
+        del self._best[first:]
+        del self._opens[first:]
+        self._ending_at, self._starts = ending_at, starts
+        _fill_columns(self._best, self._opens, ending_at, starts, first, covered)
+        return _best_cover(self._best, covered, length)
+
+
+def _group_by_end(length: int,
+                  candidates: List[Tuple[int, int, float, str]]) -> Tuple[List[List[tuple]], bytearray]:
+    """
+    Group matches by end position, in log10 space with zxcvbn's floors.
+    
+    Returns:
+        (ending_at, starts) where starts[k] is 1 if a match starts at k
+    """
+    ending_at = [[] for _ in range(length + 1)]
+    starts = bytearray(length + 1)
+    for start, end, guesses, kind in candidates:
+        if not 0 <= start < end <= length:
+            continue
+        floor = _LOG10_MIN_SINGLE if end - start == 1 else _LOG10_MIN_MULTI
+        ending_at[end].append((start, max(math.log10(guesses), floor), kind))
+        starts[start] = 1
+    return ending_at, starts
+
+
+def _fill_columns(best: List[Optional[Dict[int, tuple]]], opens: List[Dict[int, tuple]],
+                  ending_at: List[List[tuple]], starts: bytearray, first: int, length: int,
+                  deadline: Optional[float] = None) -> None:
+    """
+    Append DP columns first..length to best and opens, which hold columns
+    0..first-1.
+    
+    best[k] maps a segment count to (log10 product, previous segment count,
+    segment start, kind) for the cheapest cover of password[:k].
+    
+    A brute-force run only needs to start at 0 or where a match ended
+    (elsewhere, extending the previous segment is never worse). A run of
+    two or more characters from s to end costs (end - s) in log10, so the
+    best start for each segment count is the one minimizing
+    product(s) - s. opens[k] keeps that minimum over the starts up to k as
+    count -> (product - s, s). Both maps are pruned with _pareto().
+    
+    A segment can only end where a match starts or ends, or at the last
+    column; best[k] is None for every other column. Raises BudgetExceeded
+    if the deadline passes between columns.
+    """
+    for end in range(first, length + 1):
+        matched = ending_at[end]
+        if not matched and not starts[end] and end < length:
+            best.append(None)
+            opens.append(opens[end - 1])
+            continue
+        
+        # A column costs O(matches ending here), so checking each one is cheap
+        if deadline is not None and time.perf_counter() > deadline:
+            raise BudgetExceeded("Guess estimate ran out of time")
+        
+        if end >= 2 and not matched and not ending_at[end - 1]:
+            # Only brute-force runs reach here. opens is already pruned and
+            # every entry gains the same offset, so the result stays pruned
+            offset = end * _LOG10_BRUTEFORCE
+            best.append({count + 1: (value + offset, count, start, "bruteforce")
+                         for count, (value, start) in opens[end - 2].items()
+                         if count < MAX_SEGMENTS})
+            opens.append(opens[end - 1])
+            continue
+        
+        states = {}
+        
+        for start, log_guesses, kind in matched:
+            _extend(best[start], states, start, log_guesses, kind)
+        
+        # Runs of two or more characters, from the best start per count
+        if end >= 2:
+            offset = end * _LOG10_BRUTEFORCE
+            for count, (value, start) in opens[end - 2].items():
+                next_count = count + 1
+                if next_count > MAX_SEGMENTS:
+                    continue
+                total = value + offset
+                current = states.get(next_count)
+                if current is None or total < current[0]:
+                    states[next_count] = (total, count, start, "bruteforce")
+        
+        # A single brute-forced character, held to its own floor
+        if end == 1 or ending_at[end - 1]:
+            _extend(best[end - 1], states, end - 1, _LOG10_MIN_BRUTEFORCE_SINGLE, "bruteforce")
+        
+        states = _pareto(states)
+        best.append(states)
+        if matched:
+            # A match ends here, so a brute-force run may start here
+            merged = dict(opens[end - 1])
+            offset = end * _LOG10_BRUTEFORCE
+            for count, (product, _, _, _) in states.items():
+                value = product - offset
+                current = merged.get(count)
+                if current is None or value < current[0]:
+                    merged[count] = (value, end)
+            opens.append(_pareto(merged))
+        else:
+            opens.append(opens[end - 1])
+
+
+def _pareto(states: Dict[int, tuple]) -> Dict[int, tuple]:
+    """
+    Drop every state beaten by one with fewer segments and no larger cost.
+    
+    Both the l! term and the growth term increase with the segment count,
+    and later segments add the same cost to either state, so a dominated
+    state can never be part of the cheapest cover. What is left has costs
+    falling as counts rise, which keeps columns to a few entries.
+    """
+    if len(states) < 2:
+        return states
+    kept = {}
+    lowest = math.inf
+    for count in sorted(states):
+        entry = states[count]
+        if entry[0] < lowest:
+            kept[count] = entry
+            lowest = entry[0]
+    return kept
+
+
+def _best_cover(best: List[Dict[int, tuple]], covered: int, length: int) -> GuessEstimate:
+    """
+    Pick the cheapest segment count for password[:covered] and trace it back.
+    
+    Characters past covered (see MAX_ESTIMATE_LENGTH) add one brute-force
+    guess factor each and a final brute-force segment.
+    """
+    # Apply the l! ordering term and the additive growth term
+    final = best[covered]
+    best_log = math.inf
+    best_count = None
+    for count, (product, _, _, _) in final.items():
+        log_factorial = math.lgamma(count + 1) / math.log(10)
+        total = _log10_add(product + log_factorial, (count - 1) * _LOG10_GROWTH)
+        if total < best_log:
+            best_log = total
+            best_count = count
+    
+    # Walk back pointers to recover the winning segments
+    segments = []
+    position, count = covered, best_count
+    while position > 0:
+        _, previous_count, start, kind = best[position][count]
+        segments.append((start, position, kind))
+        position, count = start, previous_count
+    segments.reverse()
+    
+    if length > covered:
+        best_log += (length - covered) * _LOG10_BRUTEFORCE
+        segments.append((covered, length, "bruteforce"))
+    return GuessEstimate(round(best_log, 4), segments)
+
+
+def _extend(source: Dict[int, tuple], target: Dict[int, tuple], start: int,
+            log_guesses: float, kind: str) -> None:
+    """Relax every state at `start` by one more segment into `target`."""
+    for count, (product, _, _, _) in source.items():
+        next_count = count + 1
+        if next_count > MAX_SEGMENTS:
+            continue
+        total = product + log_guesses
+        current = target.get(next_count)
+        if current is None or total < current[0]:
+            target[next_count] = (total, count, start, kind)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# FortiPass - Aho-Corasick Multi-Pattern Matcher
+
+from collections import deque
+from typing import Any, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton for finding many literal patterns in one scan.
+    Matching cost is linear in the text length plus the number of matches,
+    independent of how many patterns were added.
+    """
+    
+    def __init__(self):
+        """Initialize an empty automaton."""
+        self._goto = [{}]
+        # Failure links and, for each node, the patterns ending exactly
+        # there and the nearest proper suffix node that also ends a
+        # pattern; the per-node lists are filled in by build()
+        self._fail = None
+        self._outputs = None
+        self._dict_link = None
+        self._ends = {}
+        self._patterns = []
+        self._built = False
+    
+    def __len__(self) -> int:
+        """Number of patterns added to the automaton."""
+        return len(self._patterns)
+    
+    def add(self, pattern: str, value: Any = None) -> None:
+        """
+        Add a literal pattern to the automaton.
+        
+        Args:
+            pattern: Non-empty string to search for
+            value: Payload reported with each match of this pattern
+        """
+        if not pattern:
+            raise ValueError("Pattern must be a non-empty string")
+        if self._built:
+            raise RuntimeError("Cannot add patterns after the automaton is built")
+        
+        node = 0
+        goto = self._goto
+        for char in pattern:
+            child = goto[node].get(char)
+            if child is None:
+                child = len(goto)
+                goto[node][char] = child
+                goto.append({})
+            node = child
+        
+        self._ends.setdefault(node, []).append(len(self._patterns))
+        self._patterns.append((len(pattern), value))
+    
+    def build(self) -> None:
+        """Compute failure and output links. Called once after all adds."""
+        goto = self._goto
+        fail = self._fail = [0] * len(goto)
+        outputs = self._outputs = [None] * len(goto)
+        dict_link = self._dict_link = [0] * len(goto)
+        for node, ends in self._ends.items():
+            outputs[node] = ends
+        self._ends = None
+        
+        # Breadth-first so every suffix node is finished before its users
+        queue = deque(goto[0].values())
+        pop, push = queue.popleft, queue.append
+        while queue:
+            node = pop()
+            children = goto[node]
+            if not children:
+                continue
+            parent_fail = fail[node]
+            for char, child in children.items():
+                push(child)
+                if node:
+                    state = parent_fail
+                    while state and char not in goto[state]:
+                        state = fail[state]
+                    suffix = goto[state].get(char, 0)
+                    fail[child] = suffix
+                    dict_link[child] = (suffix if outputs[suffix] is not None
+                                        else dict_link[suffix])
+        
+        self._built = True
+    
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Find every occurrence of every pattern in the text.
+        
+        Args:
+            text: String to scan
+        
+        Yields:
+            Tuples of (start, end, value) for each match, ordered by end
+            position
+        """
+        if not self._built:
+            self.build()
+        
+        goto, fail = self._goto, self._fail
+        outputs, dict_link = self._outputs, self._dict_link
+        patterns = self._patterns
+        
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            
+            out = node if outputs[node] is not None else dict_link[node]
+            while out:
+                end = index + 1
+                for pattern_id in outputs[out]:
+                    length, value = patterns[pattern_id]
+                    yield end - length, end, value
+                out = dict_link[out]
+    
+    def advance(self, text: str, start: int = 0,
+                node: int = 0) -> Iterator[Tuple[int, List[Tuple[int, int, Any]]]]:
+        """
+        Resume scanning from a saved automaton state.
+        
+        Lets a caller that keeps the state reached after each character
+        rescan only the part of a text that changed.
+        
+        Args:
+            text: String to scan
+            start: Index of the first character to feed
+            node: State reached after text[:start], as yielded by an earlier
+                call (0 for the start of the text)
+        
+        Yields:
+            Tuples of (state, matches) for each character from ``start``,
+            where matches lists the (start, end, value) occurrences ending
+            at that character
+        """
+        if not self._built:
+            self.build()
+        
+        goto, fail = self._goto, self._fail
+        outputs, dict_link = self._outputs, self._dict_link
+        patterns = self._patterns
+        
+        for index in range(start, len(text)):
+            char = text[index]
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            
+            found = []
+            out = node if outputs[node] is not None else dict_link[node]
+            while out:
+                end = index + 1
+                for pattern_id in outputs[out]:
+                    length, value = patterns[pattern_id]
+                    found.append((end - length, end, value))
+                out = dict_link[out]
+            yield node, found
+    
+    def findall(self, text: str) -> List[Tuple[int, int, Any]]:
+        """Return every match in the text as a list."""
+        return list(self.finditer(text))
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# FortiPass - Diceware Passphrase Generator
+
+"""
+Diceware-style passphrases drawn from a compiled, memory-mapped word index.
+
+A wordlist is compiled once into a fixed-layout binary file: a header, an
+offset table of count + 1 little-endian uint32 values and the UTF-8 words
+back to back. Opening it costs a single mmap() call, and word i is the
+bytes between offsets i and i + 1, so picking a uniformly random word is
+one random index and one slice however long the list is.
+
+Words are drawn with RandomBuffer.below() (see fortipass.core.generator),
+which rejects out-of-range values instead of reducing them modulo the list
+size, so every word is equally likely. The entropy of a passphrase is:
+
+    words * log2(list size)
+    + (words - 1) * log2(len(separators))     one separator drawn per gap
+    + log2(10 * words)                        with include_digit
+
+Capitalization is applied to every word and adds nothing. Compiled lists
+hold distinct lowercase words without digits or whitespace, so the figure
+is exact as long as separators is not empty and none of its characters
+appears inside a word.
+
+Compile a wordlist (plain, or numbered diceware lines such as the EFF
+lists) with:
+
+    python -m fortipass.core.passphrase eff_large_wordlist.txt words.fpwl
+"""
+
+import math
+import mmap
+import os
+import struct
+import sys
+from typing import Iterable, Iterator, List, Optional
+
+from fortipass.core.generator import DEFAULT_BUFFER_SIZE, RandomBuffer
+
+# File layout: header, (count + 1) uint32 offsets into the word data, words
+WORDS_MAGIC = b"FPWORDS\0"
+_HEADER = struct.Struct("<8sII")
+_OFFSET = struct.Struct("<I")
+WORDS_VERSION = 1
+
+_DIGITS = "0123456789"
+
+
+class WordIndex:
+    """
+    Read-only view over a compiled word index file.
+    Supports len() and indexing like the list it replaces.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open and map a word index file.
+        
+        Args:
+            path: Path to a file produced by build_word_index()
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Zero-length files cannot be mapped
+            self._file.close()
+            raise ValueError(f"Invalid word index: {path}")
+        self._offsets = None
+        
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"Invalid word index: {path}")
+        magic, version, count = _HEADER.unpack_from(self._map, 0)
+        if magic != WORDS_MAGIC or version != WORDS_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported word index format: {path}")
+        self._count = count
+        self._data = _HEADER.size + (count + 1) * _OFFSET.size
+        if (len(self._map) < self._data or
+                len(self._map) != self._data + self._offset(count)):
+            self.close()
+            raise ValueError(f"Truncated word index: {path}")
+        
+        # A typed view reads offsets without unpacking on little-endian hosts
+        if sys.byteorder == "little":
+            self._offsets = memoryview(self._map)[_HEADER.size:self._data].cast("I")
+    
+    def _offset(self, index: int) -> int:
+        """Read one entry of the offset table."""
+        return _OFFSET.unpack_from(self._map, _HEADER.size + index * _OFFSET.size)[0]
+    
+    def __len__(self) -> int:
+        """Number of words in the index."""
+        return self._count
+    
+    def __getitem__(self, index: int) -> str:
+        """Return word number index (0-based)."""
+        if not 0 <= index < self._count:
+            raise IndexError("word index out of range")
+        if self._offsets is not None:
+            start, end = self._offsets[index], self._offsets[index + 1]
+        else:
+            start, end = self._offset(index), self._offset(index + 1)
+        return self._map[self._data + start:self._data + end].decode("utf-8")
+    
+    def close(self) -> None:
+        """Unmap the index and close the underlying file."""
+        offsets = getattr(self, "_offsets", None)
+        if offsets is not None:
+            offsets.release()
+            self._offsets = None
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+    
+    def __getstate__(self):
+        """Pickle by path so worker processes map the same pages."""
+        return {"path": self.path}
+    
+    def __setstate__(self, state):
+        """Re-open the index in the receiving process."""
+        self.__init__(state["path"])
+
+
+def read_word_file(path: str) -> Iterator[str]:
+    """
+    Yield the words of a wordlist file.
+    
+    Lines may hold a bare word or a diceware roll followed by a word
+    ("11111<TAB>abacus"); the roll is dropped.
+    """
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) == 2 and fields[0].isdigit():
+                yield fields[1]
+            elif len(fields) == 1:
+                yield fields[0]
+
+
+def normalize_words(words: Iterable[str]) -> List[str]:
+    """
+    Return the distinct usable words in first-seen order.
+    
+    Words are lowercased. Entries containing digits or whitespace are
+    dropped, so digit insertion and separators cannot make two passphrases
+    collide.
+    """
+    seen = set()
+    result = []
+    for word in words:
+        word = word.strip().lower()
+        if (not word or word in seen or any(c.isdigit() for c in word) or
+                any(c.isspace() for c in word)):
+            continue
+        seen.add(word)
+        result.append(word)
+    return result
+
+
+def build_word_index(words: Iterable[str], output_path: str) -> int:
+    """
+    Compile words into a word index file.
+    
+    Args:
+        words: Iterable of words; normalized with normalize_words()
+        output_path: Destination index file
+    
+    Returns:
+        Number of words written
+    """
+    words = normalize_words(words)
+    if len(words) < 2:
+        raise ValueError("a passphrase wordlist needs at least two distinct words")
+    encoded = [word.encode("utf-8") for word in words]
+    offsets = [0]
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+    if offsets[-1] >= 1 << 32:
+        raise ValueError("wordlist is too large for a word index")
+    
+    temp_path = output_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(WORDS_MAGIC, WORDS_VERSION, len(encoded)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(encoded))
+    os.replace(temp_path, output_path)
+    return len(encoded)
+
+
+class PassphraseGenerator:
+    """Generates passphrases of uniformly chosen words from a WordIndex."""
+    
+    def __init__(self, index: WordIndex, words: int = 6, separators: str = "-",
+                 capitalize: bool = False, include_digit: bool = False):
+        """
+        Initialize the generator.
+        
+        Args:
+            index: Compiled word index to draw from
+            words: Number of words per passphrase
+            separators: Characters placed between words, one drawn uniformly
+                per gap ("" joins the words directly)
+            capitalize: Capitalize the first letter of every word
+            include_digit: Append a random digit to one random word
+        """
+        if words < 1:
+            raise ValueError("words must be at least 1")
+        if len(index) < 2:
+            raise ValueError("the word index needs at least two words")
+        if len(set(separators)) != len(separators):
+            raise ValueError("separators must be distinct characters")
+        if any(c.isalnum() for c in separators):
+            raise ValueError("separators must not be letters or digits")
+        self.index = index
+        self.words = words
+        self.separators = separators
+        self.capitalize = capitalize
+        self.include_digit = include_digit
+        
+        entropy = words * math.log2(len(index))
+        if len(separators) > 1:
+            entropy += (words - 1) * math.log2(len(separators))
+        if include_digit:
+            entropy += math.log2(10 * words)
+        # Bits of randomness in every passphrase
+        self.entropy = entropy
+    
+    def generate(self, source: Optional[RandomBuffer] = None) -> str:
+        """
+        Generate one passphrase.
+        
+        Args:
+            source: Random buffer to draw from (a fresh one by default)
+        
+        Returns:
+            The passphrase
+        """
+        if source is None:
+            source = RandomBuffer(64)
+        index = self.index
+        count = len(index)
+        chosen = [index[source.below(count)] for _ in range(self.words)]
+        if self.capitalize:
+            chosen = [word.capitalize() for word in chosen]
+        if self.include_digit:
+            position = source.below(self.words)
+            chosen[position] += _DIGITS[source.below(10)]
+        
+        separators = self.separators
+        if len(separators) <= 1:
+            return separators.join(chosen)
+        parts = [chosen[0]]
+        for word in chosen[1:]:
+            parts.append(separators[source.below(len(separators))])
+            parts.append(word)
+        return "".join(parts)
+    
+    def generate_many(self, count: int,
+                      buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[str]:
+        """
+        Generate passphrases lazily from one random buffer.
+        
+        Args:
+            count: Number of passphrases
+            buffer_size: Bytes read from os.urandom() at a time
+        
+        Returns:
+            Iterator over count passphrases
+        """
+        if count < 0:
+            raise ValueError("count must not be negative")
+        
+        def stream() -> Iterator[str]:
+            # Each call gets its own buffer, so forked workers never share one
+            source = RandomBuffer(buffer_size)
+            for _ in range(count):
+                yield self.generate(source)
+        
+        return stream()
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point for compiling a word index."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Compile a wordlist into a memory-mapped FortiPass passphrase word index."
+    )
+    parser.add_argument("wordlist", help="Input wordlist, one word (or roll and word) per line")
+    parser.add_argument("output", help="Output word index file")
+    args = parser.parse_args(argv)
+    
+    try:
+        count = build_word_index(read_word_file(args.wordlist), args.output)
+    except ValueError as e:
+        sys.stderr.write(f"fortipass.core.passphrase: {e}\n")
+        return 2
+    print(f"Wrote {count} words ({math.log2(count):.2f} bits per word) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,108 @@
 # FortiPass - Password Analyzer Core Module
 
 import math
-import re
 import os
-from datetime import datetime
-from typing import Dict, List, Tuple, Any
+from itertools import islice
+from typing import Dict, List, Tuple, Any, Iterable, Iterator, Optional
+
+# Optional stores (bloom, breach_store, dictionary_index, result_cache) are
+# imported where they are configured, keeping this module cheap to import
+from fortipass.core import guesses as guess_model
+from fortipass.core.budget import AnalysisBudget, BudgetExceeded, BudgetState
+from fortipass.core.generator import generate_passwords
+from fortipass.core.matcher import AhoCorasick
+from fortipass.core.repeats import find_repeats
+from fortipass.core.results import (
+    RESULT_FIELDS, AnalysisResult, PatternMatch, PatternType, Severity
+)
+from fortipass.core.scanner import PasswordFeatures, scan_password
+
+# Date regular expressions shared by every analyzer instance, compiled on
+# first use by _compile_patterns()
+_DATE_RES = None
+
+# Shortest dictionary entry reported when found inside a longer password
+_MIN_DICTIONARY_SUBSTRING = 4
+
+# Payload tags stored in the multi-pattern matcher
+_MATCH_KEYBOARD = 0
+_MATCH_DICTIONARY = 1
+
+# Built matchers shared by every analyzer that loads the same wordlist file,
+# mapping its path to ((keyboard patterns, size, mtime), matcher); forked
+# workers inherit them
+_MATCHERS = {}
+
+# Offline attack rate assumed for crack time estimates (guesses per second)
+_GUESSES_PER_SECOND = 10 ** 11
+
+# Approximate size of a full breach corpus; a breached password is assumed
+# to be guessed after (corpus size / occurrences) attempts
+_BREACH_CORPUS_GUESSES = 10 ** 9
+
+# Feedback messages are shared constants rather than rebuilt per call
+_FEEDBACK_EMPTY = "Password cannot be empty"
+_FEEDBACK_TOO_SHORT = "Password is too short. Use at least 8 characters."
+_FEEDBACK_LONGER = "Consider using a longer password (12+ characters)."
+_FEEDBACK_PASSPHRASE = "Consider using a passphrase with multiple words."
+_FEEDBACK_OK = "Password meets security requirements."
+_PATTERN_FEEDBACK = {
+    PatternType.BREACHED: "This password has appeared in a data breach. Choose a different one.",
+    PatternType.DICTIONARY_WORD: "Avoid using common passwords or dictionary words.",
+    PatternType.DICTIONARY_SUBSTRING: "Avoid using common passwords or dictionary words.",
+    PatternType.DATE: "Avoid using dates in your password.",
+    PatternType.KEYBOARD_PATTERN: "Avoid keyboard patterns like 'qwerty' or 'asdfgh'.",
+    PatternType.REPEATED_CHARS: "Avoid repeating characters (e.g., 'aaa').",
+    PatternType.SEQUENTIAL_CHARS: "Avoid sequential characters like 'abc' or '123'.",
+    PatternType.REPEATED_SEQUENCE: "Avoid repeating sequences of characters.",
+}
+
+# "Add ... to increase strength." for every combination of missing classes,
+# keyed by (has lowercase, has uppercase, has digits, has symbols)
+_CLASS_NAMES = ("lowercase letters", "uppercase letters", "numbers", "special characters")
+_MISSING_CLASSES_FEEDBACK = {}
+for _mask in range(16):
+    _present = tuple(bool(_mask & (1 << _bit)) for _bit in range(4))
+    _missing = [name for name, has in zip(_CLASS_NAMES, _present) if not has]
+    _MISSING_CLASSES_FEEDBACK[_present] = (
+        f"Add {', '.join(_missing)} to increase strength." if _missing else None)
+del _mask, _present, _missing
+
+# Per-character heatmap scores: base value by character class, reduced by
+# each pattern covering the position according to its severity
+_CHAR_SCORE_LOWER = 40
+_CHAR_SCORE_UPPER = 60
+_CHAR_SCORE_DIGIT = 50
+_CHAR_SCORE_SYMBOL = 80
+_CHAR_SEVERITY_PENALTY = {
+    Severity.CRITICAL: 60,
+    Severity.HIGH: 35,
+    Severity.MEDIUM: 20,
+    Severity.LOW: 10,
+}
+
+_EMPTY_RESULT = AnalysisResult(
+    length=0, entropy=0, char_diversity=0, has_lowercase=False,
+    has_uppercase=False, has_digits=False, has_symbols=False, patterns=(),
+    strength_score=0, strength_category="Very Weak", crack_time="Instant",
+    feedback=(_FEEDBACK_EMPTY,), guesses_log10=0.0, crack_time_guesses="Instant"
+)
+
+
+class _NullClock:
+    """Stage clock used when profiling is disabled; every call is a no-op."""
+    
+    __slots__ = ()
+    
+    def lap(self, stage: str) -> None:
+        pass
+    
+    def stop(self) -> None:
+        pass
+
+
+_NULL_CLOCK = _NullClock()
+
 
 class PasswordAnalyzer:
     """
@@ -13,196 +111,714 @@ class PasswordAnalyzer:
     Performs entropy calculation, pattern detection, and strength assessment.
     """
     
-    def __init__(self, wordlist_path: str = None):
+    def __init__(self, wordlist_path: str = None, index_path: str = None,
+                 bloom_path: str = None, breach_store_path: str = None,
+                 breach_cache_size: int = 1024, cache_size: int = 0,
+                 cache_ttl: float = None, profile: bool = False,
+                 budget: AnalysisBudget = None, passphrase_index_path: str = None):
         """
         Initialize the password analyzer with optional wordlist for dictionary checks.
         
         Args:
             wordlist_path: Path to the dictionary file of common passwords
+            index_path: Path to a prebuilt dictionary index (see
+                fortipass.core.dictionary_index) for large corpora. It is
+                memory-mapped rather than loaded, and is checked for exact
+                matches in addition to the wordlist.
+            bloom_path: Path to a serialized Bloom filter (see
+                fortipass.core.bloom) built over the same entries. Exact
+                stores are only consulted when the filter reports a hit.
+            breach_store_path: Directory of SHA-1 range shards (see
+                fortipass.core.breach_store) used to flag breached passwords
+            breach_cache_size: Number of breach shards kept in memory
+            cache_size: Number of results kept in an LRU cache keyed by a
+                salted hash of the password (0 disables caching)
+            cache_ttl: Seconds before a cached result expires (None keeps
+                results until evicted)
+            profile: Record per-stage timings in self.profiler (see
+                fortipass.core.profiler); read them with profile_info()
+            budget: Limits on characters inspected, matches kept and time
+                per analysis (see fortipass.core.budget). Results that hit
+                a limit are flagged ``partial``.
+            passphrase_index_path: Path to a compiled passphrase word index
+                (see fortipass.core.passphrase), enabling generate_passphrase()
         """
-        self.common_words = set()
+        # Constructor arguments, so worker processes can rebuild the analyzer
+        self._config = (
+            ("wordlist_path", wordlist_path), ("index_path", index_path),
+            ("bloom_path", bloom_path), ("breach_store_path", breach_store_path),
+            ("breach_cache_size", breach_cache_size), ("cache_size", cache_size),
+            ("cache_ttl", cache_ttl), ("profile", profile), ("budget", budget),
+            ("passphrase_index_path", passphrase_index_path),
+        )
+        self.wordlist_path = wordlist_path
+        # Maps each common password to its frequency rank (1 = most common);
+        # loaded from wordlist_path on first use
+        self._common_words = None
+        # Identifies the loaded wordlist file for the shared matcher cache;
+        # None when the words were assigned directly
+        self._wordlist_key = None
+        self.dictionary_index = None
+        self.bloom_filter = None
+        self.breach_store = None
+        self.word_index = None
+        self.result_cache = None
+        self.profiler = None
+        self.budget = budget
         self.keyboard_patterns = [
             "qwerty", "asdfgh", "zxcvbn", "1234", "qazwsx",
             "poiuyt", "lkjhgf", "mnbvcx", "0987", "wsxcde"
         ]
         
-        # Load common password dictionary if provided
+        if cache_size > 0:
+            from fortipass.core.result_cache import ResultCache
+            self.result_cache = ResultCache(cache_size, cache_ttl)
+        
+        if profile:
+            from fortipass.core.profiler import StageProfiler
+            self.profiler = StageProfiler()
+        
+        # Memory-mapped index for corpora too large to hold as a set
+        if index_path:
+            from fortipass.core.dictionary_index import DictionaryIndex
+            self.dictionary_index = DictionaryIndex(index_path)
+        
+        # Optional fast-reject prefilter in front of the exact stores
+        if bloom_path:
+            from fortipass.core.bloom import BloomFilter
+            self.bloom_filter = BloomFilter.load(bloom_path)
+        
+        # Offline breach corpus; shards load lazily on first lookup
+        if breach_store_path:
+            from fortipass.core.breach_store import BreachStore
+            self.breach_store = BreachStore(breach_store_path, cache_size=breach_cache_size)
+        
+        # Passphrase words, memory-mapped like the dictionary index
+        if passphrase_index_path:
+            from fortipass.core.passphrase import WordIndex
+            self.word_index = WordIndex(passphrase_index_path)
+        
+        # Descriptions are built once per keyboard pattern, not per match
+        self._keyboard_descriptions = [
+            f"Keyboard pattern: '{pattern}'" for pattern in self.keyboard_patterns
+        ]
+        
+        # Keyboard walks and dictionary entries share one automaton, built
+        # on first use
+        self._matcher = None
+    
+    def config(self) -> Tuple[Tuple[str, Any], ...]:
+        """
+        Return the constructor arguments as hashable (name, value) pairs.
+        
+        PasswordAnalyzer(**dict(analyzer.config())) builds an equivalent
+        analyzer, e.g. inside a worker process. Words assigned to
+        common_words directly are not included.
+        """
+        return self._config
+    
+    @property
+    def common_words(self) -> Dict[str, int]:
+        """Common passwords mapped to frequency rank, loaded on first access."""
+        if self._common_words is None:
+            self._wordlist_key = self._stat_wordlist(self.wordlist_path)
+            self._common_words = self._load_wordlist(self.wordlist_path)
+        return self._common_words
+    
+    @common_words.setter
+    def common_words(self, words: Dict[str, int]) -> None:
+        self._common_words = words
+        self._wordlist_key = None
+        self._matcher = None
+    
+    @staticmethod
+    def _stat_wordlist(wordlist_path: Optional[str]) -> Optional[Tuple[str, int, int]]:
+        """Return (path, size, mtime) of a wordlist file, or None if missing."""
+        if not wordlist_path:
+            return None
+        try:
+            stat = os.stat(wordlist_path)
+        except OSError:
+            return None
+        return os.path.abspath(wordlist_path), stat.st_size, stat.st_mtime_ns
+    
+    @staticmethod
+    def _load_wordlist(wordlist_path: Optional[str]) -> Dict[str, int]:
+        """Read a wordlist into a word -> rank mapping (empty if missing)."""
+        common_words = {}
         if wordlist_path and os.path.exists(wordlist_path):
             with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
-                self.common_words = {line.strip().lower() for line in f if line.strip()}
+                for line in f:
+                    word = line.strip().lower()
+                    if word and word not in common_words:
+                        common_words[word] = len(common_words) + 1
+        return common_words
     
-    def analyze(self, password: str) -> Dict[str, Any]:
+    def preload(self) -> None:
+        """
+        Load the wordlist and build the matcher now rather than on first use.
+        
+        Call this before forking worker processes so they share the loaded
+        data instead of each rebuilding it.
+        """
+        _compile_patterns()
+        if self._matcher is None:
+            self._matcher = self._build_matcher()
+    
+    def _build_matcher(self) -> AhoCorasick:
+        """
+        Build the substring automaton for keyboard and dictionary patterns.
+        
+        Analyzers loading the same unchanged wordlist file share one
+        automaton, so only the first of them pays for the build.
+        """
+        words = self.common_words
+        path = stamp = None
+        if self._wordlist_key is not None:
+            path, size, mtime = self._wordlist_key
+            stamp = (tuple(self.keyboard_patterns), size, mtime)
+            cached = _MATCHERS.get(path)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+        
+        matcher = AhoCorasick()
+        for index, pattern in enumerate(self.keyboard_patterns):
+            matcher.add(pattern, (_MATCH_KEYBOARD, index))
+        for word, rank in words.items():
+            if len(word) >= _MIN_DICTIONARY_SUBSTRING:
+                matcher.add(word, (_MATCH_DICTIONARY, rank))
+        matcher.build()
+        if path is not None:
+            # Replaces the entry for an older version of the file
+            _MATCHERS[path] = (stamp, matcher)
+        return matcher
+    
+    def analyze(self, password: str) -> AnalysisResult:
         """
         Perform comprehensive password analysis.
         
         Args:
             password: The password to analyze
-            
+        
+        Returns:
+            Immutable AnalysisResult; it reads like a dict, and to_dict()
+            returns a plain copy
+        """
+        return self._analyze(password, None)
+    
+    def analyze_many(self, passwords: Iterable[str], chunk_size: int = 1000,
+                     fields: Optional[Iterable[str]] = None) -> Iterator[AnalysisResult]:
+        """
+        Analyze a stream of passwords, yielding one result per input.
+        
+        Input is consumed lazily in chunks of ``chunk_size`` so memory stays
+        flat regardless of how many passwords are supplied.
+        
+        Args:
+            passwords: Iterable of passwords to analyze
+            chunk_size: Number of passwords pulled from the input at a time
+            fields: Optional subset of result keys to compute. Feedback and
+                crack time strings are only built when requested.
+        
+        Yields:
+            AnalysisResult for each password, in input order
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        wanted = self._resolve_fields(fields)
+        
+        iterator = iter(passwords)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            for password in chunk:
+                yield self._analyze(password, wanted)
+    
+    def _resolve_fields(self, fields: Optional[Iterable[str]]) -> Optional[frozenset]:
+        """Validate a requested field subset, returning None for all fields."""
+        if fields is None:
+            return None
+        wanted = frozenset(fields)
+        unknown = wanted.difference(RESULT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown result fields: {', '.join(sorted(unknown))}")
+        return wanted
+    
+    def _analyze(self, password: str, fields: Optional[frozenset]) -> AnalysisResult:
+        """
+        Analyze a single password, computing only the requested fields.
+        
+        Args:
+            password: The password to analyze
+            fields: Result keys to compute, or None for all of them
+        
         Returns:
-            Dictionary containing analysis results
+            AnalysisResult with unrequested fields left unset
         """
         if not password:
-            return self._empty_result()
+            if fields is not None:
+                return _EMPTY_RESULT.select(fields)
+            return _EMPTY_RESULT
         
-        # Basic metrics
+        cache = self.result_cache
+        if cache is not None:
+            cache_key = cache.key_for(password, fields)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+            result = self._compute(password, fields)
+            # Partial results depend on the budget and, for time limits, on load
+            if not result.partial:
+                cache.put(cache_key, result)
+            return result
+        return self._compute(password, fields)
+    
+    def _compute(self, password: str, fields: Optional[frozenset]) -> AnalysisResult:
+        """Run the analysis pipeline on a non-empty password."""
+        # One-time loading is charged neither to the budget nor, when
+        # profiling, to the first analysis's scan stage
+        if self.budget is not None and self._matcher is None:
+            self.preload()
+        clock = _NULL_CLOCK if self.profiler is None else self.profiler.start()
+        state = None
         length = len(password)
-        entropy = self._calculate_entropy(password)
+        if self.budget is not None:
+            state = self.budget.start()
+            password = state.truncate(password)
+        
+        # Single walk over the password feeds every later stage
+        features = scan_password(password)
+        clock.lap("scan")
+        matches = self._scan_matches(features.lowered, state)
+        clock.lap("match")
+        result = self._build_result(password, features, matches, fields, clock=clock,
+                                    state=state)
+        if state is not None and state.partial:
+            changes = {"partial": True}
+            if len(password) < length:
+                # Every other field describes the analyzed prefix; say so
+                # and report the real length
+                changes["analyzed_length"] = len(password)
+                if result.length is not None:
+                    changes["length"] = length
+            result = result.replace(**changes)
+        clock.stop()
+        return result
+    
+    def _build_result(self, password: str, features: PasswordFeatures, matches: Tuple,
+                      fields: Optional[frozenset],
+                      lattice: guess_model.GuessLattice = None,
+                      clock: Any = None, state: BudgetState = None) -> AnalysisResult:
+        """
+        Score a password from its scanner features and automaton matches.
+        
+        Args:
+            password: The password being analyzed
+            features: Scanner features for the password
+            matches: Grouped automaton matches from _group_matches
+            fields: Result keys to compute, or None for all of them
+            lattice: Guess DP kept across calls by an AnalysisSession, so
+                only the columns affected by an edit are recomputed
+            clock: StageClock timing each stage when profiling is enabled
+            state: Budget state of this analysis, if a budget is set. Hitting
+                a limit sets state.partial; the caller flags the result.
+        
+        Returns:
+            AnalysisResult with unrequested fields left unset
+        """
+        if clock is None:
+            clock = _NULL_CLOCK
         
-        # Character diversity checks
-        has_lowercase = bool(re.search(r'[a-z]', password))
-        has_uppercase = bool(re.search(r'[A-Z]', password))
-        has_digits = bool(re.search(r'[0-9]', password))
-        has_symbols = bool(re.search(r'[^a-zA-Z0-9\s]', password))
-        char_diversity = sum([has_lowercase, has_uppercase, has_digits, has_symbols])
+        # Basic metrics
+        length = features.length
+        entropy = self._calculate_entropy(features)
+        char_diversity = features.char_diversity
+        clock.lap("entropy")
         
         # Pattern detection
-        patterns = self._detect_patterns(password)
+        patterns = self._detect_patterns(password, features, matches, clock, state)
         
         # Calculate strength score (0-100)
         strength_score = self._calculate_strength(
             length, entropy, char_diversity, patterns
         )
+        clock.lap("strength")
         
-        # Calculate crack time estimation
-        crack_time = self._estimate_crack_time(entropy)
+        # Crack time and feedback are string-heavy, so skip them when unused
+        crack_time = feedback = None
+        if fields is None or "crack_time" in fields:
+            crack_time = self._estimate_crack_time(entropy)
+            clock.lap("crack_time")
+        if fields is None or "feedback" in fields:
+            feedback = self._generate_feedback(
+                length, entropy, char_diversity, patterns, features
+            )
+            clock.lap("feedback")
+        
+        # Guess-based estimate from the minimum-guess decomposition
+        guesses_log10 = crack_time_guesses = None
+        if fields is None or "guesses_log10" in fields or "crack_time_guesses" in fields:
+            if state is not None:
+                guesses_log10 = self._budgeted_guesses(password, features, patterns,
+                                                       matches, entropy, state)
+            elif lattice is None:
+                guesses_log10 = self.estimate_guesses(
+                    password, features, patterns, matches).guesses_log10
+            else:
+                guesses_log10 = lattice.update(features.length, self._guess_candidates(
+                    password, features, patterns, matches)).guesses_log10
+            crack_time_guesses = self._format_crack_time_log10(guesses_log10)
+            clock.lap("guesses")
         
-        # Generate feedback
-        feedback = self._generate_feedback(
-            length, entropy, char_diversity, patterns, password
+        result = AnalysisResult(
+            length, entropy, char_diversity, features.has_lowercase,
+            features.has_uppercase, features.has_digits, features.has_symbols,
+            patterns, strength_score, self._get_strength_category(strength_score),
+            crack_time, feedback, guesses_log10, crack_time_guesses
         )
         
-        return {
-            "length": length,
-            "entropy": entropy,
-            "char_diversity": char_diversity,
-            "has_lowercase": has_lowercase,
-            "has_uppercase": has_uppercase,
-            "has_digits": has_digits,
-            "has_symbols": has_symbols,
-            "patterns": patterns,
-            "strength_score": strength_score,
-            "strength_category": self._get_strength_category(strength_score),
-            "crack_time": crack_time,
-            "feedback": feedback
-        }
-    
-    def _empty_result(self) -> Dict[str, Any]:
-        """Return default result for empty password."""
-        return {
-            "length": 0,
-            "entropy": 0,
-            "char_diversity": 0,
-            "has_lowercase": False,
-            "has_uppercase": False,
-            "has_digits": False,
-            "has_symbols": False,
-            "patterns": [],
-            "strength_score": 0,
-            "strength_category": "Very Weak",
-            "crack_time": "Instant",
-            "feedback": ["Password cannot be empty"]
-        }
-    
-    def _calculate_entropy(self, password: str) -> float:
-        """
-        Calculate Shannon entropy of the password.
+        if fields is not None:
+            result = result.select(fields)
+        clock.lap("result")
+        return result
+    
+    def cache_info(self) -> Dict[str, Any]:
+        """
+        Return result cache statistics.
+        
+        Returns:
+            Dictionary of hit/miss/eviction counters, or an empty dict when
+            caching is disabled
+        """
+        return self.result_cache.info() if self.result_cache is not None else {}
+    
+    def profile_info(self) -> Dict[str, Any]:
+        """
+        Return per-stage timing statistics.
+        
+        Returns:
+            Dictionary from StageProfiler.to_dict(), or an empty dict when
+            profiling is disabled. Use self.profiler.to_prometheus() for the
+            Prometheus text format.
+        """
+        return self.profiler.to_dict() if self.profiler is not None else {}
+    
+    def clear_cache(self) -> None:
+        """Drop every cached analysis result."""
+        if self.result_cache is not None:
+            self.result_cache.clear()
+    
+    def _calculate_entropy(self, features: PasswordFeatures) -> float:
+        """
+        Calculate Shannon entropy of the password from its character histogram.
         
         H = -sum(p_i * log2(p_i)) where p_i is the probability of character i
         """
-        if not password:
+        length = features.length
+        if not length:
             return 0
-            
-        # Count character frequencies
-        char_count = {}
-        for char in password:
-            if char in char_count:
-                char_count[char] += 1
-            else:
-                char_count[char] = 1
         
         # Calculate entropy
-        length = len(password)
         entropy = 0
-        for count in char_count.values():
+        for count in features.histogram.values():
             probability = count / length
             entropy -= probability * math.log2(probability)
-            
+        
         # Adjust for password length
         entropy *= length
         
         return round(entropy, 2)
     
-    def _detect_patterns(self, password: str) -> List[Dict[str, Any]]:
+    def _scan_matches(self, password_lower: str,
+                      state: BudgetState = None) -> Tuple[Dict[int, List], List[Tuple]]:
+        """
+        Find every keyboard walk and dictionary substring in one linear scan.
+        
+        Args:
+            password_lower: Lowercased password
+            state: Budget state; only the first max_matches hits are kept
+        
+        Returns:
+            Tuple of (keyboard pattern index -> list of spans, list of
+            (start, end, rank) dictionary matches)
+        """
+        matcher = self._matcher
+        if matcher is None:
+            matcher = self._matcher = self._build_matcher()
+        found = matcher.finditer(password_lower)
+        if state is not None and state.max_matches is not None:
+            found = state.limit(list(islice(found, state.max_matches + 1)))
+        return self._group_matches(found)
+    
+    @staticmethod
+    def _group_matches(found: Iterable[Tuple]) -> Tuple[Dict[int, List], List[Tuple]]:
+        """Split raw (start, end, payload) matcher hits by payload kind."""
+        keyboard_spans = {}
+        dictionary_matches = []
+        for start, end, (kind, value) in found:
+            if kind == _MATCH_KEYBOARD:
+                keyboard_spans.setdefault(value, []).append((start, end))
+            else:
+                dictionary_matches.append((start, end, value))
+        return keyboard_spans, dictionary_matches
+    
+    def _detect_patterns(self, password: str, features: PasswordFeatures,
+                         matches: Tuple = None, clock: Any = None,
+                         state: BudgetState = None) -> Tuple[PatternMatch, ...]:
         """
         Detect common patterns that weaken passwords.
         
         Returns:
-            List of detected patterns with type and description
+            Tuple of detected patterns with type and description
         """
+        if clock is None:
+            clock = _NULL_CLOCK
         patterns = []
-        password_lower = password.lower()
+        password_lower = features.lowered
+        length = features.length
+        
+        if matches is None:
+            matches = self._scan_matches(password_lower)
+        keyboard_spans, dictionary_matches = matches
+        
+        # Check against the breach corpus (exact, case-sensitive)
+        if self.breach_store is not None:
+            occurrences = self.breach_store.lookup(password)
+            if occurrences:
+                patterns.append(PatternMatch(
+                    PatternType.BREACHED,
+                    (f"Found in breach corpus ({occurrences:,} "
+                     f"occurrence{'s' if occurrences != 1 else ''})"),
+                    Severity.CRITICAL, ((0, length),), occurrences
+                ))
+            clock.lap("detect.breach")
         
         # Check for dictionary words
-        if self.common_words and password_lower in self.common_words:
-            patterns.append({
-                "type": "dictionary_word",
-                "description": "Common password",
-                "severity": "high"
-            })
+        if self._is_common_word(password_lower):
+            patterns.append(PatternMatch(
+                PatternType.DICTIONARY_WORD, "Common password", Severity.HIGH,
+                ((0, length),)
+            ))
+        elif dictionary_matches:
+            patterns.append(PatternMatch(
+                PatternType.DICTIONARY_SUBSTRING, "Contains common password",
+                Severity.MEDIUM,
+                tuple((start, end) for start, end, _ in dictionary_matches)
+            ))
+        clock.lap("detect.dictionary")
         
         # Check for dates (common formats)
-        date_patterns = [
-            r'19\d{2}', r'20\d{2}',  # Years (1900-2099)
-            r'0[1-9]|1[0-2][0-3][0-9]',  # MMDD
-            r'[0-3][0-9][0-1][0-9]',  # DDMM
-        ]
-        
-        for pattern in date_patterns:
-            if re.search(pattern, password):
-                patterns.append({
-                    "type": "date",
-                    "description": "Contains date pattern",
-                    "severity": "medium"
-                })
+        for pattern in _compile_patterns():
+            match = pattern.search(password)
+            if match:
+                patterns.append(PatternMatch(
+                    PatternType.DATE, "Contains date pattern", Severity.MEDIUM,
+                    (match.span(),)
+                ))
                 break
+        clock.lap("detect.date")
         
         # Check for keyboard patterns
-        for pattern in self.keyboard_patterns:
-            if pattern in password_lower:
-                patterns.append({
-                    "type": "keyboard_pattern",
-                    "description": f"Keyboard pattern: '{pattern}'",
-                    "severity": "high"
-                })
+        for index in sorted(keyboard_spans):
+            patterns.append(PatternMatch(
+                PatternType.KEYBOARD_PATTERN, self._keyboard_descriptions[index],
+                Severity.HIGH, tuple(keyboard_spans[index])
+            ))
+        clock.lap("detect.keyboard")
         
         # Check for repeated characters
-        if re.search(r'(.)\1{2,}', password):
-            patterns.append({
-                "type": "repeated_chars",
-                "description": "Repeated characters",
-                "severity": "medium"
-            })
+        if features.repeat_runs:
+            patterns.append(PatternMatch(
+                PatternType.REPEATED_CHARS, "Repeated characters", Severity.MEDIUM,
+                tuple(features.repeat_runs)
+            ))
+        clock.lap("detect.repeated_chars")
         
         # Check for sequential characters
-        if re.search(r'(abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz|012|123|234|345|456|567|678|789|890)', password_lower):
-            patterns.append({
-                "type": "sequential_chars",
-                "description": "Sequential characters",
-                "severity": "medium"
-            })
-        
-        # Check for repeated sequences
-        if re.search(r'(.{2,})\1+', password):
-            patterns.append({
-                "type": "repeated_sequence",
-                "description": "Repeated sequence of characters",
-                "severity": "medium"
-            })
-            
-        return patterns
+        if features.sequential_runs:
+            patterns.append(PatternMatch(
+                PatternType.SEQUENTIAL_CHARS, "Sequential characters", Severity.MEDIUM,
+                tuple(features.sequential_runs)
+            ))
+        clock.lap("detect.sequential_chars")
+        
+        # Check for repeated sequences. A run of four or more of one
+        # character counts too, as it always has ('aaaa' is 'aa' twice).
+        # This is the costliest detector, so a time budget skips it first
+        repeats = None
+        if state is None or not state.expired():
+            repeats = find_repeats(password)
+            single = [(start, end, 1) for start, end in features.repeat_runs
+                      if end - start >= 4]
+            if single:
+                repeats = sorted(repeats + single)
+            if state is not None:
+                repeats = state.limit(repeats)
+        if repeats:
+            patterns.append(PatternMatch(
+                PatternType.REPEATED_SEQUENCE, "Repeated sequence of characters",
+                Severity.MEDIUM, tuple((start, end) for start, end, _ in repeats),
+                units=tuple((start, start + period) for start, _, period in repeats)
+            ))
+        clock.lap("detect.repeated_sequence")
+        
+        return tuple(patterns)
+    
+    def estimate_guesses(self, password: str, features: PasswordFeatures = None,
+                         patterns: Tuple[PatternMatch, ...] = None,
+                         matches: Tuple = None) -> guess_model.GuessEstimate:
+        """
+        Estimate the guesses needed to crack a password by minimum-guess
+        decomposition over its matched patterns.
+        
+        Args:
+            password: The password to estimate
+            features: Precomputed scanner features, if available
+            patterns: Precomputed patterns from _detect_patterns, if available
+            matches: Precomputed automaton matches, if available
+        
+        Returns:
+            GuessEstimate with log10 guesses and the winning segments
+        """
+        if features is None:
+            features = scan_password(password)
+        if matches is None:
+            matches = self._scan_matches(features.lowered)
+        if patterns is None:
+            patterns = self._detect_patterns(password, features, matches)
+        return guess_model.estimate_guesses(
+            features.length, self._guess_candidates(password, features, patterns, matches))
+    
+    def _budgeted_guesses(self, password: str, features: PasswordFeatures,
+                          patterns: Tuple[PatternMatch, ...], matches: Tuple,
+                          entropy: float, state: BudgetState) -> float:
+        """
+        Estimate log10 guesses within the time budget.
+        
+        At most max_matches segments are considered. Falls back to the
+        entropy-based estimate used for crack_time when time has run out
+        before or during the minimum-guess search.
+        """
+        if not state.expired():
+            candidates = state.limit(
+                self._guess_candidates(password, features, patterns, matches))
+            try:
+                return guess_model.estimate_guesses(
+                    features.length, candidates, state.deadline).guesses_log10
+            except BudgetExceeded:
+                state.partial = True
+        return round(entropy * math.log10(2), 4)
+    
+    def _guess_candidates(self, password: str, features: PasswordFeatures,
+                          patterns: Tuple[PatternMatch, ...], matches: Tuple) -> List[Tuple]:
+        """Convert detected patterns into (start, end, guesses, kind) segments."""
+        candidates = []
+        keyboard_spans, dictionary_matches = matches
+        # Matcher spans index the lowered text; map them back only when
+        # lowercasing preserved the length
+        aligned = len(features.lowered) == len(password)
+        
+        if aligned:
+            for start, end, rank in dictionary_matches:
+                candidates.append((start, end, guess_model.dictionary_guesses(
+                    password[start:end], rank), "dictionary"))
+            for spans in keyboard_spans.values():
+                for start, end in spans:
+                    candidates.append((start, end, guess_model.keyboard_guesses(
+                        password[start:end]), "keyboard"))
+        
+        for start, end in features.sequential_runs:
+            candidates.append((start, end, guess_model.sequence_guesses(
+                password[start:end]), "sequence"))
+        for start, end in features.repeat_runs:
+            candidates.append((start, end, guess_model.repeat_guesses(
+                password[start], end - start), "repeat"))
+        
+        length = features.length
+        for pattern in patterns:
+            kind = pattern.type
+            if kind is PatternType.DATE:
+                for start, end in pattern.spans:
+                    candidates.append((start, end, guess_model.date_guesses(
+                        password[start:end]), "date"))
+            elif kind is PatternType.REPEATED_SEQUENCE:
+                # Whole copies of the unit; a partial last copy is left to
+                # the other segments
+                for (start, end), (_, unit_end) in zip(pattern.spans, pattern.units):
+                    period = unit_end - start
+                    count = (end - start) // period
+                    guesses = guess_model.repeat_guesses(password[start:unit_end], count)
+                    candidates.append((start, start + count * period, guesses, "repeat"))
+            elif kind is PatternType.BREACHED:
+                candidates.append((0, length, max(
+                    1, _BREACH_CORPUS_GUESSES / pattern.occurrences), "breached"))
+            elif kind is PatternType.DICTIONARY_WORD:
+                rank = self.common_words.get(features.lowered)
+                if rank is None and self.dictionary_index is not None:
+                    # Index entries carry no rank; assume a median position
+                    rank = max(1, len(self.dictionary_index) // 2)
+                if rank is not None:
+                    candidates.append((0, length, guess_model.dictionary_guesses(
+                        password, rank), "dictionary"))
+        return candidates
+    
+    def character_scores(self, password: str, result: AnalysisResult) -> Tuple[int, ...]:
+        """
+        Score each character's contribution to strength, for heatmaps.
+        
+        Characters start from a value for their class and lose a
+        severity-dependent penalty for every pattern whose spans cover
+        them, so weak regions line up with the patterns that caused them.
+        
+        Args:
+            password: The analyzed password
+            result: Its analysis result; must include patterns
+        
+        Returns:
+            Tuple of scores from 0-100, one per character
+        """
+        length = len(password)
+        scores = []
+        for char in password:
+            if char.islower():
+                scores.append(_CHAR_SCORE_LOWER)
+            elif char.isupper():
+                scores.append(_CHAR_SCORE_UPPER)
+            elif char.isdigit():
+                scores.append(_CHAR_SCORE_DIGIT)
+            else:
+                scores.append(_CHAR_SCORE_SYMBOL)
+        
+        for pattern in result.patterns:
+            # Overlapping spans of one pattern only count once per position
+            boundaries = [0] * (length + 1)
+            for start, end in pattern.spans:
+                start, end = max(0, start), min(length, end)
+                if start < end:
+                    boundaries[start] += 1
+                    boundaries[end] -= 1
+            penalty = _CHAR_SEVERITY_PENALTY[pattern.severity]
+            depth = 0
+            for index in range(length):
+                depth += boundaries[index]
+                if depth:
+                    scores[index] -= penalty
+        
+        return tuple(max(0, min(100, score)) for score in scores)
+    
+    def _is_common_word(self, password_lower: str) -> bool:
+        """Check the wordlist and the dictionary index for an exact match."""
+        # A Bloom filter miss is definitive, so skip the exact probes
+        if self.bloom_filter is not None and password_lower not in self.bloom_filter:
+            return False
+        if self.common_words and password_lower in self.common_words:
+            return True
+        return self.dictionary_index is not None and password_lower in self.dictionary_index
     
     def _calculate_strength(self, length: int, entropy: float, 
-                           char_diversity: int, patterns: List[Dict]) -> int:
+                           char_diversity: int, patterns: Tuple[PatternMatch, ...]) -> int:
         """
         Calculate password strength score (0-100).
         
@@ -211,7 +827,7 @@ class PasswordAnalyzer:
             entropy: Shannon entropy
             char_diversity: Number of character classes used
             patterns: List of detected weakness patterns
-            
+        
         Returns:
             Integer score from 0-100
         """
@@ -229,17 +845,20 @@ class PasswordAnalyzer:
             score -= (3 - char_diversity) * 10
         elif char_diversity == 4:
             score += 10
-            
+        
         # Penalize for patterns
         pattern_penalty = 0
         for pattern in patterns:
-            if pattern["severity"] == "high":
+            severity = pattern.severity
+            if severity is Severity.CRITICAL:
+                pattern_penalty += 40
+            elif severity is Severity.HIGH:
                 pattern_penalty += 25
-            elif pattern["severity"] == "medium":
+            elif severity is Severity.MEDIUM:
                 pattern_penalty += 15
             else:
                 pattern_penalty += 5
-                
+        
         score = max(0, score - pattern_penalty)
         
         return round(min(100, max(0, score)))
@@ -266,10 +885,23 @@ class PasswordAnalyzer:
         # Calculations based on 100 billion guesses per second (high-end hardware)
         if entropy <= 0:
             return "Instant"
-            
+        
         # Estimate seconds to crack based on entropy
-        # 2^entropy / guesses_per_second
-        seconds = 2 ** entropy / (10 ** 11)
+        # 2^entropy / guesses_per_second, evaluated in log space so long
+        # passwords cannot overflow the float range
+        return self._format_crack_time_log10(
+            entropy * math.log10(2))
+    
+    def _format_crack_time_log10(self, guesses_log10: float) -> str:
+        """
+        Format a crack time from log10 of the number of guesses required.
+        
+        Assumes 100 billion guesses per second (high-end hardware).
+        """
+        seconds_log10 = guesses_log10 - math.log10(_GUESSES_PER_SECOND)
+        if seconds_log10 >= 10:  # Far beyond the largest bucket below
+            return "Centuries"
+        seconds = 10 ** seconds_log10
         
         if seconds < 1:
             return "Instant"
@@ -291,55 +923,38 @@ class PasswordAnalyzer:
             return "Centuries"
     
     def _generate_feedback(self, length: int, entropy: float, 
-                          char_diversity: int, patterns: List[Dict],
-                          password: str) -> List[str]:
+                          char_diversity: int, patterns: Tuple[PatternMatch, ...],
+                          features: PasswordFeatures) -> Tuple[str, ...]:
         """Generate actionable feedback for password improvement."""
         feedback = []
         
         # Length feedback
         if length < 8:
-            feedback.append("Password is too short. Use at least 8 characters.")
+            feedback.append(_FEEDBACK_TOO_SHORT)
         elif length < 12:
-            feedback.append("Consider using a longer password (12+ characters).")
+            feedback.append(_FEEDBACK_LONGER)
         
         # Character diversity feedback
-        missing_classes = []
-        if not re.search(r'[a-z]', password):
-            missing_classes.append("lowercase letters")
-        if not re.search(r'[A-Z]', password):
-            missing_classes.append("uppercase letters")
-        if not re.search(r'[0-9]', password):
-            missing_classes.append("numbers")
-        if not re.search(r'[^a-zA-Z0-9\s]', password):
-            missing_classes.append("special characters")
-            
+        missing_classes = _MISSING_CLASSES_FEEDBACK[(
+            features.has_lowercase, features.has_uppercase,
+            features.has_digits, features.has_symbols
+        )]
         if missing_classes:
-            feedback.append(f"Add {', '.join(missing_classes)} to increase strength.")
+            feedback.append(missing_classes)
         
         # Pattern-based feedback
         for pattern in patterns:
-            if pattern["type"] == "dictionary_word":
-                feedback.append("Avoid using common passwords or dictionary words.")
-            elif pattern["type"] == "date":
-                feedback.append("Avoid using dates in your password.")
-            elif pattern["type"] == "keyboard_pattern":
-                feedback.append("Avoid keyboard patterns like 'qwerty' or 'asdfgh'.")
-            elif pattern["type"] == "repeated_chars":
-                feedback.append("Avoid repeating characters (e.g., 'aaa').")
-            elif pattern["type"] == "sequential_chars":
-                feedback.append("Avoid sequential characters like 'abc' or '123'.")
-            elif pattern["type"] == "repeated_sequence":
-                feedback.append("Avoid repeating sequences of characters.")
+            feedback.append(_PATTERN_FEEDBACK[pattern.type])
         
         # General improvement suggestions
         if entropy < 50:
-            feedback.append("Consider using a passphrase with multiple words.")
-            
+            feedback.append(_FEEDBACK_PASSPHRASE)
+        
         if not feedback:
-            feedback.append("Password meets security requirements.")
-            
-        return feedback
+            feedback.append(_FEEDBACK_OK)
         
+        return tuple(feedback)
+    
     def generate_strong_password(self, length: int = 16, 
                                 include_uppercase: bool = True,
                                 include_digits: bool = True,
@@ -352,7 +967,7 @@ class PasswordAnalyzer:
             include_uppercase: Include uppercase letters
             include_digits: Include digits
             include_symbols: Include special symbols
-            
+        
         Returns:
             Strong generated password
         """
@@ -367,7 +982,7 @@ class PasswordAnalyzer:
             chars += string.digits
         if include_symbols:
             chars += string.punctuation
-            
+        
         # Generate password
         password = ''.join(secrets.choice(chars) for _ in range(length))
         
@@ -383,5 +998,85 @@ class PasswordAnalyzer:
             
             # Regenerate if requirements not met
             password = ''.join(secrets.choice(chars) for _ in range(length))
-            
-        return password 
\ No newline at end of file
+        
+        return password 
+    
+    def generate_many(self, count: int, length: int = 16,
+                      include_uppercase: bool = True,
+                      include_digits: bool = True,
+                      include_symbols: bool = True) -> Iterator[str]:
+        """
+        Generate many strong passwords, streaming them as they are made.
+        
+        Passwords follow the same distribution as generate_strong_password():
+        uniform over every password of the length that contains each
+        included character class. Randomness comes from large os.urandom()
+        reads, and no password is ever regenerated.
+        
+        Args:
+            count: Number of passwords
+            length: Password length, at least the number of included classes
+            include_uppercase: Include uppercase letters
+            include_digits: Include digits
+            include_symbols: Include special symbols
+        
+        Returns:
+            Iterator over the generated passwords
+        """
+        return generate_passwords(count, length, include_uppercase,
+                                  include_digits, include_symbols)
+    
+    def passphrase_generator(self, words: int = 6, separators: str = "-",
+                             capitalize: bool = False,
+                             include_digit: bool = False) -> "PassphraseGenerator":
+        """
+        Create a passphrase generator over the configured word index.
+        
+        Args:
+            words: Number of words per passphrase
+            separators: Characters placed between words, one drawn at random
+                per gap ("" joins the words directly)
+            capitalize: Capitalize every word
+            include_digit: Append a random digit to one random word
+        
+        Returns:
+            PassphraseGenerator whose ``entropy`` attribute gives the exact
+            bits per passphrase; use generate_many() for bulk output
+        """
+        if self.word_index is None:
+            raise ValueError("No passphrase word index configured")
+        from fortipass.core.passphrase import PassphraseGenerator
+        return PassphraseGenerator(self.word_index, words, separators,
+                                   capitalize, include_digit)
+    
+    def generate_passphrase(self, words: int = 6, separators: str = "-",
+                            capitalize: bool = False,
+                            include_digit: bool = False) -> str:
+        """
+        Generate a diceware-style passphrase.
+        
+        Args:
+            words: Number of words
+            separators: Characters placed between words
+            capitalize: Capitalize every word
+            include_digit: Append a random digit to one random word
+        
+        Returns:
+            Passphrase of uniformly chosen words
+        """
+        return self.passphrase_generator(words, separators, capitalize,
+                                         include_digit).generate()
+
+
+def _compile_patterns() -> tuple:
+    """Compile the shared date regular expressions."""
+    global _DATE_RES
+    if _DATE_RES is None:
+        import re
+        _DATE_RES = (
+            re.compile(r'19\d{2}'), re.compile(r'20\d{2}'),  # Years (1900-2099)
+            re.compile(r'0[1-9]|1[0-2][0-3][0-9]'),  # MMDD
+            re.compile(r'[0-3][0-9][0-1][0-9]'),  # DDMM
+        )
+    return _DATE_RES
+
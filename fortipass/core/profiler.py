@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# FortiPass - Analysis Stage Profiler
+
+"""
+Per-stage timing for the analysis pipeline.
+
+A StageProfiler attached to a PasswordAnalyzer (``profile=True``) records
+how long each stage of every analysis takes:
+
+- scan, match: the character scan and the keyboard/dictionary automaton
+- entropy, strength, crack_time, feedback, guesses, result
+- detect.<kind>: each pattern detector, e.g. detect.repeated_sequence
+- total: the whole analysis
+
+Each stage keeps a count, a sum, a maximum and a fixed-bucket latency
+histogram. Recording a sample is a bisect and a few integer updates, and
+nothing is allocated per analysis beyond one small clock object. Export
+with to_dict() or to_prometheus().
+
+Counters are not locked. Threads sharing one profiler may occasionally
+lose a sample, and every worker process keeps its own profiler.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Sequence
+
+# Histogram upper bounds in seconds, 1 us to 1 s
+DEFAULT_BUCKETS = (
+    1e-06, 2.5e-06, 5e-06, 1e-05, 2.5e-05, 5e-05, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+class StageStats:
+    """Count, sum, maximum and latency histogram of one stage."""
+    
+    __slots__ = ("count", "total", "maximum", "buckets")
+    
+    def __init__(self, size: int):
+        """
+        Initialize empty statistics.
+        
+        Args:
+            size: Number of histogram buckets, including the overflow bucket
+        """
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        # Non-cumulative: buckets[i] counts samples in (bounds[i-1], bounds[i]]
+        self.buckets = [0] * size
+
+
+class StageClock:
+    """
+    Times consecutive stages of one analysis.
+    Each lap() records the time since the previous lap under a stage name.
+    """
+    
+    __slots__ = ("_profiler", "_started", "_last")
+    
+    def __init__(self, profiler: "StageProfiler"):
+        """Start the clock."""
+        self._profiler = profiler
+        self._started = self._last = time.perf_counter()
+    
+    def lap(self, stage: str) -> None:
+        """Record the time since the previous lap as one sample of stage."""
+        now = time.perf_counter()
+        self._profiler.record(stage, now - self._last)
+        self._last = now
+    
+    def stop(self) -> None:
+        """Record the time since the clock started as the total stage."""
+        self._profiler.record("total", time.perf_counter() - self._started)
+
+
+class StageProfiler:
+    """Per-stage latency counters and histograms for analysis runs."""
+    
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize the profiler.
+        
+        Args:
+            buckets: Increasing histogram upper bounds in seconds; a final
+                +Inf bucket is always added
+        """
+        bounds = tuple(float(bound) for bound in buckets)
+        if not bounds or any(b <= a for a, b in zip(bounds, bounds[1:])):
+            raise ValueError("buckets must be a non-empty increasing sequence")
+        self.bounds = bounds
+        self._stages = {}
+    
+    def start(self) -> StageClock:
+        """Return a clock for timing the stages of one analysis."""
+        return StageClock(self)
+    
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Add one latency sample to a stage.
+        
+        Args:
+            stage: Stage name
+            seconds: Elapsed time of the stage
+        """
+        stats = self._stages.get(stage)
+        if stats is None:
+            stats = self._stages[stage] = StageStats(len(self.bounds) + 1)
+        stats.count += 1
+        stats.total += seconds
+        if seconds > stats.maximum:
+            stats.maximum = seconds
+        stats.buckets[bisect_left(self.bounds, seconds)] += 1
+    
+    def reset(self) -> None:
+        """Discard every recorded sample."""
+        self._stages = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the statistics as a dictionary.
+        
+        Returns:
+            Stage name -> count, total/mean/max seconds and a cumulative
+            histogram keyed by upper bound ("+Inf" last)
+        """
+        labels = [repr(bound) for bound in self.bounds] + ["+Inf"]
+        stages = {}
+        for stage, stats in sorted(self._stages.items()):
+            cumulative = 0
+            histogram = {}
+            for label, count in zip(labels, stats.buckets):
+                cumulative += count
+                histogram[label] = cumulative
+            stages[stage] = {
+                "count": stats.count,
+                "total_seconds": stats.total,
+                "mean_seconds": stats.total / stats.count if stats.count else 0.0,
+                "max_seconds": stats.maximum,
+                "histogram": histogram,
+            }
+        return stages
+    
+    def to_prometheus(self, prefix: str = "fortipass_analysis") -> str:
+        """
+        Render the statistics in the Prometheus text exposition format.
+        
+        Args:
+            prefix: Metric name prefix
+        
+        Returns:
+            A ``<prefix>_stage_seconds`` histogram labelled by stage and a
+            ``<prefix>_stage_max_seconds`` gauge, newline-terminated
+        """
+        name = f"{prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each analysis stage.",
+            f"# TYPE {name} histogram",
+        ]
+        maxima = [
+            f"# HELP {prefix}_stage_max_seconds Slowest sample of each analysis stage.",
+            f"# TYPE {prefix}_stage_max_seconds gauge",
+        ]
+        for stage, entry in self.to_dict().items():
+            for bound, count in entry["histogram"].items():
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {entry["total_seconds"]!r}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {entry["count"]}')
+            maxima.append(f'{prefix}_stage_max_seconds{{stage="{stage}"}} '
+                          f'{entry["max_seconds"]!r}')
+        return "\n".join(lines + maxima) + "\n"
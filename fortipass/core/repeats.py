@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# FortiPass - Repeated Sequence Detection
+
+"""
+Find repeated sequences ("abcabc", "xyxyxyx") without backtracking.
+
+The analyzer used to search for ``(.{2,})\\1+``. The regex engine tries every
+start and every unit length, then re-compares the unit at each step, so
+on square-free input of n characters it does O(n^3) work: a few thousand
+characters pin a worker for seconds.
+
+find_repeats() reports the maximal repetitions (runs) instead: the longest
+spans with a smallest period p >= 2 that repeat their first p characters
+at least twice. For each period it only inspects every p-th position. A
+run of period p covers 2p characters, so it must contain two consecutive
+samples j and j + p, and it is recovered by extending the match between
+them forwards and backwards. Matches are extended by comparing
+exponentially growing slices, so the work per extension is C-level
+comparison of the characters matched plus O(log n) Python steps. The
+number of samples is sum(n / p) = O(n log n). Runs found at a period
+that is not their smallest one (e.g. "aaaa" at period 2) are dropped.
+"""
+
+from bisect import bisect_right
+from typing import List, Tuple
+
+
+def _common_prefix(text: str, first: int, second: int, limit: int) -> int:
+    """
+    Length of the common prefix of text[first:] and text[second:].
+    
+    Args:
+        text: The string to compare within
+        first: Start of the first suffix
+        second: Start of the second suffix
+        limit: Upper bound on the result
+    
+    Returns:
+        Number of leading characters that match, at most limit
+    """
+    if limit <= 0 or text[first] != text[second]:
+        return 0
+    
+    # Gallop until a window fails to match, then bisect within it
+    matched = step = 1
+    while matched < limit:
+        step = min(step * 2, limit - matched)
+        if text[first + matched:first + matched + step] != text[second + matched:second + matched + step]:
+            break
+        matched += step
+    else:
+        return matched
+    
+    while step > 1:
+        half = step // 2
+        if text[first + matched:first + matched + half] == text[second + matched:second + matched + half]:
+            matched += half
+            step -= half
+        else:
+            step = half
+    return matched
+
+
+def find_repeats(text: str, min_period: int = 2) -> List[Tuple[int, int, int]]:
+    """
+    Find every maximal repetition of a unit of min_period or more characters.
+    
+    Args:
+        text: The string to search
+        min_period: Shortest unit length to report
+    
+    Returns:
+        List of (start, end, period) sorted by start, where text[start:end]
+        repeats its first ``period`` characters at least twice (the last
+        copy may be partial) and period is the smallest such length
+    """
+    length = len(text)
+    runs = []
+    if length < 2 * min_period:
+        return runs
+    # A run of period two or more contains some pair of adjacent characters
+    # twice. Most passwords have no repeated pair and need no search
+    if min_period >= 2 and len(set(zip(text, text[1:]))) == length - 1:
+        return runs
+    reverse = text[::-1]
+    # Runs of each period found so far, as increasing starts and their ends.
+    # Periods below min_period are searched too, so that windows lying in
+    # such a run can skip it
+    starts_by_period = {}
+    ends_by_period = {}
+    
+    for period in range(1, length // 2 + 1):
+        starts = []
+        ends = []
+        # A run through this sample matches on at least `half` characters
+        # right after it or right before it; checking that first keeps the
+        # common case to a comparison or two
+        half = (period + 1) // 2
+        sample = 0
+        while sample + period < length:
+            if ((text[sample] != text[sample + period] or
+                 text[sample:sample + half] != text[sample + period:sample + period + half]) and
+                    (sample < half or text[sample - 1] != text[sample + period - 1] or
+                     text[sample - half:sample] != text[sample + period - half:sample + period])):
+                sample += period
+                continue
+            
+            # Every period-length window of a run is a rotation of its unit.
+            # A window with a smaller period lies in a run of that period,
+            # found earlier, and any run through this sample is that run
+            window = text[sample:sample + period]
+            smallest = (window + window).find(window, 1)
+            if smallest < period:
+                known = starts_by_period[smallest]
+                end = ends_by_period[smallest][bisect_right(known, sample) - 1]
+                sample = ((end - period) // period + 1) * period
+                continue
+            
+            forward = _common_prefix(text, sample, sample + period,
+                                     length - sample - period)
+            # Matching characters before the sample, read on the reversed text
+            backward = _common_prefix(reverse, length - sample, length - sample - period,
+                                      sample) if sample else 0
+            if forward + backward < period:
+                sample += period
+                continue
+            
+            start = sample - backward
+            end = sample + period + forward
+            starts.append(start)
+            ends.append(end)
+            if period >= min_period:
+                runs.append((start, end, period))
+            # Runs of the same period overlap by fewer than period characters
+            sample = ((end - period) // period + 1) * period
+        
+        if starts:
+            starts_by_period[period] = starts
+            ends_by_period[period] = ends
+    
+    runs.sort()
+    return runs
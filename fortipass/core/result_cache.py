@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# FortiPass - Analysis Result Cache
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from fortipass.core.results import AnalysisResult
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of analysis results with optional TTL expiry.
+    Keys are salted BLAKE2b digests, so plaintext passwords are never stored.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of cached results
+            ttl: Seconds before an entry expires, or None to never expire
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Per-process secret so digests cannot be precomputed or compared
+        # across processes
+        self._salt = os.urandom(16)
+        self._entries = OrderedDict()
+        # Guards the entries and counters when shared across worker threads
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def key_for(self, password: str, variant: Hashable = None) -> tuple:
+        """
+        Derive the cache key for a password.
+        
+        Args:
+            password: Plaintext password
+            variant: Extra key component, e.g. the requested field subset
+        
+        Returns:
+            Opaque hashable key
+        """
+        digest = hashlib.blake2b(password.encode("utf-8", "surrogatepass"),
+                                 digest_size=16, key=self._salt).digest()
+        return digest, variant
+    
+    def get(self, key: tuple) -> Optional[AnalysisResult]:
+        """
+        Look up a result, returning None on a miss.
+        
+        Results are immutable, so the cached object itself is returned.
+        
+        Args:
+            key: Key from key_for()
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            result, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return result
+    
+    def put(self, key: tuple, result: AnalysisResult) -> None:
+        """
+        Store a result, evicting the least recently used entry when the
+        cache is full.
+        
+        Args:
+            key: Key from key_for()
+            result: Analysis result to cache
+        """
+        entry = (result, time.monotonic())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+    
+    def info(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl
+        }
+    
+    def __getstate__(self):
+        """Pickle the configuration only; each process gets a fresh salt."""
+        return {"maxsize": self.maxsize, "ttl": self.ttl}
+    
+    def __setstate__(self, state):
+        """Restore an empty cache with a new per-process salt."""
+        self.__init__(state["maxsize"], state["ttl"])
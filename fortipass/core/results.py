@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# FortiPass - Analysis Result Types
+
+"""
+Compact, immutable analysis results.
+
+analyze() used to return a fresh dict per call, plus a dict per detected
+pattern and a list of feedback strings. These classes keep the same
+read-only mapping interface (``result["entropy"]``, ``"patterns" in result``,
+``pattern.get("severity")``) while storing fields in ``__slots__`` and
+sharing pattern types, severities and messages between results. Call
+``to_dict()`` for a plain JSON-serializable copy.
+"""
+
+from collections.abc import Mapping
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# Every key produced by analyze(), in output order
+RESULT_FIELDS = (
+    "length", "entropy", "char_diversity", "has_lowercase", "has_uppercase",
+    "has_digits", "has_symbols", "patterns", "strength_score",
+    "strength_category", "crack_time", "feedback", "guesses_log10",
+    "crack_time_guesses", "partial", "analyzed_length"
+)
+
+# Budget markers kept by AnalysisResult.select() whatever fields are requested
+_BUDGET_FIELDS = frozenset(("partial", "analyzed_length"))
+
+_RESULT_FIELD_SET = frozenset(RESULT_FIELDS)
+
+_PATTERN_FIELDS = ("type", "description", "severity", "spans", "occurrences", "units")
+
+_PATTERN_FIELD_SET = frozenset(_PATTERN_FIELDS)
+
+
+class PatternType(str, Enum):
+    """Kind of weakness reported by pattern detection."""
+    
+    BREACHED = "breached"
+    DICTIONARY_WORD = "dictionary_word"
+    DICTIONARY_SUBSTRING = "dictionary_substring"
+    DATE = "date"
+    KEYBOARD_PATTERN = "keyboard_pattern"
+    REPEATED_CHARS = "repeated_chars"
+    SEQUENTIAL_CHARS = "sequential_chars"
+    REPEATED_SEQUENCE = "repeated_sequence"
+    
+    def __str__(self) -> str:
+        return self.value
+
+
+class Severity(str, Enum):
+    """How strongly a pattern weakens a password."""
+    
+    CRITICAL = "critical"
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+    
+    def __str__(self) -> str:
+        return self.value
+
+
+class PatternMatch(Mapping):
+    """
+    A detected weakness pattern.
+    Type and severity are str enums, so ``pattern["type"] == "date"`` keeps
+    working.
+    """
+    
+    __slots__ = _PATTERN_FIELDS
+    
+    def __init__(self, type: PatternType, description: str, severity: Severity,
+                 spans: Tuple[Tuple[int, int], ...], occurrences: Optional[int] = None,
+                 units: Optional[Tuple[Tuple[int, int], ...]] = None):
+        """
+        Create a pattern match.
+        
+        Args:
+            type: Pattern kind
+            description: Human-readable description
+            severity: Severity of the weakness
+            spans: (start, end) character ranges covered by the pattern
+            occurrences: Breach corpus count, for breached passwords only
+            units: For repeated sequences, the (start, end) range of the
+                repeated unit within each span
+        """
+        _set = object.__setattr__
+        _set(self, "type", type)
+        _set(self, "description", description)
+        _set(self, "severity", severity)
+        _set(self, "spans", spans)
+        _set(self, "occurrences", occurrences)
+        _set(self, "units", units)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in _PATTERN_FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        for key in _PATTERN_FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+    
+    def __len__(self) -> int:
+        return 4 + (self.occurrences is not None) + (self.units is not None)
+    
+    def __reduce__(self):
+        return (PatternMatch, (self.type, self.description, self.severity,
+                               self.spans, self.occurrences, self.units))
+    
+    def __repr__(self) -> str:
+        return (f"PatternMatch(type={self.type.value!r}, "
+                f"description={self.description!r}, severity={self.severity.value!r})")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a plain dict copy with enum values as strings."""
+        data = {
+            "type": self.type.value,
+            "description": self.description,
+            "severity": self.severity.value,
+            "spans": list(self.spans)
+        }
+        if self.occurrences is not None:
+            data["occurrences"] = self.occurrences
+        if self.units is not None:
+            data["units"] = list(self.units)
+        return data
+
+
+class AnalysisResult(Mapping):
+    """
+    Immutable result of a password analysis.
+    Fields that were not requested (see analyze_many's ``fields``) are None
+    and are absent from the mapping view.
+    """
+    
+    __slots__ = RESULT_FIELDS
+    
+    def __init__(self, length: int = None, entropy: float = None,
+                 char_diversity: int = None, has_lowercase: bool = None,
+                 has_uppercase: bool = None, has_digits: bool = None,
+                 has_symbols: bool = None, patterns: Tuple[PatternMatch, ...] = None,
+                 strength_score: int = None, strength_category: str = None,
+                 crack_time: str = None, feedback: Tuple[str, ...] = None,
+                 guesses_log10: float = None, crack_time_guesses: str = None,
+                 partial: bool = None, analyzed_length: int = None):
+        """
+        Create a result. Arguments follow RESULT_FIELDS order; partial is
+        True only when an analysis budget was exhausted. analyzed_length is
+        set only when the budget truncated the password: length is then the
+        full length, and every other field describes the first
+        analyzed_length characters.
+        """
+        _set = object.__setattr__
+        _set(self, "length", length)
+        _set(self, "entropy", entropy)
+        _set(self, "char_diversity", char_diversity)
+        _set(self, "has_lowercase", has_lowercase)
+        _set(self, "has_uppercase", has_uppercase)
+        _set(self, "has_digits", has_digits)
+        _set(self, "has_symbols", has_symbols)
+        _set(self, "patterns", patterns)
+        _set(self, "strength_score", strength_score)
+        _set(self, "strength_category", strength_category)
+        _set(self, "crack_time", crack_time)
+        _set(self, "feedback", feedback)
+        _set(self, "guesses_log10", guesses_log10)
+        _set(self, "crack_time_guesses", crack_time_guesses)
+        _set(self, "partial", partial)
+        _set(self, "analyzed_length", analyzed_length)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in _RESULT_FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        for key in RESULT_FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __reduce__(self):
+        return (AnalysisResult, tuple(getattr(self, key) for key in RESULT_FIELDS))
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={getattr(self, key)!r}" for key in self
+                           if key not in ("patterns", "feedback"))
+        return f"AnalysisResult({fields})"
+    
+    def select(self, fields: Iterable[str]) -> "AnalysisResult":
+        """
+        Return a copy holding only the given fields.
+        
+        Args:
+            fields: Result keys to keep; partial and analyzed_length are
+                always kept
+        """
+        wanted = frozenset(fields) | _BUDGET_FIELDS
+        return AnalysisResult(*(getattr(self, key) if key in wanted else None
+                                for key in RESULT_FIELDS))
+    
+    def replace(self, **changes: Any) -> "AnalysisResult":
+        """
+        Return a copy with some fields changed.
+        
+        Args:
+            changes: New values by field name
+        """
+        unknown = set(changes).difference(RESULT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown result fields: {', '.join(sorted(unknown))}")
+        return AnalysisResult(*(changes[key] if key in changes else getattr(self, key)
+                                for key in RESULT_FIELDS))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a plain, JSON-serializable dict of the present fields."""
+        data = {}
+        for key in self:
+            value = getattr(self, key)
+            if key == "patterns":
+                value = [pattern.to_dict() for pattern in value]
+            elif key == "feedback":
+                value = list(value)
+            data[key] = value
+        return data
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# FortiPass - Single-Pass Character Scanner
+
+from typing import List, Tuple
+
+# Per-position flag bits recorded when scanning with positions=True
+POS_LOWER = 1
+POS_UPPER = 2
+POS_DIGIT = 4
+POS_SYMBOL = 8
+POS_REPEATS_PREVIOUS = 16
+POS_ASCENDS_PREVIOUS = 32
+
+# ASCII character class lookup matching the analyzer's regex classes
+_CLASS_LOWER = 1
+_CLASS_UPPER = 2
+_CLASS_DIGIT = 4
+_CLASS_SYMBOL = 8
+
+
+def _ascii_class(code: int) -> int:
+    """Return the analyzer class bit for an ASCII code point."""
+    if 97 <= code <= 122:
+        return _CLASS_LOWER
+    if 65 <= code <= 90:
+        return _CLASS_UPPER
+    if 48 <= code <= 57:
+        return _CLASS_DIGIT
+    if chr(code).isspace():
+        return 0
+    return _CLASS_SYMBOL
+
+
+_ASCII_CLASSES = {chr(code): _ascii_class(code) for code in range(128)}
+
+
+def _is_sequential(a: int, b: int, c: int) -> bool:
+    """Check whether three lowercase code points form an 'abc'/'123' style run."""
+    if b == a + 1 and c == b + 1:
+        return (97 <= a and c <= 122) or (48 <= a and c <= 57)
+    # "890" is the only wrapping sequence the analyzer recognizes
+    return a == 56 and b == 57 and c == 48
+
+
+class PasswordFeatures:
+    """
+    Compact feature record produced by a single walk over a password.
+    Consumed by entropy, pattern, strength and feedback stages.
+    """
+    
+    __slots__ = (
+        "length", "histogram", "lowered",
+        "has_lowercase", "has_uppercase", "has_digits", "has_symbols",
+        "char_diversity", "max_run", "repeat_runs", "sequential_runs",
+        "position_flags"
+    )
+    
+    def __init__(self):
+        """Initialize an empty feature record."""
+        self.length = 0
+        self.histogram = {}
+        self.lowered = ""
+        self.has_lowercase = False
+        self.has_uppercase = False
+        self.has_digits = False
+        self.has_symbols = False
+        self.char_diversity = 0
+        self.max_run = 0
+        self.repeat_runs = []
+        self.sequential_runs = []
+        self.position_flags = None
+
+
+def scan_password(password: str, positions: bool = False) -> PasswordFeatures:
+    """
+    Scan a password once and collect every per-character feature.
+    
+    Computes the character histogram, character class flags, runs of
+    identical characters and runs of sequential characters ('abc', '123').
+    
+    Args:
+        password: The password to scan
+        positions: Also record per-position class and run flags
+    
+    Returns:
+        PasswordFeatures record for the password
+    """
+    features = PasswordFeatures()
+    length = len(password)
+    features.length = length
+    if not length:
+        return features
+    
+    lowered = password.lower()
+    features.lowered = lowered
+    # Case folding is 1:1 for virtually every password; when it is not,
+    # sequences are located on the folded text in a separate pass.
+    one_to_one = len(lowered) == length
+    
+    histogram = {}
+    repeat_runs = []
+    sequential_runs = []
+    max_run = 1
+    run_start = 0
+    previous = None
+    code_1 = code_2 = -1
+    flags = [] if positions else None
+    
+    for index in range(length):
+        char = password[index]
+        
+        count = histogram.get(char)
+        histogram[char] = 1 if count is None else count + 1
+        
+        # Runs of identical characters; the regex '.' never matches a newline
+        if char != previous:
+            run = index - run_start
+            if run >= 3 and previous != "\n":
+                repeat_runs.append((run_start, index))
+            if run > max_run and previous != "\n":
+                max_run = run
+            run_start = index
+            previous = char
+        
+        if one_to_one:
+            code = ord(lowered[index])
+            if _is_sequential(code_2, code_1, code):
+                if sequential_runs and sequential_runs[-1][1] > index - 2:
+                    sequential_runs[-1] = (sequential_runs[-1][0], index + 1)
+                else:
+                    sequential_runs.append((index - 2, index + 1))
+            code_2 = code_1
+            code_1 = code
+        
+        if flags is not None:
+            flags.append(_position_flags(password, index, char))
+    
+    run = length - run_start
+    if previous != "\n":
+        if run >= 3:
+            repeat_runs.append((run_start, length))
+        if run > max_run:
+            max_run = run
+    
+    if not one_to_one:
+        sequential_runs = _scan_folded_sequences(password)
+    
+    features.histogram = histogram
+    set_class_flags(features)
+    features.max_run = max_run
+    features.repeat_runs = repeat_runs
+    features.sequential_runs = sequential_runs
+    features.position_flags = flags
+    return features
+
+
+def set_class_flags(features: PasswordFeatures) -> None:
+    """Fill the class flags and diversity of a record from its histogram."""
+    # Class flags only need the distinct characters, not another full walk
+    classes = 0
+    for char in features.histogram:
+        bit = _ASCII_CLASSES.get(char)
+        if bit is None:
+            bit = 0 if char.isspace() else _CLASS_SYMBOL
+        classes |= bit
+    
+    features.has_lowercase = bool(classes & _CLASS_LOWER)
+    features.has_uppercase = bool(classes & _CLASS_UPPER)
+    features.has_digits = bool(classes & _CLASS_DIGIT)
+    features.has_symbols = bool(classes & _CLASS_SYMBOL)
+    features.char_diversity = (features.has_lowercase + features.has_uppercase +
+                               features.has_digits + features.has_symbols)
+
+
+def _position_flags(password: str, index: int, char: str) -> int:
+    """Compute the per-position flags for one character."""
+    if char.islower():
+        value = POS_LOWER
+    elif char.isupper():
+        value = POS_UPPER
+    elif char.isdigit():
+        value = POS_DIGIT
+    else:
+        value = POS_SYMBOL
+    if index > 0:
+        previous = password[index - 1]
+        if char == previous:
+            value |= POS_REPEATS_PREVIOUS
+        if ord(char) == ord(previous) + 1:
+            value |= POS_ASCENDS_PREVIOUS
+    return value
+
+
+def _scan_folded_sequences(password: str) -> List[Tuple[int, int]]:
+    """Locate sequential runs when lowercasing changes the string length."""
+    origins = []
+    codes = []
+    for index, char in enumerate(password):
+        for folded in char.lower():
+            origins.append(index)
+            codes.append(ord(folded))
+    
+    runs = []
+    for end in range(2, len(codes)):
+        if _is_sequential(codes[end - 2], codes[end - 1], codes[end]):
+            start, stop = origins[end - 2], origins[end] + 1
+            if runs and runs[-1][1] > start:
+                runs[-1] = (runs[-1][0], max(runs[-1][1], stop))
+            else:
+                runs.append((start, stop))
+    return runs
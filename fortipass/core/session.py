@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# FortiPass - Incremental Analysis Session
+
+"""
+Incremental re-analysis for interactive editing.
+
+An AnalysisSession holds one password that changes by small edits, as in a
+password field. It keeps the state the analysis pipeline would otherwise
+rebuild from scratch on every keystroke:
+
+- the character histogram, updated per inserted or removed character, so
+  entropy and class flags cost O(distinct characters) rather than O(length)
+- a checkpoint of the scanner and Aho-Corasick state after every position,
+  so runs, sequences and dictionary/keyboard matches are rescanned only
+  from the edit onwards
+- the guess DP columns (GuessLattice), recomputed only from the first
+  column whose candidate matches changed
+
+Scanning after an edit at the end of the text costs O(k) for a
+k-character edit, and an edit in the middle rescans the text after it.
+result() is not incremental, though: the repeated-sequence search
+(O(n log n)), the date patterns, guess candidates and feedback still run
+over the whole text, so each keystroke costs O(n log n) overall. The
+session saves the scan, the automaton walk and most of the guess DP, about
+half the work at 128 characters. At a few thousand characters the
+repeated-sequence search dominates. Results are the same as
+PasswordAnalyzer.analyze() on the full text, including its result cache
+and AnalysisBudget.
+"""
+
+from typing import Iterable, Optional
+
+from fortipass.core import guesses as guess_model
+from fortipass.core.password_analyzer import PasswordAnalyzer
+from fortipass.core.results import AnalysisResult
+from fortipass.core.scanner import PasswordFeatures, _is_sequential, set_class_flags
+
+# Scanner state before the first character: (automaton node, run start,
+# previous character, last two lowered code points, longest run,
+# sequential run count, last sequential run)
+_INITIAL_STATE = (0, 0, None, -1, -1, 1, 0, None)
+
+
+class AnalysisSession:
+    """
+    A password under edit, re-analyzed incrementally.
+    Not thread-safe; use one session per thread.
+    """
+    
+    def __init__(self, analyzer: PasswordAnalyzer = None, text: str = ""):
+        """
+        Initialize the session.
+        
+        Args:
+            analyzer: Analyzer whose wordlist and stores are used. A default
+                PasswordAnalyzer is created when omitted.
+            text: Initial contents
+        """
+        self.analyzer = analyzer if analyzer is not None else PasswordAnalyzer()
+        self.analyzer.preload()
+        self._text = ""
+        self._lowered = ""
+        self._histogram = {}
+        # Characters whose lowercase form is not a single character; while
+        # any are present the analyzer's full pipeline is used instead
+        self._unaligned = 0
+        # _states[i] is the scanner state after text[:i]
+        self._states = [_INITIAL_STATE]
+        self._repeat_runs = []
+        self._sequential_runs = []
+        self._matches = []
+        self._matcher = None
+        self._lattice = guess_model.GuessLattice()
+        if text:
+            self.insert(0, text)
+    
+    @property
+    def text(self) -> str:
+        """Current contents of the session."""
+        return self._text
+    
+    def __len__(self) -> int:
+        """Length of the current contents."""
+        return len(self._text)
+    
+    def insert(self, position: int, chars: str) -> None:
+        """
+        Insert characters before a position.
+        
+        Args:
+            position: Index to insert at (len(session) appends)
+            chars: Characters to insert
+        """
+        self.replace(position, 0, chars)
+    
+    def delete(self, position: int, count: int = 1) -> None:
+        """
+        Delete characters starting at a position.
+        
+        Args:
+            position: Index of the first character to remove
+            count: Number of characters to remove
+        """
+        self.replace(position, count, "")
+    
+    def replace(self, position: int, count: int, chars: str) -> None:
+        """
+        Replace count characters at position with chars.
+        
+        Args:
+            position: Index of the first character to replace
+            count: Number of characters removed
+            chars: Characters inserted in their place
+        """
+        text = self._text
+        if position < 0 or count < 0 or position + count > len(text):
+            raise IndexError("Edit range outside the text")
+        if not count and not chars:
+            return
+        
+        histogram = self._histogram
+        removed = text[position:position + count]
+        for char in removed:
+            remaining = histogram[char] - 1
+            if remaining:
+                histogram[char] = remaining
+            else:
+                del histogram[char]
+            if len(char.lower()) != 1:
+                self._unaligned -= 1
+        for char in chars:
+            histogram[char] = histogram.get(char, 0) + 1
+            if len(char.lower()) != 1:
+                self._unaligned += 1
+        
+        self._text = text[:position] + chars + text[position + count:]
+        if self._unaligned:
+            self._lowered = None
+        elif self._lowered is None:
+            self._lowered = self._text.lower()
+        else:
+            self._lowered = (self._lowered[:position] + chars.lower() +
+                             self._lowered[position + count:])
+        
+        # Checkpoints up to and including the edit position stay valid
+        del self._states[position + 1:]
+        if not self._unaligned:
+            self._rescan()
+    
+    def set_text(self, text: str, cursor: int = None) -> None:
+        """
+        Replace the contents, applying the difference as a single edit.
+        
+        Args:
+            text: New contents
+            cursor: Cursor position after the edit, if known. For a plain
+                insertion or deletion this locates the edit without
+                comparing the strings character by character.
+        """
+        old = self._text
+        if text == old:
+            return
+        
+        delta = len(text) - len(old)
+        if cursor is not None and delta:
+            if delta > 0:
+                position = cursor - delta
+                if (position >= 0 and text[:position] == old[:position] and
+                        text[cursor:] == old[position:]):
+                    self.replace(position, 0, text[position:cursor])
+                    return
+            elif text[:cursor] == old[:cursor] and text[cursor:] == old[cursor - delta:]:
+                self.replace(cursor, -delta, "")
+                return
+        
+        shortest = min(len(old), len(text))
+        prefix = 0
+        while prefix < shortest and old[prefix] == text[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < shortest - prefix and
+               old[len(old) - 1 - suffix] == text[len(text) - 1 - suffix]):
+            suffix += 1
+        self.replace(prefix, len(old) - prefix - suffix, text[prefix:len(text) - suffix])
+    
+    def result(self, fields: Optional[Iterable[str]] = None) -> AnalysisResult:
+        """
+        Analyze the current contents.
+        
+        Args:
+            fields: Optional subset of result keys to compute
+        
+        Returns:
+            AnalysisResult equal to analyzer.analyze(session.text)
+        """
+        analyzer = self.analyzer
+        wanted = analyzer._resolve_fields(fields)
+        text = self._text
+        budget = analyzer.budget
+        if (not text or self._unaligned or
+                (budget is not None and budget.max_chars is not None and
+                 len(text) > budget.max_chars)):
+            # The analyzer truncates over-long input itself
+            return analyzer._analyze(text, wanted)
+        
+        cache = analyzer.result_cache
+        if cache is None:
+            return self._compute(wanted)
+        cache_key = cache.key_for(text, wanted)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        result = self._compute(wanted)
+        if not result.partial:
+            cache.put(cache_key, result)
+        return result
+    
+    def _compute(self, wanted: Optional[frozenset]) -> AnalysisResult:
+        """Score the current text from the incremental scan."""
+        analyzer = self.analyzer
+        clock = None
+        if analyzer.profiler is not None:
+            # Scanning happened incrementally in replace(); time the rest
+            clock = analyzer.profiler.start()
+        features = self._features()
+        if clock is not None:
+            clock.lap("scan")
+        
+        found = self._matches
+        state = None
+        if analyzer.budget is not None:
+            state = analyzer.budget.start()
+            if state.max_matches is not None:
+                found = state.limit(found[:state.max_matches + 1])
+        result = analyzer._build_result(self._text, features, analyzer._group_matches(found),
+                                        wanted, self._lattice, clock, state)
+        if state is not None and state.partial:
+            result = result.replace(partial=True)
+        if clock is not None:
+            clock.stop()
+        return result
+    
+    def _rescan(self) -> None:
+        """Scan from the last valid checkpoint to the end of the text."""
+        matcher = self.analyzer._matcher
+        if matcher is None:
+            self.analyzer.preload()
+            matcher = self.analyzer._matcher
+        if matcher is not self._matcher:
+            # The wordlist changed; earlier matches are meaningless
+            self._matcher = matcher
+            del self._states[1:]
+        
+        states = self._states
+        start = len(states) - 1
+        (node, run_start, previous, code_1, code_2,
+         max_run, sequence_count, last_sequence) = states[-1]
+        
+        # Drop everything found after the checkpoint: repeat runs are
+        # recorded when the run ends and matches when their last character
+        # is read, while the current sequential run may still grow
+        repeat_runs = self._repeat_runs
+        while repeat_runs and repeat_runs[-1][1] >= start:
+            repeat_runs.pop()
+        matches = self._matches
+        while matches and matches[-1][1] > start:
+            matches.pop()
+        sequential_runs = self._sequential_runs
+        del sequential_runs[sequence_count:]
+        if last_sequence is not None:
+            sequential_runs[-1] = last_sequence
+        
+        # Same walk as scan_password(), one character at a time
+        text, lowered = self._text, self._lowered
+        automaton = matcher.advance(lowered, start, node)
+        for index in range(start, len(text)):
+            char = text[index]
+            
+            if char != previous:
+                run = index - run_start
+                if previous != "\n":
+                    if run >= 3:
+                        repeat_runs.append((run_start, index))
+                    if run > max_run:
+                        max_run = run
+                run_start = index
+                previous = char
+            
+            code = ord(lowered[index])
+            if _is_sequential(code_2, code_1, code):
+                if sequential_runs and sequential_runs[-1][1] > index - 2:
+                    sequential_runs[-1] = (sequential_runs[-1][0], index + 1)
+                else:
+                    sequential_runs.append((index - 2, index + 1))
+            code_2 = code_1
+            code_1 = code
+            
+            node, found = next(automaton)
+            if found:
+                matches.extend(found)
+            
+            states.append((node, run_start, previous, code_1, code_2, max_run,
+                           len(sequential_runs),
+                           sequential_runs[-1] if sequential_runs else None))
+    
+    def _features(self) -> PasswordFeatures:
+        """Assemble the scanner record for the current text."""
+        length = len(self._text)
+        _, run_start, previous, _, _, max_run, _, _ = self._states[-1]
+        
+        features = PasswordFeatures()
+        features.length = length
+        features.histogram = self._histogram
+        features.lowered = self._lowered
+        set_class_flags(features)
+        
+        # Close the run still open at the end of the text
+        repeat_runs = list(self._repeat_runs)
+        run = length - run_start
+        if previous != "\n":
+            if run >= 3:
+                repeat_runs.append((run_start, length))
+            if run > max_run:
+                max_run = run
+        features.max_run = max_run
+        features.repeat_runs = repeat_runs
+        features.sequential_runs = list(self._sequential_runs)
+        return features
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# FortiPass - Vectorized Batch Scoring
+
+"""
+NumPy fast path for batch analysis.
+
+A chunk of passwords is encoded into a padded uint32 code-point matrix and
+screened with array operations for every pattern the analyzer can report:
+dictionary and keyboard substrings (rolling hashes checked against the
+automaton's patterns), dates, repeated and sequential characters and
+repeated sequences. Rows that pass the screen have no patterns, so their
+results follow from lengths, class flags and the character histogram,
+which are also computed as array operations, together with the
+_calculate_strength arithmetic.
+
+Everything else (rows with a possible pattern, non-ASCII rows, rows longer
+than MAX_VECTOR_LENGTH) goes through PasswordAnalyzer._analyze, so results
+are identical to the scalar path. The screen only has to be conservative:
+a false positive costs a scalar analysis, never a wrong result.
+
+NumPy is optional. Without it, VectorizedAnalyzer falls back to the scalar
+path for every row.
+"""
+
+import math
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+from fortipass.core import guesses as guess_model
+from fortipass.core.password_analyzer import PasswordAnalyzer
+from fortipass.core.results import AnalysisResult
+from fortipass.core.scanner import PasswordFeatures, _ASCII_CLASSES
+
+HAS_NUMPY = np is not None
+
+# Longer rows are rare and make the padded matrices wide; they use the
+# scalar path
+MAX_VECTOR_LENGTH = 64
+
+# Rows are grouped by length so short passwords are not padded to the
+# width of the longest one in the chunk
+_WIDTH_BUCKETS = (8, 12, 16, 24, 32, 48, MAX_VECTOR_LENGTH)
+
+# Polynomial rolling hash over lowered code points, modulo 2**64
+_HASH_BASE = 1000003
+_HASH_MASK = (1 << 64) - 1
+
+_PADDING = 0xFFFFFFFF
+
+
+def _pattern_hash(pattern: str) -> int:
+    """Hash a pattern the same way the matrix windows are hashed."""
+    value = 0
+    for char in pattern:
+        value = (value * _HASH_BASE + ord(char)) & _HASH_MASK
+    return value
+
+
+class VectorizedAnalyzer:
+    """
+    Batch front end that scores pattern-free passwords with NumPy.
+    Results are identical to PasswordAnalyzer.analyze().
+    """
+    
+    def __init__(self, analyzer: PasswordAnalyzer):
+        """
+        Precompute the lookup tables for an analyzer.
+        
+        Args:
+            analyzer: Analyzer whose wordlist, stores and scoring are used
+        """
+        self.analyzer = analyzer
+        # Passwords scored by the array path and by the scalar fallback
+        self.vectorized = 0
+        self.fallback = 0
+        if np is None:
+            return
+        
+        # Same pattern set as the analyzer's automaton, grouped by length
+        by_length = {}
+        patterns = list(analyzer.keyboard_patterns)
+        patterns.extend(word for word in analyzer.common_words if len(word) >= 4)
+        for pattern in patterns:
+            if pattern.isascii() and len(pattern) <= MAX_VECTOR_LENGTH:
+                by_length.setdefault(len(pattern), set()).add(_pattern_hash(pattern))
+        self._pattern_hashes = {
+            length: np.array(sorted(hashes), dtype=np.uint64)
+            for length, hashes in by_length.items()
+        }
+        self._base_powers = {
+            length: np.uint64(pow(_HASH_BASE, length, 1 << 64)) for length in by_length
+        }
+        
+        self._class_table = np.array([_ASCII_CLASSES[chr(code)] for code in range(128)],
+                                     dtype=np.uint8)
+        
+        # Negated entropy terms -(c/L)*log2(c/L), computed exactly as
+        # _calculate_entropy does so the sums match bit for bit
+        self._entropy_terms = np.zeros((MAX_VECTOR_LENGTH + 1, MAX_VECTOR_LENGTH + 1))
+        for length in range(1, MAX_VECTOR_LENGTH + 1):
+            for count in range(1, length + 1):
+                probability = count / length
+                self._entropy_terms[length, count] = 0.0 - probability * math.log2(probability)
+        
+        # String-valued fields depend on few inputs, so they are memoized
+        self._crack_times = {}
+        self._feedback = {}
+        self._guesses = {}
+    
+    def analyze_chunk(self, passwords: List[str],
+                      fields: Optional[frozenset] = None) -> List[AnalysisResult]:
+        """
+        Analyze a chunk of passwords.
+        
+        Args:
+            passwords: Passwords to analyze
+            fields: Result keys to compute, or None for all of them
+        
+        Returns:
+            One AnalysisResult per password, in input order
+        """
+        analyzer = self.analyzer
+        if np is None:
+            self.fallback += len(passwords)
+            return [analyzer._analyze(password, fields) for password in passwords]
+        
+        # Rows longer than the analyzer's character budget are truncated and
+        # flagged partial by the scalar path
+        limit = MAX_VECTOR_LENGTH
+        if analyzer.budget is not None and analyzer.budget.max_chars is not None:
+            limit = min(limit, analyzer.budget.max_chars)
+        
+        results = [None] * len(passwords)
+        buckets = {}
+        for index, password in enumerate(passwords):
+            length = len(password)
+            if 0 < length <= limit and password.isascii():
+                for width in _WIDTH_BUCKETS:
+                    if length <= width:
+                        buckets.setdefault(width, []).append(index)
+                        break
+        
+        for width, indexes in buckets.items():
+            self._score_bucket(passwords, indexes, width, fields, results)
+        
+        for index, result in enumerate(results):
+            if result is None:
+                self.fallback += 1
+                results[index] = analyzer._analyze(passwords[index], fields)
+        return results
+    
+    def _score_bucket(self, passwords: List[str], indexes: List[int], width: int,
+                      fields: Optional[frozenset], results: List) -> None:
+        """Screen one width bucket and fill in results for pattern-free rows."""
+        rows = [passwords[index] for index in indexes]
+        lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+        codes = self._encode(rows, lengths, width)
+        valid = np.arange(width) < lengths[:, None]
+        
+        clean = ~self._has_patterns(codes, lengths, valid)
+        if not clean.any():
+            return
+        codes, lengths, valid = codes[clean], lengths[clean], valid[clean]
+        indexes = [index for index, keep in zip(indexes, clean.tolist()) if keep]
+        
+        # Class flags from the distinct characters
+        classes = np.where(valid, self._class_table[np.where(valid, codes, 0)], 0)
+        classes = np.bitwise_or.reduce(classes, axis=1)
+        has_lower = (classes & 1) != 0
+        has_upper = (classes & 2) != 0
+        has_digits = (classes & 4) != 0
+        has_symbols = (classes & 8) != 0
+        diversity = (has_lower.astype(np.int64) + has_upper + has_digits + has_symbols)
+        
+        entropy = [round(value, 2) for value in self._entropy(codes, lengths).tolist()]
+        scores = self._strength(np.array(entropy), lengths, diversity)
+        
+        analyzer = self.analyzer
+        # Wordlist entries of 4+ characters were screened as substrings;
+        # shorter ones and the exact-match stores still need a lookup
+        exact_stores = analyzer.dictionary_index is not None or analyzer.bloom_filter is not None
+        want_crack_time = fields is None or "crack_time" in fields
+        want_feedback = fields is None or "feedback" in fields
+        want_guesses = (fields is None or "guesses_log10" in fields or
+                        "crack_time_guesses" in fields)
+        
+        columns = zip(indexes, lengths.tolist(), entropy, diversity.tolist(),
+                      has_lower.tolist(), has_upper.tolist(), has_digits.tolist(),
+                      has_symbols.tolist(), scores.tolist())
+        for index, length, row_entropy, row_diversity, lower, upper, digits, symbols, score in columns:
+            password = passwords[index]
+            if (length < 4 or exact_stores) and analyzer._is_common_word(password.lower()):
+                continue
+            if analyzer.breach_store is not None and analyzer.breach_store.lookup(password):
+                continue
+            
+            crack_time = feedback = guesses_log10 = crack_time_guesses = None
+            if want_crack_time:
+                crack_time = self._crack_time(row_entropy)
+            if want_feedback:
+                feedback = self._feedback_for(length, row_entropy, row_diversity,
+                                              (lower, upper, digits, symbols))
+            if want_guesses:
+                guesses_log10, crack_time_guesses = self._bruteforce_guesses(length)
+            
+            result = AnalysisResult(
+                length, row_entropy, row_diversity, lower, upper, digits, symbols,
+                (), score, analyzer._get_strength_category(score), crack_time,
+                feedback, guesses_log10, crack_time_guesses
+            )
+            results[index] = result.select(fields) if fields is not None else result
+            self.vectorized += 1
+    
+    def _encode(self, rows: List[str], lengths: "np.ndarray", width: int) -> "np.ndarray":
+        """Encode rows into a padded uint32 code-point matrix."""
+        flat = np.frombuffer("".join(rows).encode("utf-32-le"), dtype="<u4")
+        codes = np.full((len(rows), width), _PADDING, dtype=np.uint32)
+        row_index = np.repeat(np.arange(len(rows)), lengths)
+        offsets = np.cumsum(lengths) - lengths
+        column_index = np.arange(len(flat)) - np.repeat(offsets, lengths)
+        codes[row_index, column_index] = flat
+        return codes
+    
+    def _has_patterns(self, codes: "np.ndarray", lengths: "np.ndarray",
+                      valid: "np.ndarray") -> "np.ndarray":
+        """Flag rows that may contain any pattern the analyzer reports."""
+        width = codes.shape[1]
+        rows = codes.shape[0]
+        values = np.where(valid, codes, 0).astype(np.int64)
+        flagged = np.zeros(rows, dtype=bool)
+        
+        def window(offset: int, span: int) -> "np.ndarray":
+            # Column slice for characters at j + offset of windows of span
+            return values[:, offset:width - span + 1 + offset]
+        
+        def windows_valid(span: int) -> "np.ndarray":
+            return valid[:, span - 1:]
+        
+        # Runs of three identical characters, except newlines
+        if width >= 3:
+            first, second, third = window(0, 3), window(1, 3), window(2, 3)
+            flagged |= ((first == second) & (second == third) & (first != 10) &
+                        windows_valid(3)).any(axis=1)
+        
+        # Dates, on the original characters (digits have no case)
+        digit = (values >= 48) & (values <= 57)
+        if width >= 2:
+            flagged |= ((window(0, 2) == 48) & (window(1, 2) >= 49) & (window(1, 2) <= 57) &
+                        windows_valid(2)).any(axis=1)
+        if width >= 4:
+            c0, c1, c2, c3 = window(0, 4), window(1, 4), window(2, 4), window(3, 4)
+            digits_23 = digit[:, 2:width - 1] & digit[:, 3:]
+            date = (((c0 == 49) & (c1 == 57)) | ((c0 == 50) & (c1 == 48))) & digits_23
+            date |= ((c0 == 49) & (c1 >= 48) & (c1 <= 50) & (c2 >= 48) & (c2 <= 51) &
+                     digit[:, 3:])
+            date |= ((c0 >= 48) & (c0 <= 51) & digit[:, 1:width - 2] & (c2 >= 48) &
+                     (c2 <= 49) & digit[:, 3:])
+            flagged |= (date & windows_valid(4)).any(axis=1)
+        
+        # Sequential characters, on the lowered text
+        lowered = np.where((values >= 65) & (values <= 90), values + 32, values)
+        if width >= 3:
+            a, b, c = lowered[:, :width - 2], lowered[:, 1:width - 1], lowered[:, 2:]
+            sequential = ((b == a + 1) & (c == b + 1) &
+                          (((a >= 97) & (c <= 122)) | ((a >= 48) & (c <= 57))))
+            sequential |= (a == 56) & (b == 57) & (c == 48)
+            flagged |= (sequential & windows_valid(3)).any(axis=1)
+        
+        # Repeated sequences: some unit of 2+ characters immediately followed
+        # by a copy of itself. This also flags runs of one character
+        for unit in range(2, width // 2 + 1):
+            same = (values[:, :width - unit] == values[:, unit:]) & valid[:, unit:]
+            runs = np.zeros((rows, width - unit + 1), dtype=np.int64)
+            np.cumsum(same, axis=1, out=runs[:, 1:])
+            flagged |= ((runs[:, unit:] - runs[:, :-unit]) == unit).any(axis=1)
+        
+        # Dictionary and keyboard substrings via rolling hashes
+        prefix = np.zeros((rows, width + 1), dtype=np.uint64)
+        base = np.uint64(_HASH_BASE)
+        hashed = lowered.astype(np.uint64)
+        for column in range(width):
+            prefix[:, column + 1] = prefix[:, column] * base + hashed[:, column]
+        for length, hashes in self._pattern_hashes.items():
+            if length > width:
+                continue
+            window_hashes = prefix[:, length:] - prefix[:, :width + 1 - length] * self._base_powers[length]
+            hits = np.isin(window_hashes, hashes) & windows_valid(length)
+            flagged |= hits.any(axis=1)
+        
+        return flagged
+    
+    def _entropy(self, codes: "np.ndarray", lengths: "np.ndarray") -> "np.ndarray":
+        """
+        Unrounded entropy of each row.
+        
+        Terms are added in first-occurrence order, the order the scalar
+        path's histogram iterates in, so the floating-point sums agree.
+        """
+        rows, width = codes.shape
+        order = np.argsort(codes, axis=1, kind="stable")
+        ordered = np.take_along_axis(codes, order, axis=1)
+        starts = np.ones(ordered.shape, dtype=bool)
+        starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        
+        flat_starts = np.flatnonzero(starts)
+        counts = np.diff(np.append(flat_starts, starts.size))
+        start_rows = flat_starts // width
+        keep = ordered.ravel()[flat_starts] != _PADDING
+        flat_starts, counts, start_rows = flat_starts[keep], counts[keep], start_rows[keep]
+        
+        terms = np.zeros((rows, width))
+        terms[start_rows, order.ravel()[flat_starts]] = (
+            self._entropy_terms[lengths[start_rows], counts])
+        return np.cumsum(terms, axis=1)[:, -1] * lengths
+    
+    def _strength(self, entropy: "np.ndarray", lengths: "np.ndarray",
+                  diversity: "np.ndarray") -> "np.ndarray":
+        """_calculate_strength for pattern-free rows, as array operations."""
+        score = np.minimum(100.0, entropy * 4)
+        score = np.where(lengths < 8, score - (8 - lengths) * 10, score)
+        score = np.where(lengths > 12, score + np.minimum(20, (lengths - 12) * 2), score)
+        score = np.where(diversity < 3, score - (3 - diversity) * 10, score)
+        score = np.where(diversity == 4, score + 10, score)
+        score = np.maximum(0, score)
+        return np.rint(np.minimum(100, np.maximum(0, score))).astype(np.int64)
+    
+    def _crack_time(self, entropy: float) -> str:
+        """Memoized _estimate_crack_time."""
+        crack_time = self._crack_times.get(entropy)
+        if crack_time is None:
+            crack_time = self._crack_times[entropy] = self.analyzer._estimate_crack_time(entropy)
+        return crack_time
+    
+    def _feedback_for(self, length: int, entropy: float, diversity: int,
+                      classes: tuple) -> tuple:
+        """Memoized _generate_feedback for a row without patterns."""
+        # Feedback only depends on the length band, classes and entropy < 50
+        key = (0 if length < 8 else 1 if length < 12 else 2, classes, entropy < 50)
+        feedback = self._feedback.get(key)
+        if feedback is None:
+            features = PasswordFeatures()
+            (features.has_lowercase, features.has_uppercase,
+             features.has_digits, features.has_symbols) = classes
+            feedback = self._feedback[key] = self.analyzer._generate_feedback(
+                length, entropy, diversity, (), features)
+        return feedback
+    
+    def _bruteforce_guesses(self, length: int) -> tuple:
+        """Guess estimate for a row with no matches, memoized by length."""
+        estimate = self._guesses.get(length)
+        if estimate is None:
+            guesses_log10 = guess_model.estimate_guesses(length, []).guesses_log10
+            estimate = self._guesses[length] = (
+                guesses_log10, self.analyzer._format_crack_time_log10(guesses_log10))
+        return estimate
@@ -3,10 +3,12 @@
 # Main application entry point
 
 import sys
-from fortipass.ui.app import FortiPassApp
 
 def main():
     """Main entry point for the FortiPass application."""
+    # PyQt5 is only loaded when the GUI actually starts
+    from fortipass.ui.app import FortiPassApp
+    
     app = FortiPassApp()
     app.run()
 
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# FortiPass - HTTP Strength-Check Service
+# Local JSON microservice exposing the analysis engine over HTTP
+
+"""
+Minimal asyncio HTTP/1.1 server for password strength checks.
+
+Endpoints:
+    
+    POST /analyze        {"password": "...", "fields": [...]}  -> result object
+    POST /analyze/batch  {"passwords": [...], "fields": [...]} -> {"results": [...]}
+    GET  /health         -> {"status": "ok", "in_flight": n, "queued": n}
+
+"fields" is optional and selects a subset of result keys. The dictionary is
+loaded once in the parent and shared with a process pool, so analysis never
+runs on the event loop. Requests beyond the concurrency limit wait in a
+bounded queue; once that is full the server answers 503 with Retry-After.
+Passwords are never logged or echoed back.
+
+Run with:
+    
+    fortipass-server --port 8080 --workers 4 --max-concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple
+
+from fortipass.core import batch
+from fortipass.core.budget import AnalysisBudget
+from fortipass.core.password_analyzer import PasswordAnalyzer
+
+DEFAULT_WORDLIST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "data", "common_passwords.txt")
+
+# Request limits
+DEFAULT_MAX_QUEUE = 256
+DEFAULT_MAX_BATCH = 1000
+DEFAULT_MAX_BODY = 1024 * 1024
+DEFAULT_IDLE_TIMEOUT = 15.0
+
+# Per-password analysis budget; 0 disables a limit
+DEFAULT_MAX_CHARS = 256
+DEFAULT_MAX_MATCHES = 256
+_MAX_HEADER_LINES = 100
+
+
+class HTTPError(Exception):
+    """Error answered with a JSON body and the given status code."""
+    
+    def __init__(self, status: int, message: str, headers: Dict[str, str] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+def _worker_ready() -> bool:
+    """No-op task used to start every worker process up front."""
+    return True
+
+
+def _analyze_json(passwords: List[str], fields: Optional[frozenset], single: bool) -> bytes:
+    """Analyze passwords in a worker process and encode the response body."""
+    analyzer = batch.worker_analyzer()
+    results = [analyzer._analyze(password, fields).to_dict() for password in passwords]
+    payload = results[0] if single else {"results": results}
+    return json.dumps(payload).encode("utf-8")
+
+
+class AnalysisServer:
+    """
+    asyncio HTTP front end over a process pool of analyzers.
+    At most max_concurrency requests are analyzed at once and at most
+    max_queue more wait for a slot.
+    """
+    
+    def __init__(self, analyzer: PasswordAnalyzer, host: str = "127.0.0.1",
+                 port: int = 8080, workers: int = None, max_concurrency: int = None,
+                 max_queue: int = DEFAULT_MAX_QUEUE, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_body: int = DEFAULT_MAX_BODY,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """
+        Configure the server.
+        
+        Args:
+            analyzer: Preconfigured analyzer shared with the worker processes
+            host: Interface to bind
+            port: TCP port to bind (0 picks a free port)
+            workers: Worker processes (defaults to the CPU count)
+            max_concurrency: Requests analyzed at once (defaults to 2 per worker)
+            max_queue: Requests allowed to wait for a slot before 503s
+            max_batch: Largest accepted /analyze/batch request
+            max_body: Largest accepted request body in bytes
+            idle_timeout: Seconds an idle keep-alive connection is kept open
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.analyzer = analyzer
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers * 2
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.max_body = max_body
+        self.idle_timeout = idle_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self._slots = None
+        self._pool = None
+        self._server = None
+    
+    async def start(self) -> None:
+        """Start the worker pool and begin listening."""
+        self.analyzer.preload()
+        context = batch.pool_context()
+        if context.get_start_method() == "fork":
+            # The analyzer is inherited rather than pickled
+            initializer, initargs = batch.init_worker, (self.analyzer, None)
+        else:
+            initializer, initargs = batch.init_worker_from_config, (self.analyzer.config(),)
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=context,
+                                         initializer=initializer, initargs=initargs)
+        # Start every worker before binding, so none inherits the listening
+        # socket and the first requests don't pay for process startup
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _worker_ready)
+                               for _ in range(self.workers)))
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._server = await asyncio.start_server(self._handle_connection,
+                                                  self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self) -> None:
+        """Start if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+    
+    async def close(self) -> None:
+        """Stop listening and shut the worker pool down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until it closes or goes idle."""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader),
+                                                     self.idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    break
+                method, path, headers, body, error = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if error is not None:
+                    # The rest of the request was not read, so the connection
+                    # cannot be reused
+                    status, body, extra = error.status, _error_body(error), error.headers
+                    keep_alive = False
+                else:
+                    status, body, extra = await self._dispatch(method, path, body)
+                writer.write(_response(status, body, keep_alive, extra))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[tuple]:
+        """
+        Read one request.
+        
+        Returns:
+            (method, path, headers, body, error) or None when the client
+            closed the connection; error is an HTTPError when the request
+            cannot be served.
+        """
+        line = await _readline(reader)
+        if line is None:
+            return "", "", {}, b"", HTTPError(414, "Request line too long")
+        if not line:
+            return None
+        try:
+            method, path, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            return "", "", {}, b"", HTTPError(400, "Malformed request line")
+        
+        headers = {}
+        for _ in range(_MAX_HEADER_LINES):
+            line = await _readline(reader)
+            if line is None:
+                return method, path, headers, b"", HTTPError(431, "Header line too long")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            return method, path, headers, b"", HTTPError(431, "Too many headers")
+        
+        if "transfer-encoding" in headers:
+            return method, path, headers, b"", HTTPError(411, "Content-Length required")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            return method, path, headers, b"", HTTPError(400, "Invalid Content-Length")
+        if length < 0 or length > self.max_body:
+            return method, path, headers, b"", HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method, path, headers, body, None
+    
+    async def _dispatch(self, method: str, path: str,
+                        body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        """Route a request and return (status, body, extra headers)."""
+        try:
+            if path == "/health":
+                if method != "GET":
+                    raise HTTPError(405, "Use GET", {"Allow": "GET"})
+                return 200, json.dumps(self.health()).encode("utf-8"), {}
+            if path not in ("/analyze", "/analyze/batch"):
+                raise HTTPError(404, "Not found")
+            if method != "POST":
+                raise HTTPError(405, "Use POST", {"Allow": "POST"})
+            
+            request = _parse_json(body)
+            single = path == "/analyze"
+            passwords = _request_passwords(request, single, self.max_batch)
+            fields = request.get("fields")
+            if fields is not None and not isinstance(fields, list):
+                raise HTTPError(400, "'fields' must be a list of strings")
+            try:
+                fields = self.analyzer._resolve_fields(fields)
+            except (TypeError, ValueError) as e:
+                raise HTTPError(400, str(e))
+            try:
+                return 200, await self._analyze(passwords, fields, single), {}
+            except (HTTPError, asyncio.CancelledError):
+                raise
+            except ValueError:
+                # Raised by the analysis for input it cannot handle; the
+                # message may quote the password, so it is not returned
+                raise HTTPError(400, "Password could not be analyzed")
+            except Exception as e:
+                # Only the exception type is logged, never its message
+                sys.stderr.write(f"fortipass-server: analysis failed: {type(e).__name__}\n")
+                raise HTTPError(500, "Internal server error")
+        except HTTPError as e:
+            return e.status, _error_body(e), e.headers
+    
+    async def _analyze(self, passwords: List[str], fields: Optional[frozenset],
+                       single: bool) -> bytes:
+        """Run an analysis on the pool, respecting the concurrency limit."""
+        if self.in_flight + self.queued >= self.max_concurrency + self.max_queue:
+            self.rejected += 1
+            raise HTTPError(503, "Server busy", {"Retry-After": "1"})
+        
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, _analyze_json,
+                                              passwords, fields, single)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+    
+    def health(self) -> Dict[str, Any]:
+        """Return load counters for the health endpoint."""
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "rejected": self.rejected
+        }
+
+
+async def _readline(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Read one line, returning None if it exceeds the stream limit."""
+    try:
+        return await reader.readline()
+    except ValueError:
+        # readline() turns LimitOverrunError into ValueError
+        return None
+
+
+def _parse_json(body: bytes) -> Dict[str, Any]:
+    """Decode a JSON object request body."""
+    try:
+        request = json.loads(body.decode("utf-8")) if body else {}
+    except (UnicodeDecodeError, ValueError):
+        raise HTTPError(400, "Body must be valid JSON")
+    if not isinstance(request, dict):
+        raise HTTPError(400, "Body must be a JSON object")
+    return request
+
+
+def _request_passwords(request: Dict[str, Any], single: bool, max_batch: int) -> List[str]:
+    """Extract and validate the passwords from a request object."""
+    if single:
+        password = request.get("password")
+        if not isinstance(password, str):
+            raise HTTPError(400, "'password' must be a string")
+        return [password]
+    
+    passwords = request.get("passwords")
+    if not isinstance(passwords, list) or not all(isinstance(p, str) for p in passwords):
+        raise HTTPError(400, "'passwords' must be a list of strings")
+    if len(passwords) > max_batch:
+        raise HTTPError(413, f"Batch exceeds {max_batch} passwords")
+    return passwords
+
+
+def _error_body(error: HTTPError) -> bytes:
+    """Encode an error response body."""
+    return json.dumps({"error": error.message}).encode("utf-8")
+
+
+def _response(status: int, body: bytes, keep_alive: bool,
+              extra: Dict[str, str] = None) -> bytes:
+    """Serialize an HTTP/1.1 JSON response."""
+    lines = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Cache-Control: no-store",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    for name, value in (extra or {}).items():
+        lines.append(f"{name}: {value}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point for the HTTP service."""
+    parser = argparse.ArgumentParser(
+        prog="fortipass-server",
+        description="Serve FortiPass password analysis over HTTP/JSON."
+    )
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Interface to bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8080,
+                        help="Port to bind (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-concurrency", type=int, default=None,
+                        help="Requests analyzed at once (default: 2 per worker)")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help="Requests waiting for a slot before 503s (default: %(default)s)")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="Largest batch request (default: %(default)s)")
+    parser.add_argument("--wordlist", default=DEFAULT_WORDLIST,
+                        help="Common password wordlist (default: bundled list)")
+    parser.add_argument("--index", default=None, help="Prebuilt dictionary index")
+    parser.add_argument("--bloom", default=None, help="Bloom filter built over the dictionary")
+    parser.add_argument("--breach-store", default=None,
+                        help="Directory of SHA-1 range shards for breach screening")
+    parser.add_argument("--max-chars", type=int, default=DEFAULT_MAX_CHARS,
+                        help="Characters inspected per password, 0 for all (default: %(default)s)")
+    parser.add_argument("--max-matches", type=int, default=DEFAULT_MAX_MATCHES,
+                        help="Pattern matches kept per password, 0 for all (default: %(default)s)")
+    parser.add_argument("--time-budget-ms", type=float, default=0,
+                        help="Skip expensive stages once an analysis takes this long, "
+                             "0 for no limit (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    try:
+        budget = AnalysisBudget(
+            args.max_chars or None, args.max_matches or None,
+            args.time_budget_ms / 1000.0 if args.time_budget_ms else None)
+        analyzer = PasswordAnalyzer(
+            args.wordlist if args.wordlist and os.path.exists(args.wordlist) else None,
+            index_path=args.index, bloom_path=args.bloom,
+            breach_store_path=args.breach_store, budget=budget
+        )
+        server = AnalysisServer(analyzer, args.host, args.port, args.workers,
+                                args.max_concurrency, args.max_queue, args.max_batch)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"fortipass-server: {e}\n")
+        return 2
+    
+    async def run() -> None:
+        # Shut the pool down cleanly on SIGTERM as well as Ctrl+C
+        task = asyncio.current_task()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+        except (NotImplementedError, AttributeError):
+            pass
+        await server.start()
+        sys.stderr.write(f"fortipass-server: listening on http://{server.host}:{server.port} "
+                         f"({server.workers} workers, concurrency {server.max_concurrency})\n")
+        await server.serve_forever()
+    
+    try:
+        asyncio.run(run())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
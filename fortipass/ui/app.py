@@ -7,12 +7,15 @@ from typing import Dict, Any, Optional
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                             QProgressBar, QFrame, QGridLayout, QCheckBox,
-                            QSpinBox, QComboBox, QFileDialog, QMessageBox)
-from PyQt5.QtCore import Qt, QTimer, pyqtSlot
+                            QSpinBox, QComboBox, QFileDialog, QMessageBox,
+                            QStackedWidget)
+from PyQt5.QtCore import Qt, QTimer, QThreadPool, pyqtSlot
 from PyQt5.QtGui import QColor, QPalette, QFont, QIcon
 
 from fortipass.core.password_analyzer import PasswordAnalyzer
+from fortipass.core.session import AnalysisSession
 from fortipass.ui.widgets import StrengthMeter, HeatmapWidget, FeedbackWidget
+from fortipass.ui.workers import AnalysisSignals, AnalysisTask, AdaptiveDebounce
 from fortipass.utils.report_generator import ReportGenerator
 
 class FortiPassApp:
@@ -22,7 +25,7 @@ class FortiPassApp:
         """Initialize the FortiPass application."""
         self.app = QApplication(sys.argv)
         self.window = FortiPassWindow()
-        
+    
     def run(self):
         """Run the application main loop."""
         self.window.show()
@@ -42,11 +45,42 @@ class FortiPassWindow(QMainWindow):
         # Initialize the password analyzer with default wordlist
         wordlist_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
                                     "data", "common_passwords.txt")
-        self.analyzer = PasswordAnalyzer(wordlist_path if os.path.exists(wordlist_path) else None)
+        # Passphrases need a compiled word index; none is bundled, so the
+        # option is offered once one has been built at this path
+        passphrase_index_path = os.path.join(os.path.dirname(wordlist_path),
+                                             "passphrase_words.fpwl")
+        # A small cache answers instantly when an edit restores earlier text,
+        # e.g. an undo; the session checks it before analyzing
+        self.analyzer = PasswordAnalyzer(
+            wordlist_path if os.path.exists(wordlist_path) else None, cache_size=64,
+            passphrase_index_path=(passphrase_index_path
+                                   if os.path.exists(passphrase_index_path) else None))
+        # Keystrokes are applied to a session as edits, so each one only
+        # re-analyzes around the change; building it also preloads the
+        # matcher so the first keystroke doesn't pay for it
+        self.session = AnalysisSession(self.analyzer)
+        # Cursor position after the latest edit, which locates the edit
+        self.edit_cursor = None
         
         # Initialize UI components
         self.init_ui()
         
+        # Analysis runs off the GUI thread. One thread is enough: only the
+        # latest request matters, and queued stale requests are cleared.
+        self.analysis_pool = QThreadPool(self)
+        self.analysis_pool.setMaxThreadCount(1)
+        self.analysis_signals = AnalysisSignals(self)
+        self.analysis_signals.finished.connect(self.on_analysis_finished)
+        self.analysis_signals.failed.connect(self.on_analysis_failed)
+        # Incremented per request; results from older requests are dropped
+        self.analysis_generation = 0
+        self.debounce = AdaptiveDebounce()
+        # Latest applied result and the text it is for; export reuses it
+        self.last_password = None
+        self.last_results = None
+        # (format, path) of an export waiting for the running analysis
+        self.pending_export = None
+        
         # Set up timer for delayed analysis (for better UX)
         self.analysis_timer = QTimer()
         self.analysis_timer.setSingleShot(True)
@@ -149,6 +183,11 @@ class FortiPassWindow(QMainWindow):
         self.crack_time_label = QLabel("Instant")
         metrics_layout.addWidget(self.crack_time_label, 1, 3)
         
+        # Row 2
+        metrics_layout.addWidget(QLabel("Guess-Based Crack Time:"), 2, 2)
+        self.guess_crack_time_label = QLabel("Instant")
+        metrics_layout.addWidget(self.guess_crack_time_label, 2, 3)
+        
         viz_layout.addWidget(viz_title)
         viz_layout.addWidget(self.heatmap)
         viz_layout.addLayout(metrics_layout)
@@ -164,7 +203,25 @@ class FortiPassWindow(QMainWindow):
         generator_title = QLabel("Password Generator")
         generator_title.setFont(QFont("Arial", 10, QFont.Bold))
         
-        generator_options_layout = QGridLayout()
+        generator_type_layout = QHBoxLayout()
+        generator_type_layout.addWidget(QLabel("Type:"))
+        self.generator_type = QComboBox()
+        self.generator_type.addItems(["Password", "Passphrase"])
+        if self.analyzer.word_index is None:
+            # Disable the passphrase entry until a word index is available
+            self.generator_type.model().item(1).setEnabled(False)
+            self.generator_type.setToolTip(
+                "Compile a wordlist to data/passphrase_words.fpwl with "
+                "python -m fortipass.core.passphrase to enable passphrases")
+        generator_type_layout.addWidget(self.generator_type)
+        
+        # One options page per generator type
+        self.generator_options = QStackedWidget()
+        self.generator_type.currentIndexChanged.connect(self.generator_options.setCurrentIndex)
+        
+        password_options = QWidget()
+        generator_options_layout = QGridLayout(password_options)
+        generator_options_layout.setContentsMargins(0, 0, 0, 0)
         
         generator_options_layout.addWidget(QLabel("Length:"), 0, 0)
         self.length_spin = QSpinBox()
@@ -184,12 +241,46 @@ class FortiPassWindow(QMainWindow):
         self.symbols_check.setChecked(True)
         generator_options_layout.addWidget(self.symbols_check, 3, 0, 1, 2)
         
-        generate_btn = QPushButton("Generate Password")
+        passphrase_options = QWidget()
+        passphrase_options_layout = QGridLayout(passphrase_options)
+        passphrase_options_layout.setContentsMargins(0, 0, 0, 0)
+        
+        passphrase_options_layout.addWidget(QLabel("Words:"), 0, 0)
+        self.words_spin = QSpinBox()
+        self.words_spin.setRange(3, 12)
+        self.words_spin.setValue(6)
+        passphrase_options_layout.addWidget(self.words_spin, 0, 1)
+        
+        passphrase_options_layout.addWidget(QLabel("Separator:"), 1, 0)
+        self.separator_combo = QComboBox()
+        # Display name -> separator characters; "Random" draws one per gap
+        self.separator_choices = {
+            "Hyphen (-)": "-", "Space": " ", "Period (.)": ".",
+            "Underscore (_)": "_", "Random (-._)": "-._", "None": "",
+        }
+        self.separator_combo.addItems(list(self.separator_choices))
+        passphrase_options_layout.addWidget(self.separator_combo, 1, 1)
+        
+        self.capitalize_check = QCheckBox("Capitalize words")
+        passphrase_options_layout.addWidget(self.capitalize_check, 2, 0, 1, 2)
+        
+        self.passphrase_digit_check = QCheckBox("Add a digit")
+        passphrase_options_layout.addWidget(self.passphrase_digit_check, 3, 0, 1, 2)
+        
+        self.generator_options.addWidget(password_options)
+        self.generator_options.addWidget(passphrase_options)
+        
+        generate_btn = QPushButton("Generate")
         generate_btn.clicked.connect(self.generate_password)
         
+        # Entropy of the last generated passphrase, from the list size
+        self.generator_entropy_label = QLabel("")
+        
         generator_layout.addWidget(generator_title)
-        generator_layout.addLayout(generator_options_layout)
+        generator_layout.addLayout(generator_type_layout)
+        generator_layout.addWidget(self.generator_options)
         generator_layout.addWidget(generate_btn)
+        generator_layout.addWidget(self.generator_entropy_label)
         
         # Export section
         export_layout = QVBoxLayout()
@@ -223,8 +314,11 @@ class FortiPassWindow(QMainWindow):
     
     def on_password_changed(self):
         """Handle password input changes."""
-        # Reset the timer to delay analysis for better UX
-        self.analysis_timer.start(300)  # 300ms delay
+        self.edit_cursor = self.password_input.cursorPosition()
+        
+        # Reset the timer to delay analysis for better UX; the delay tracks
+        # how long recent analyses took
+        self.analysis_timer.start(self.debounce.interval())
     
     def toggle_password_visibility(self):
         """Toggle password visibility."""
@@ -236,16 +330,55 @@ class FortiPassWindow(QMainWindow):
             self.show_password_btn.setText("Show")
     
     def analyze_password(self):
-        """Analyze the current password and update UI."""
+        """Start a background analysis of the current password."""
         password = self.password_input.text()
         
-        # Get analysis results
-        results = self.analyzer.analyze(password)
-        
-        # Update UI with results
-        self.update_ui_with_results(results)
+        # A direct call (e.g. after generating) supersedes a pending debounce
+        self.analysis_timer.stop()
+        self.analysis_generation += 1
+        # Requests still waiting in the queue are already stale
+        self.analysis_pool.clear()
+        self.analysis_pool.start(AnalysisTask(self.session, password, self.edit_cursor,
+                                              self.analysis_generation,
+                                              self.analysis_signals))
+    
+    @pyqtSlot(int, str, object, object, float)
+    def on_analysis_finished(self, generation: int, password: str, results: Dict[str, Any],
+                             char_scores: tuple, elapsed: float):
+        """Apply a finished analysis if it is for the latest request."""
+        self.debounce.record(elapsed)
+        if generation != self.analysis_generation:
+            return
+        self.last_password = password
+        self.last_results = results
+        self.update_ui_with_results(results, password, char_scores)
+        
+        if self.pending_export is not None:
+            export_format, save_path = self.pending_export
+            self.pending_export = None
+            self.write_report(results, export_format, save_path)
+    
+    @pyqtSlot(int, str)
+    def on_analysis_failed(self, generation: int, message: str):
+        """Report a failed analysis if it is for the latest request."""
+        if generation != self.analysis_generation:
+            return
+        self.statusBar().showMessage(f"Analysis failed: {message}", 5000)
+        if self.pending_export is not None:
+            self.pending_export = None
+            QMessageBox.critical(self, "Export Failed",
+                                 f"Failed to analyze the password: {message}")
     
-    def update_ui_with_results(self, results: Dict[str, Any]):
+    def closeEvent(self, event):
+        """Discard pending analysis and wait for the running one on close."""
+        self.analysis_timer.stop()
+        self.analysis_generation += 1
+        self.analysis_pool.clear()
+        self.analysis_pool.waitForDone()
+        super().closeEvent(event)
+    
+    def update_ui_with_results(self, results: Dict[str, Any], password: str = "",
+                               char_scores: tuple = ()):
         """Update UI components with analysis results."""
         # Update strength meter
         self.strength_meter.set_strength(results["strength_score"])
@@ -262,7 +395,7 @@ class FortiPassWindow(QMainWindow):
             color = "#2ECC40"  # Light green
         else:
             color = "#01FF70"  # Bright green
-            
+        
         self.strength_label.setStyleSheet(f"color: {color};")
         
         # Update metrics
@@ -270,17 +403,30 @@ class FortiPassWindow(QMainWindow):
         self.entropy_label.setText(f"{results['entropy']:.2f}")
         self.diversity_label.setText(f"{results['char_diversity']}/4")
         self.crack_time_label.setText(results["crack_time"])
+        self.guess_crack_time_label.setText(results["crack_time_guesses"])
         
         # Update heatmap visualization
-        self.heatmap.set_password(results["password"] if "password" in results else self.password_input.text())
-        self.heatmap.set_analysis_results(results)
+        self.heatmap.set_analysis(password, char_scores, results["patterns"])
         
         # Update feedback
         self.feedback_widget.set_feedback(results["feedback"])
         self.feedback_widget.set_patterns(results["patterns"])
     
     def generate_password(self):
-        """Generate a strong password based on selected options."""
+        """Generate a strong password or passphrase based on selected options."""
+        if self.generator_type.currentText() == "Passphrase":
+            generator = self.analyzer.passphrase_generator(
+                self.words_spin.value(),
+                self.separator_choices[self.separator_combo.currentText()],
+                self.capitalize_check.isChecked(),
+                self.passphrase_digit_check.isChecked()
+            )
+            self.generator_entropy_label.setText(f"Entropy: {generator.entropy:.1f} bits")
+            self.password_input.setText(generator.generate())
+            self.analyze_password()
+            return
+        
+        self.generator_entropy_label.setText("")
         length = self.length_spin.value()
         include_uppercase = self.uppercase_check.isChecked()
         include_digits = self.digits_check.isChecked()
@@ -299,12 +445,6 @@ class FortiPassWindow(QMainWindow):
         if not password:
             QMessageBox.warning(self, "Export Failed", "No password to analyze.")
             return
-            
-        # Get analysis results
-        results = self.analyzer.analyze(password)
-        
-        # Create report generator
-        report_gen = ReportGenerator()
         
         # Get export format
         export_format = self.export_format.currentText().lower()
@@ -318,13 +458,27 @@ class FortiPassWindow(QMainWindow):
         if not save_path:
             return  # User canceled
         
+        # Export the result already shown; if the text changed since, wait
+        # for a fresh analysis instead of running one on the GUI thread
+        if (password == self.last_password and not self.analysis_timer.isActive() and
+                self.pending_export is None):
+            self.write_report(self.last_results, export_format, save_path)
+            return
+        self.pending_export = (export_format, save_path)
+        self.analyze_password()
+    
+    def write_report(self, results, export_format: str, save_path: str):
+        """Write a report for finished analysis results."""
+        # Create report generator
+        report_gen = ReportGenerator()
+        
         try:
             # Generate and save report
             if export_format == "pdf":
                 report_gen.export_pdf(results, save_path)
             else:
                 report_gen.export_json(results, save_path)
-                
+            
             QMessageBox.information(self, "Export Successful", 
                                    f"Report exported successfully to {save_path}")
         except Exception as e:
@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 # FortiPass - Custom UI Widgets
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                             QProgressBar, QSizePolicy, QScrollArea,
                             QFrame, QGridLayout)
 from PyQt5.QtCore import Qt, QRectF
-from PyQt5.QtGui import QPainter, QColor, QLinearGradient, QPen, QFont, QBrush
+from PyQt5.QtGui import QPainter, QPixmap, QColor, QLinearGradient, QPen, QFont, QBrush
 
 class StrengthMeter(QProgressBar):
     """Custom progress bar for password strength visualization."""
@@ -87,121 +87,149 @@ class StrengthMeter(QProgressBar):
             """)
 
 
+# Heatmap colors by score threshold, created once rather than per cell
+_HEATMAP_COLORS = (
+    (20, QColor("#FF4136")),  # Red
+    (40, QColor("#FF851B")),  # Orange
+    (60, QColor("#FFDC00")),  # Yellow
+    (80, QColor("#2ECC40")),  # Light green
+    (101, QColor("#01FF70")),  # Bright green
+)
+
+# Pattern span markers drawn under the cells, by severity
+_SEVERITY_COLORS = {
+    "critical": QColor("#85144B"),
+    "high": QColor("#FF4136"),
+    "medium": QColor("#FF851B"),
+    "low": QColor("#FFDC00"),
+}
+
+
 class HeatmapWidget(QWidget):
-    """Widget for visualizing password strength as a heatmap."""
+    """
+    Widget for visualizing password strength as a heatmap.
+    The heatmap is rendered into a cached pixmap that is rebuilt only when
+    the analysis or the widget size changes; repaints just blit it.
+    """
+    
+    # Cells narrower than this are merged into buckets showing the weakest
+    # score in each, and character labels are dropped
+    MIN_CELL_WIDTH = 12
+    MAX_CELL_WIDTH = 40
+    LABEL_HEIGHT = 20
+    MARKER_HEIGHT = 4
     
     def __init__(self, parent=None):
         """Initialize the heatmap widget."""
         super().__init__(parent)
         self.password = ""
-        self.analysis_results = None
+        self.char_scores = ()
+        self.patterns = ()
+        self._pixmap = None
+        self._font = QFont(self.font())
+        self._font.setPointSize(10)
         self.setMinimumHeight(80)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
     
-    def set_password(self, password: str):
-        """Set the password to visualize."""
+    def set_analysis(self, password: str, char_scores: Tuple[int, ...],
+                     patterns: Tuple[Any, ...] = ()):
+        """
+        Set the password and its per-character scores to visualize.
+        
+        Args:
+            password: The analyzed password
+            char_scores: One 0-100 score per character, from
+                PasswordAnalyzer.character_scores
+            patterns: Detected patterns; their spans are marked under the cells
+        """
         self.password = password
+        self.char_scores = char_scores
+        self.patterns = patterns
+        self._pixmap = None
         self.update()
     
-    def set_analysis_results(self, results: Dict[str, Any]):
-        """Set the analysis results for visualization."""
-        self.analysis_results = results
-        self.update()
+    def resizeEvent(self, event):
+        """Drop the cached rendering when the size changes."""
+        self._pixmap = None
+        super().resizeEvent(event)
     
     def paintEvent(self, event):
         """Paint the heatmap visualization."""
         if not self.password:
             return
-            
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
         
-        # Calculate character cell width
+        ratio = self.devicePixelRatioF()
+        if self._pixmap is None or self._pixmap.devicePixelRatio() != ratio:
+            self._pixmap = self._render(ratio)
+        
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._pixmap)
+    
+    def _render(self, ratio: float) -> QPixmap:
+        """Draw the heatmap into a new pixmap the size of the widget."""
         width = self.width()
-        height = self.height()
+        height = max(self.height(), 40)
+        pixmap = QPixmap(int(width * ratio), int(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
         
-        # Ensure minimum height
-        if height < 40:
-            height = 40
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self._font)
         
-        # Calculate character cell dimensions
         char_count = len(self.password)
-        if char_count == 0:
-            return
-            
-        cell_width = min(width / char_count, 40)  # Max width of 40px per character
-        cell_height = height - 20  # Leave room for character labels
-        
-        # Draw each character cell
-        x_offset = (width - (cell_width * char_count)) / 2  # Center the heatmap
+        cell_height = height - self.LABEL_HEIGHT - self.MARKER_HEIGHT
         
-        for i, char in enumerate(self.password):
-            # Calculate character strength (simplified)
-            char_strength = self._calculate_char_strength(i, char)
-            
-            # Determine color based on strength
-            color = self._get_strength_color(char_strength)
-            
-            # Draw character cell
-            rect = QRectF(x_offset + (i * cell_width), 0, cell_width, cell_height)
-            painter.fillRect(rect, color)
+        if width / char_count >= self.MIN_CELL_WIDTH:
+            # One cell per character, with the character and its score
+            cell_width = min(width / char_count, self.MAX_CELL_WIDTH)
+            x_offset = (width - cell_width * char_count) / 2  # Center the heatmap
             painter.setPen(QPen(Qt.black, 1))
-            painter.drawRect(rect)
-            
-            # Draw character
+            for index, score in enumerate(self.char_scores):
+                rect = QRectF(x_offset + index * cell_width, 0, cell_width, cell_height)
+                painter.fillRect(rect, self._get_strength_color(score))
+                painter.drawRect(rect)
+                painter.drawText(rect, Qt.AlignCenter, self.password[index])
+                
+                label_rect = QRectF(rect.left(), cell_height + self.MARKER_HEIGHT,
+                                    cell_width, self.LABEL_HEIGHT)
+                painter.drawText(label_rect, Qt.AlignCenter, str(score))
+            chars_per_cell = 1
+        else:
+            # Downsampled: each bucket shows its weakest character
+            buckets = max(1, width // self.MIN_CELL_WIDTH)
+            chars_per_cell = char_count / buckets
+            cell_width = width / buckets
+            x_offset = 0
+            painter.setPen(Qt.NoPen)
+            for bucket in range(buckets):
+                start = int(bucket * chars_per_cell)
+                end = max(start + 1, int((bucket + 1) * chars_per_cell))
+                score = min(self.char_scores[start:end])
+                painter.fillRect(QRectF(bucket * cell_width, 0, cell_width, cell_height),
+                                 self._get_strength_color(score))
             painter.setPen(Qt.black)
-            font = painter.font()
-            font.setPointSize(10)
-            painter.setFont(font)
-            painter.drawText(rect, Qt.AlignCenter, char)
-            
-            # Draw strength value
-            strength_rect = QRectF(x_offset + (i * cell_width), cell_height, cell_width, 20)
-            painter.drawText(strength_rect, Qt.AlignCenter, f"{int(char_strength)}")
-    
-    def _calculate_char_strength(self, index: int, char: str) -> float:
-        """Calculate the strength contribution of a single character."""
-        if not self.analysis_results:
-            return 50  # Default medium strength
-            
-        # Base strength from character type
-        base_strength = 0
-        if char.islower():
-            base_strength = 40
-        elif char.isupper():
-            base_strength = 60
-        elif char.isdigit():
-            base_strength = 50
-        else:  # Symbol
-            base_strength = 80
-            
-        # Adjust for patterns
-        if self.analysis_results and "patterns" in self.analysis_results:
-            for pattern in self.analysis_results["patterns"]:
-                # This is a simplified approach - in a real implementation,
-                # we would need to know which characters are part of which patterns
-                if pattern["type"] == "repeated_chars" and index > 0 and char == self.password[index-1]:
-                    base_strength -= 20
-                elif pattern["type"] == "sequential_chars":
-                    # Check if this might be part of a sequence
-                    if index > 0 and ord(char) == ord(self.password[index-1]) + 1:
-                        base_strength -= 15
-                        
-        # Ensure strength is within bounds
-        return max(0, min(100, base_strength))
+            painter.drawText(QRectF(0, cell_height + self.MARKER_HEIGHT, width, self.LABEL_HEIGHT),
+                             Qt.AlignCenter, f"{char_count} characters, "
+                                             f"{chars_per_cell:.1f} per cell")
+        
+        # Mark where each pattern matched
+        scale = cell_width / chars_per_cell
+        for pattern in self.patterns:
+            color = _SEVERITY_COLORS.get(str(pattern["severity"]), _SEVERITY_COLORS["low"])
+            for start, end in pattern.get("spans", ()):
+                painter.fillRect(QRectF(x_offset + start * scale, cell_height,
+                                        (end - start) * scale, self.MARKER_HEIGHT), color)
+        
+        painter.end()
+        return pixmap
     
     def _get_strength_color(self, strength: float) -> QColor:
         """Get color based on strength value."""
-        if strength < 20:
-            return QColor("#FF4136")  # Red
-        elif strength < 40:
-            return QColor("#FF851B")  # Orange
-        elif strength < 60:
-            return QColor("#FFDC00")  # Yellow
-        elif strength < 80:
-            return QColor("#2ECC40")  # Light green
-        else:
-            return QColor("#01FF70")  # Bright green
+        for threshold, color in _HEATMAP_COLORS:
+            if strength < threshold:
+                return color
+        return _HEATMAP_COLORS[-1][1]
 
 
 class FeedbackWidget(QWidget):
@@ -261,7 +289,7 @@ class FeedbackWidget(QWidget):
             label = QLabel(message)
             label.setWordWrap(True)
             self.feedback_layout.addWidget(label)
-            
+        
         # Add empty widget if no feedback
         if not feedback:
             label = QLabel("No feedback available.")
@@ -277,13 +305,13 @@ class FeedbackWidget(QWidget):
         for pattern in patterns:
             # Create pattern label with severity indicator
             severity = pattern.get("severity", "low")
-            color = "#FF4136" if severity == "high" else "#FF851B" if severity == "medium" else "#FFDC00"
+            color = "#FF4136" if severity in ("critical", "high") else "#FF851B" if severity == "medium" else "#FFDC00"
             
             label = QLabel(f"• {pattern['description']}")
             label.setStyleSheet(f"color: {color};")
             label.setWordWrap(True)
             self.patterns_layout.addWidget(label)
-            
+        
         # Add empty widget if no patterns
         if not patterns:
             label = QLabel("No patterns detected.")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# FortiPass - Background Analysis Workers
+
+import time
+from typing import Optional
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from fortipass.core.session import AnalysisSession
+
+
+class AnalysisSignals(QObject):
+    """
+    Signals emitted by analysis tasks.
+    Emitted from a pool thread and delivered on the thread that owns this
+    object, so slots connected from the window run on the GUI thread.
+    """
+    
+    # generation, password, results, per-character scores, elapsed seconds
+    finished = pyqtSignal(int, str, object, object, float)
+    # generation, error message
+    failed = pyqtSignal(int, str)
+
+
+class AnalysisTask(QRunnable):
+    """Bring an analysis session up to date on a QThreadPool thread."""
+    
+    def __init__(self, session: AnalysisSession, password: str, cursor: Optional[int],
+                 generation: int, signals: AnalysisSignals):
+        """
+        Initialize the task.
+        
+        Args:
+            session: Incremental session shared by every task of one window.
+                Tasks must run one at a time since sessions are not
+                thread-safe.
+            password: The password to analyze
+            cursor: Cursor position after the latest edit, used to locate it
+            generation: Request number used to discard stale results
+            signals: Long-lived signal holder owned by the GUI thread
+        """
+        super().__init__()
+        self.session = session
+        self.password = password
+        self.cursor = cursor
+        self.generation = generation
+        self.signals = signals
+    
+    def run(self):
+        """Apply the edit, run the analysis and report the result."""
+        started = time.perf_counter()
+        try:
+            self.session.set_text(self.password, self.cursor)
+            results = self.session.result()
+            # Heatmap scores are computed here too, not on every repaint
+            char_scores = self.session.analyzer.character_scores(self.password, results)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        self.signals.finished.emit(self.generation, self.password, results, char_scores,
+                                   time.perf_counter() - started)
+
+
+class AdaptiveDebounce:
+    """
+    Debounce interval that follows measured analysis latency.
+    Fast analysis gets a short delay so results feel immediate; slow
+    analysis gets a longer one so it is not restarted on every keystroke.
+    """
+    
+    def __init__(self, minimum_ms: int = 50, maximum_ms: int = 400,
+                 factor: float = 2.0, smoothing: float = 0.3):
+        """
+        Initialize the debounce.
+        
+        Args:
+            minimum_ms: Shortest delay in milliseconds
+            maximum_ms: Longest delay in milliseconds
+            factor: Delay as a multiple of the average analysis latency
+            smoothing: Weight of the newest sample in the moving average
+        """
+        self.minimum_ms = minimum_ms
+        self.maximum_ms = maximum_ms
+        self.factor = factor
+        self.smoothing = smoothing
+        # Moving average of analysis latency; None until the first sample
+        self.latency_ms = None
+    
+    def record(self, elapsed: float) -> None:
+        """Add an analysis latency sample, in seconds."""
+        sample = elapsed * 1000.0
+        if self.latency_ms is None:
+            self.latency_ms = sample
+        else:
+            self.latency_ms += self.smoothing * (sample - self.latency_ms)
+    
+    def interval(self) -> int:
+        """Return the current debounce delay in milliseconds."""
+        if self.latency_ms is None:
+            return self.minimum_ms
+        delay = self.minimum_ms + self.factor * self.latency_ms
+        return int(min(self.maximum_ms, delay))
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# FortiPass - Aggregate Report Builder
+
+"""
+One report summarizing many analyses.
+
+AggregateReport takes analysis results one at a time and keeps only
+fixed-size statistics:
+
+- fixed-bucket histograms of score, length, entropy and guesses
+- counts per strength category, character-class count, pattern type and
+  worst pattern severity
+- running count, sum, minimum and maximum of the score
+- the k weakest accounts, kept in a bounded heap
+
+Memory does not grow with the number of results, so a report can cover
+millions of accounts streamed from fortipass-audit. Reports built in
+separate processes can be combined with merge().
+
+Accounts are named by the label the caller passes (a user name or input
+line); the password is never stored. Pattern descriptions, which can quote
+parts of a password, are not kept either, only pattern types.
+
+export_json() writes a compact summary; export_pdf() renders the same
+figures with bar charts and needs reportlab.
+"""
+
+import datetime
+import heapq
+import json
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Strength categories from weakest to strongest
+CATEGORIES = ("Very Weak", "Weak", "Moderate", "Strong", "Very Strong")
+
+# Pattern severities from worst to mildest
+SEVERITIES = ("critical", "high", "medium", "low")
+
+# Weakest accounts listed in the report by default
+DEFAULT_TOP_K = 25
+
+# Histogram bucket lower bounds (the first bucket also takes smaller values)
+_SCORE_EDGES = (0, 10, 20, 30, 40, 50, 60, 70, 80, 90)
+_LENGTH_EDGES = (0, 8, 12, 16, 20, 32, 64)
+_ENTROPY_EDGES = (0, 20, 40, 60, 80, 100, 128)
+_GUESSES_EDGES = (0, 4, 6, 8, 10, 12, 14)
+
+
+class Histogram:
+    """Counts of values falling into fixed buckets."""
+    
+    __slots__ = ("edges", "labels", "counts")
+    
+    def __init__(self, edges: Sequence[float], labels: Sequence[str]):
+        """
+        Initialize an empty histogram.
+        
+        Args:
+            edges: Increasing lower bounds of the buckets
+            labels: Display name of each bucket
+        """
+        if len(edges) != len(labels):
+            raise ValueError("every bucket needs a label")
+        self.edges = tuple(edges)
+        self.labels = tuple(labels)
+        self.counts = [0] * len(edges)
+    
+    def add(self, value: float) -> None:
+        """Count one value."""
+        self.counts[max(0, bisect_right(self.edges, value) - 1)] += 1
+    
+    def merge(self, other: "Histogram") -> None:
+        """Add the counts of a histogram with the same buckets."""
+        if other.edges != self.edges:
+            raise ValueError("histogram buckets differ")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+    
+    def to_dict(self) -> Dict[str, int]:
+        """Return bucket label -> count, in bucket order."""
+        return dict(zip(self.labels, self.counts))
+
+
+def _range_labels(edges: Sequence[int], unit: str = "", last: Optional[str] = None) -> List[str]:
+    """Labels such as "8-11" for integer buckets, the last one open-ended."""
+    labels = [f"{low}-{high - 1}{unit}" for low, high in zip(edges, edges[1:])]
+    labels.append(last if last is not None else f"{edges[-1]}+{unit}")
+    return labels
+
+
+class AggregateReport:
+    """Streaming statistics over many analysis results."""
+    
+    def __init__(self, top_k: int = DEFAULT_TOP_K, title: str = "Password Audit Summary"):
+        """
+        Initialize an empty report.
+        
+        Args:
+            top_k: Number of weakest accounts to keep
+            title: Title used in the exported reports
+        """
+        if top_k < 0:
+            raise ValueError("top_k must not be negative")
+        self.top_k = top_k
+        self.title = title
+        self.count = 0
+        self.partial = 0
+        self.score_total = 0
+        self.score_min = None
+        self.score_max = None
+        self.scores = Histogram(_SCORE_EDGES, _range_labels(_SCORE_EDGES, last="90-100"))
+        self.lengths = Histogram(_LENGTH_EDGES, _range_labels(_LENGTH_EDGES))
+        self.entropy = Histogram(_ENTROPY_EDGES, _range_labels(_ENTROPY_EDGES, " bits"))
+        self.guesses = Histogram(_GUESSES_EDGES, [
+            f"10^{low}-10^{high}" for low, high in zip(_GUESSES_EDGES, _GUESSES_EDGES[1:])
+        ] + [f"10^{_GUESSES_EDGES[-1]}+"])
+        self.categories = dict.fromkeys(CATEGORIES, 0)
+        self.char_classes = [0] * 5
+        # Accounts with each pattern type, and by their worst severity
+        self.patterns = {}
+        self.severities = dict.fromkeys(SEVERITIES + ("none",), 0)
+        # Max-heap by weakness of the kept accounts: the root is the
+        # strongest of them and is evicted first
+        self._weakest = []
+        self._sequence = 0
+    
+    def add(self, result: Mapping[str, Any], account: Optional[str] = None) -> None:
+        """
+        Add one analysis result.
+        
+        Args:
+            result: AnalysisResult, or the dictionary from its to_dict();
+                fields missing from it are skipped
+            account: Label naming the account in the weakest-accounts list,
+                such as a user name or line number. Never the password.
+        """
+        self.count += 1
+        if result.get("partial"):
+            self.partial += 1
+        
+        score = result.get("strength_score")
+        if score is not None:
+            self.score_total += score
+            self.score_min = score if self.score_min is None else min(self.score_min, score)
+            self.score_max = score if self.score_max is None else max(self.score_max, score)
+            self.scores.add(score)
+        category = result.get("strength_category")
+        if category is not None:
+            self.categories[category] = self.categories.get(category, 0) + 1
+        length = result.get("length")
+        if length is not None:
+            self.lengths.add(length)
+        entropy = result.get("entropy")
+        if entropy is not None:
+            self.entropy.add(entropy)
+        guesses_log10 = result.get("guesses_log10")
+        if guesses_log10 is not None:
+            self.guesses.add(guesses_log10)
+        char_diversity = result.get("char_diversity")
+        if char_diversity is not None:
+            self.char_classes[min(4, max(0, char_diversity))] += 1
+        
+        patterns = result.get("patterns")
+        types = ()
+        if patterns is not None:
+            types = sorted({str(pattern["type"]) for pattern in patterns})
+            for kind in types:
+                self.patterns[kind] = self.patterns.get(kind, 0) + 1
+            severities = {str(pattern["severity"]) for pattern in patterns}
+            worst = next((name for name in SEVERITIES if name in severities), "none")
+            self.severities[worst] += 1
+        
+        if score is None or not self.top_k:
+            return
+        # Lower score is weaker; among equal scores, fewer guesses is weaker
+        key = (-score, -(guesses_log10 if guesses_log10 is not None else float("inf")))
+        if len(self._weakest) < self.top_k or key > self._weakest[0][0]:
+            self._keep_weak(key, {
+                "account": account if account is not None else f"#{self.count}",
+                "strength_score": score,
+                "strength_category": category,
+                "length": length,
+                "entropy": entropy,
+                "guesses_log10": guesses_log10,
+                "patterns": list(types),
+            })
+    
+    def add_many(self, results: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Add results without account labels.
+        
+        Returns:
+            Number of results added
+        """
+        added = 0
+        for result in results:
+            self.add(result)
+            added += 1
+        return added
+    
+    def _keep_weak(self, key: Tuple[float, float], entry: Dict[str, Any]) -> None:
+        """Add an account that is weaker than the strongest one kept."""
+        # Ties evict the most recently added account first
+        self._sequence += 1
+        item = (key, -self._sequence, entry)
+        if len(self._weakest) < self.top_k:
+            heapq.heappush(self._weakest, item)
+        else:
+            heapq.heapreplace(self._weakest, item)
+    
+    def merge(self, other: "AggregateReport") -> None:
+        """
+        Add the statistics of another report, e.g. one built by a worker.
+        
+        Args:
+            other: Report to fold into this one; it is left unchanged
+        """
+        self.count += other.count
+        self.partial += other.partial
+        self.score_total += other.score_total
+        for bound, pick in (("score_min", min), ("score_max", max)):
+            mine, theirs = getattr(self, bound), getattr(other, bound)
+            setattr(self, bound, theirs if mine is None else
+                    mine if theirs is None else pick(mine, theirs))
+        for name in ("scores", "lengths", "entropy", "guesses"):
+            getattr(self, name).merge(getattr(other, name))
+        for name, count in other.categories.items():
+            self.categories[name] = self.categories.get(name, 0) + count
+        self.char_classes = [a + b for a, b in zip(self.char_classes, other.char_classes)]
+        for kind, count in other.patterns.items():
+            self.patterns[kind] = self.patterns.get(kind, 0) + count
+        for name, count in other.severities.items():
+            self.severities[name] += count
+        for key, _, entry in sorted(other._weakest, reverse=True):
+            if not self.top_k:
+                break
+            if len(self._weakest) < self.top_k or key > self._weakest[0][0]:
+                self._keep_weak(key, entry)
+    
+    def weakest(self) -> List[Dict[str, Any]]:
+        """Return the kept weakest accounts, weakest first."""
+        return [entry for _, _, entry in sorted(self._weakest, reverse=True)]
+    
+    def top_patterns(self) -> List[Tuple[str, int]]:
+        """Return (pattern type, accounts) pairs, most common first."""
+        return sorted(self.patterns.items(), key=lambda item: (-item[1], item[0]))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the summary as a JSON-serializable dictionary.
+        
+        Returns:
+            Counts, histograms (bucket label -> accounts) and the weakest
+            accounts; no passwords or pattern descriptions
+        """
+        scored = sum(self.scores.counts)
+        return {
+            "title": self.title,
+            "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "generator": "FortiPass Password Strength Visualizer",
+            "accounts": self.count,
+            "partial": self.partial,
+            "score": {
+                "mean": round(self.score_total / scored, 2) if scored else None,
+                "min": self.score_min,
+                "max": self.score_max,
+                "histogram": self.scores.to_dict(),
+            },
+            "categories": dict(self.categories),
+            "length": self.lengths.to_dict(),
+            "entropy": self.entropy.to_dict(),
+            "guesses_log10": self.guesses.to_dict(),
+            "character_classes": {str(count): accounts
+                                  for count, accounts in enumerate(self.char_classes)},
+            "patterns": dict(self.top_patterns()),
+            "worst_severity": dict(self.severities),
+            "weakest": self.weakest(),
+        }
+    
+    def export_json(self, output_path: str) -> None:
+        """
+        Write the summary as compact JSON.
+        
+        Args:
+            output_path: Path to save the JSON file
+        """
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+            f.write("\n")
+    
+    def export_pdf(self, output_path: str) -> None:
+        """
+        Render the summary as a PDF with bar charts.
+        
+        Args:
+            output_path: Path to save the PDF file
+        """
+        try:
+            from reportlab.lib.pagesizes import letter
+            from reportlab.lib import colors
+            from reportlab.lib.styles import getSampleStyleSheet
+            from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer, Table,
+                                            TableStyle, PageBreak)
+            from reportlab.graphics.shapes import Drawing
+            from reportlab.graphics.charts.barcharts import VerticalBarChart
+        except ImportError:
+            raise ImportError("ReportLab is required for PDF export. Install with 'pip install reportlab'.")
+        # Imported here: xml.sax.saxutils pulls in urllib.request, which would
+        # more than double the import time of fortipass-audit
+        from xml.sax.saxutils import escape
+        
+        summary = self.to_dict()
+        doc = SimpleDocTemplate(output_path, pagesize=letter)
+        styles = getSampleStyleSheet()
+        title_style = styles["Heading1"]
+        subtitle_style = styles["Heading2"]
+        normal_style = styles["Normal"]
+        # One table style shared by every table in the report
+        table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        
+        def table(rows: List[List[Any]], widths: List[int]) -> Table:
+            result = Table(rows, colWidths=widths, repeatRows=1)
+            result.setStyle(table_style)
+            return result
+        
+        def bar_chart(counts: Mapping[str, int], color) -> Drawing:
+            labels = list(counts)
+            values = [counts[label] for label in labels]
+            drawing = Drawing(480, 200)
+            chart = VerticalBarChart()
+            chart.x, chart.y = 50, 50
+            chart.width, chart.height = 410, 130
+            chart.data = [values]
+            chart.categoryAxis.categoryNames = labels
+            chart.categoryAxis.labels.angle = 30
+            chart.categoryAxis.labels.boxAnchor = 'ne'
+            chart.categoryAxis.labels.fontSize = 7
+            chart.valueAxis.valueMin = 0
+            chart.valueAxis.valueMax = max(values + [1])
+            chart.valueAxis.labels.fontSize = 7
+            chart.bars[0].fillColor = color
+            drawing.add(chart)
+            return drawing
+        
+        def section(title: str, *flowables) -> None:
+            elements.append(Paragraph(title, subtitle_style))
+            elements.append(Spacer(1, 6))
+            elements.extend(flowables)
+            elements.append(Spacer(1, 12))
+        
+        elements = [Paragraph(self.title, title_style), Spacer(1, 6),
+                    Paragraph(f"Generated: {summary['generated_at'].replace('T', ' ')}",
+                              normal_style),
+                    Paragraph("Tool: FortiPass Password Strength Visualizer", normal_style),
+                    Spacer(1, 12)]
+        
+        score = summary["score"]
+        # Only results that carried a patterns field were inspected for them
+        inspected = sum(self.severities.values())
+        flagged = inspected - self.severities["none"]
+        section("Summary", table([
+            ["Metric", "Value"],
+            ["Accounts analyzed", f"{self.count:,}"],
+            ["Mean strength score", "N/A" if score["mean"] is None else f"{score['mean']:.1f}/100"],
+            ["Lowest / highest score", "N/A" if score["min"] is None
+             else f"{score['min']} / {score['max']}"],
+            ["Weak or very weak", f"{self.categories.get('Very Weak', 0) + self.categories.get('Weak', 0):,}"],
+            ["Containing a detected pattern", "N/A" if not inspected else f"{flagged:,}"],
+            ["Partially analyzed (budget)", f"{self.partial:,}"],
+        ], [250, 250]))
+        
+        section("Strength Score Distribution", bar_chart(score["histogram"], colors.steelblue))
+        section("Strength Categories",
+                bar_chart(summary["categories"], colors.darkorange),
+                table([["Category", "Accounts", "Share"]] + [
+                    [name, f"{count:,}", f"{100.0 * count / self.count:.1f}%" if self.count else "-"]
+                    for name, count in summary["categories"].items()
+                ], [200, 150, 150]))
+        section("Password Length", bar_chart(summary["length"], colors.seagreen))
+        section("Entropy", bar_chart(summary["entropy"], colors.slateblue))
+        
+        elements.append(PageBreak())
+        patterns = summary["patterns"]
+        if patterns:
+            section("Top Pattern Types",
+                    bar_chart({kind.replace("_", " ").title(): count
+                               for kind, count in patterns.items()}, colors.firebrick),
+                    table([["Pattern Type", "Accounts", "Share"]] + [
+                        [kind.replace("_", " ").title(), f"{count:,}",
+                         f"{100.0 * count / self.count:.1f}%"]
+                        for kind, count in patterns.items()
+                    ], [200, 150, 150]))
+        section("Worst Pattern Severity", table([["Severity", "Accounts"]] + [
+            [name.title(), f"{count:,}"] for name, count in summary["worst_severity"].items()
+        ], [250, 250]))
+        
+        weakest = summary["weakest"]
+        if weakest:
+            section(f"Weakest {len(weakest)} Accounts", table([
+                ["Account", "Score", "Category", "Length", "Patterns"]
+            ] + [
+                # Account labels come from the input and may contain markup
+                [Paragraph(escape(str(entry["account"])), normal_style), entry["strength_score"],
+                 entry["strength_category"] or "-",
+                 "-" if entry["length"] is None else entry["length"],
+                 Paragraph(", ".join(kind.replace("_", " ") for kind in entry["patterns"]) or "-",
+                           normal_style)]
+                for entry in weakest
+            ], [130, 45, 75, 45, 205]))
+        
+        doc.build(elements)
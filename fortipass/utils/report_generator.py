@@ -21,8 +21,8 @@ class ReportGenerator:
             results: Password analysis results
             output_path: Path to save the JSON file
         """
-        # Create a copy of results to avoid modifying the original
-        report_data = dict(results)
+        # Create a plain copy of results to avoid modifying the original
+        report_data = results.to_dict() if hasattr(results, "to_dict") else dict(results)
         
         # Add metadata
         report_data["metadata"] = {
@@ -94,7 +94,8 @@ class ReportGenerator:
             ["Password Length", str(results["length"])],
             ["Entropy", f"{results['entropy']:.2f}"],
             ["Character Classes", f"{results['char_diversity']}/4"],
-            ["Estimated Crack Time", results["crack_time"]]
+            ["Estimated Crack Time", results["crack_time"]],
+            ["Guess-Based Crack Time", results.get("crack_time_guesses", "N/A")]
         ]
         
         summary_table = Table(summary_data, colWidths=[200, 300])
@@ -32,6 +32,8 @@ setup(
     entry_points={
         "console_scripts": [
             "fortipass=fortipass.main:main",
+            "fortipass-audit=fortipass.audit:main",
+            "fortipass-server=fortipass.server:main",
         ],
     },
     classifiers=[
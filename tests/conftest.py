@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# FortiPass - Test Configuration
+
+import os
+import sys
+
+# Make the package importable when pytest is run without installing it
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# FortiPass - Bloom Filter Tests
+
+"""
+BloomFilter must never reject a word it holds, keep its false-positive rate
+near the target, and survive a save/load round trip unchanged.
+"""
+
+import pickle
+import random
+import string
+
+import pytest
+
+from fortipass.core.bloom import BLOOM_MAGIC, BloomFilter, build_filter, optimal_parameters
+
+
+def random_words(count: int, seed: int):
+    """Return distinct random words."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(string.ascii_letters + string.digits)
+                          for _ in range(rng.randint(1, 14))))
+    return sorted(words)
+
+
+def test_no_false_negatives():
+    """Every added word is reported present, in any case."""
+    words = random_words(5000, seed=6) + ["\ud800", "pa\udcffss"]
+    bloom = BloomFilter(len(words), 0.01)
+    bloom.update(words)
+    assert len(bloom) == len(words)
+    assert all(word in bloom for word in words)
+    assert all(word.swapcase() in bloom for word in words)
+
+
+def test_false_positive_rate():
+    """Absent words are rarely reported present at the configured rate."""
+    words = random_words(5000, seed=7)
+    bloom = BloomFilter(len(words), 0.01)
+    bloom.update(words)
+    lowered = {word.lower() for word in words}
+    others = [word for word in random_words(20000, seed=8) if word.lower() not in lowered]
+    rate = sum(1 for word in others if word in bloom) / len(others)
+    assert rate < 0.03
+
+
+def test_save_and_load(tmp_path):
+    """A loaded filter answers exactly like the one that was saved."""
+    words = random_words(2000, seed=9)
+    path = str(tmp_path / "words.fpbloom")
+    built = build_filter(words, path, len(words), 0.02)
+    probes = words + random_words(2000, seed=10)
+    
+    loaded = BloomFilter.load(path)
+    try:
+        assert (loaded.num_bits, loaded.num_hashes, len(loaded)) == (
+            built.num_bits, built.num_hashes, built.count)
+        assert [word in loaded for word in probes] == [word in built for word in probes]
+        with pytest.raises(RuntimeError):
+            loaded.add("extra")
+        
+        # Mapped filters pickle by path
+        copy = pickle.loads(pickle.dumps(loaded))
+        assert [word in copy for word in probes] == [word in built for word in probes]
+        copy.close()
+    finally:
+        loaded.close()
+
+
+def test_rejects_damaged_files(tmp_path):
+    """Empty, foreign, truncated and padded files raise ValueError."""
+    path = str(tmp_path / "words.fpbloom")
+    build_filter(random_words(100, seed=11), path, 100)
+    with open(path, "rb") as f:
+        data = f.read()
+    
+    damaged = {
+        "empty": b"",
+        "header_only": data[:12],
+        "wrong_magic": b"NOTBLOOM" + data[len(BLOOM_MAGIC):],
+        "truncated": data[:-1],
+        "padded": data + b"\0",
+    }
+    for name, content in damaged.items():
+        broken = str(tmp_path / (name + ".fpbloom"))
+        with open(broken, "wb") as f:
+            f.write(content)
+        with pytest.raises(ValueError):
+            BloomFilter.load(broken)
+
+
+def test_optimal_parameters():
+    """Lower error rates cost more bits; invalid rates are refused."""
+    loose = optimal_parameters(1000, 0.1)
+    tight = optimal_parameters(1000, 0.001)
+    assert tight[0] > loose[0] and tight[1] > loose[1]
+    for rate in (0, 1, -0.5):
+        with pytest.raises(ValueError):
+            optimal_parameters(1000, rate)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# FortiPass - Breach Store Tests
+
+"""
+BreachStore must return the counts it was built with for any prefix
+length, refuse stores whose layout does not match, and stay consistent
+under concurrent lookups.
+"""
+
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fortipass.core.breach_store import (
+    STORE_MANIFEST, BreachStore, build_store, main, sha1_hex
+)
+from fortipass.core.password_analyzer import PasswordAnalyzer
+
+WORDS = [f"leaked{i}" for i in range(400)] + ["hunter2", "\ud800", "pa\udcffss"]
+
+
+def entries(words):
+    """Pair every word's digest with a count of (index + 1)."""
+    return [(sha1_hex(word), index + 1) for index, word in enumerate(words)]
+
+
+@pytest.mark.parametrize("prefix_length", [1, 3, 5, 7])
+def test_lookup_with_any_prefix_length(tmp_path, prefix_length):
+    """Counts come back for every prefix length, read from the manifest."""
+    directory = str(tmp_path / "store")
+    build_store(entries(WORDS), directory, prefix_length, flush_size=37)
+    
+    store = BreachStore(directory)
+    assert store.prefix_length == prefix_length
+    assert all(store.lookup(word) == index + 1 for index, word in enumerate(WORDS))
+    assert store.lookup("never-leaked") == 0
+    assert "hunter2" in store
+    
+    analyzer = PasswordAnalyzer(breach_store_path=directory)
+    assert analyzer.breach_store.prefix_length == prefix_length
+    types = [pattern["type"] for pattern in analyzer.analyze("hunter2").patterns]
+    assert "breached" in types
+
+
+def test_repeated_builds_sum_counts(tmp_path):
+    """Building into an existing store adds to its counts."""
+    directory = str(tmp_path / "store")
+    build_store([(sha1_hex("hunter2"), 2)], directory, 3)
+    build_store([(sha1_hex("hunter2"), 5)], directory, 3)
+    assert BreachStore(directory).lookup("hunter2") == 7
+    
+    with pytest.raises(ValueError):
+        build_store([(sha1_hex("hunter2"), 1)], directory, 4)
+
+
+def test_rejects_mismatched_layout(tmp_path):
+    """Prefix lengths that disagree with the manifest or shard names are refused."""
+    directory = str(tmp_path / "store")
+    build_store(entries(WORDS[:20]), directory, 3)
+    with pytest.raises(ValueError):
+        BreachStore(directory, prefix_length=5)
+    
+    # Without a manifest the default of 5 must match the shard names
+    os.remove(os.path.join(directory, STORE_MANIFEST))
+    with pytest.raises(ValueError):
+        BreachStore(directory)
+    assert BreachStore(directory, prefix_length=3).lookup(WORDS[0]) == 1
+    
+    with open(os.path.join(directory, STORE_MANIFEST), "w") as f:
+        f.write("{not json")
+    with pytest.raises(ValueError):
+        BreachStore(directory)
+    
+    with pytest.raises(ValueError):
+        BreachStore(str(tmp_path / "missing"))
+
+
+def test_command_line_prefix_length(tmp_path, capsys):
+    """The builder records --prefix-length and refuses to change it."""
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_bytes(b"hunter2\npa\xffss\n")
+    directory = str(tmp_path / "store")
+    assert main([str(wordlist), directory, "--prefix-length", "2"]) == 0
+    store = BreachStore(directory)
+    assert store.prefix_length == 2
+    assert store.lookup(b"pa\xffss".decode("utf-8", "surrogateescape")) == 1
+    
+    assert main([str(wordlist), directory, "--prefix-length", "4"]) == 2
+    assert "prefix length" in capsys.readouterr().err
+
+
+def test_concurrent_lookups(tmp_path):
+    """Threads sharing a small shard cache all get correct counts."""
+    directory = str(tmp_path / "store")
+    build_store(entries(WORDS), directory, 2)
+    store = BreachStore(directory, cache_size=2)
+    
+    def lookups(seed):
+        rng = random.Random(seed)
+        picks = [rng.randrange(len(WORDS)) for _ in range(500)]
+        return all(store.lookup(WORDS[index]) == index + 1 for index in picks)
+    
+    with ThreadPoolExecutor(8) as executor:
+        assert all(executor.map(lookups, range(16)))
+    info = store.cache_info()
+    assert info["cached_shards"] <= 2
+    assert info["hits"] + info["misses"] == 16 * 500
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# FortiPass - Dictionary Index Tests
+
+"""
+DictionaryIndex must find exactly the entries it was built from, whatever
+their case or encoding, and refuse files that are not complete indexes.
+"""
+
+import os
+import random
+import string
+
+import pytest
+
+from fortipass.core.dictionary_index import (
+    INDEX_MAGIC, DictionaryIndex, build_index, read_wordlist
+)
+from fortipass.core.password_analyzer import PasswordAnalyzer
+
+
+def random_words(count: int, seed: int):
+    """Return distinct random lowercase words."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(string.ascii_lowercase + string.digits)
+                          for _ in range(rng.randint(1, 12))))
+    return sorted(words)
+
+
+@pytest.mark.parametrize("run_size", [7, 1000000])
+def test_round_trip(tmp_path, run_size):
+    """Every entry is found and other words are not, with or without spilled runs."""
+    words = random_words(500, seed=5)
+    path = str(tmp_path / "words.fpidx")
+    # Duplicates and case variants collapse to one entry
+    count = build_index(words + [word.upper() for word in words[:50]], path, run_size=run_size)
+    assert count == len(words)
+    
+    index = DictionaryIndex(path)
+    try:
+        assert len(index) == len(words)
+        assert all(word in index for word in words)
+        assert all(word.upper() in index for word in words)
+        others = set(random_words(500, seed=6)).difference(words)
+        assert not any(word in index for word in others)
+    finally:
+        index.close()
+
+
+def test_empty_index(tmp_path):
+    """An index built from no words opens and contains nothing."""
+    path = str(tmp_path / "empty.fpidx")
+    assert build_index([], path) == 0
+    index = DictionaryIndex(path)
+    try:
+        assert len(index) == 0
+        assert "password" not in index
+    finally:
+        index.close()
+
+
+def test_rejects_damaged_files(tmp_path):
+    """Empty, foreign, truncated and padded files raise ValueError."""
+    path = str(tmp_path / "words.fpidx")
+    build_index(random_words(50, seed=7), path)
+    with open(path, "rb") as f:
+        data = f.read()
+    
+    damaged = {
+        "empty": b"",
+        "header only": data[:10],
+        "wrong magic": b"NOTANIDX" + data[len(INDEX_MAGIC):],
+        "truncated": data[:-3],
+        "padded": data + b"\0" * 8,
+    }
+    for name, content in damaged.items():
+        broken = str(tmp_path / (name.replace(" ", "_") + ".fpidx"))
+        with open(broken, "wb") as f:
+            f.write(content)
+        with pytest.raises(ValueError):
+            DictionaryIndex(broken)
+
+
+def test_undecodable_and_surrogate_entries(tmp_path):
+    """Bytes that are not UTF-8 and lone surrogates hash the same at build and lookup."""
+    source = str(tmp_path / "words.txt")
+    with open(source, "wb") as f:
+        f.write(b"pa\xffss\nplain\n")
+    path = str(tmp_path / "words.fpidx")
+    build_index(read_wordlist(source), path)
+    
+    index = DictionaryIndex(path)
+    try:
+        assert b"pa\xffss".decode("utf-8", "surrogateescape") in index
+        assert "pass" not in index
+        assert "\ud800" not in index
+    finally:
+        index.close()
+    
+    analyzer = PasswordAnalyzer(index_path=path)
+    try:
+        types = [pattern["type"] for pattern in analyzer.analyze("Pl\ud800ain").patterns]
+        assert "dictionary_word" not in types
+        assert "dictionary_word" in [pattern["type"] for pattern in
+                                     analyzer.analyze("PLAIN").patterns]
+    finally:
+        analyzer.dictionary_index.close()
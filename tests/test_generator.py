@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# FortiPass - Password Generator Tests
+
+"""
+PasswordSampler must number exactly the passwords that contain every
+character class, and the generators must only produce such passwords.
+"""
+
+import itertools
+import random
+import string
+from collections import Counter
+
+import pytest
+
+from fortipass.core.generator import (
+    PasswordSampler, RandomBuffer, character_classes, generate_passwords
+)
+from fortipass.core.password_analyzer import PasswordAnalyzer
+
+SMALL_CLASSES = [
+    ["ab", "cd", "e"],
+    ["a", "b", "c", "d"],
+    ["abc", "de", "f"],
+    ["ab", "cd"],
+    ["xyz"],
+]
+
+
+def brute_force(classes, length):
+    """Return every string of a length that contains each class."""
+    return {"".join(chars) for chars in itertools.product("".join(classes), repeat=length)
+            if all(any(char in members for char in chars) for members in classes)}
+
+
+def test_known_counts():
+    """Counts for two-two-one classes match hand-checked values."""
+    sampler = PasswordSampler(["ab", "cd", "e"])
+    assert [sampler.count(length) for length in range(3, 7)] == [24, 240, 1680, 10200]
+
+
+@pytest.mark.parametrize("classes", SMALL_CLASSES)
+def test_decode_is_a_bijection(classes):
+    """Indices map one-to-one onto exactly the valid passwords."""
+    sampler = PasswordSampler(classes)
+    for length in range(len(classes), len(classes) + 4):
+        expected = brute_force(classes, length)
+        assert sampler.count(length) == len(expected)
+        decoded = [sampler.decode(index, length) for index in range(sampler.count(length))]
+        assert len(set(decoded)) == len(decoded)
+        assert set(decoded) == expected
+        
+        for index in (-1, sampler.count(length)):
+            with pytest.raises(ValueError):
+                sampler.decode(index, length)
+
+
+def test_sample_is_uniform():
+    """Every valid password turns up about equally often."""
+    sampler = PasswordSampler(["ab", "cd", "e"])
+    source = RandomBuffer(64)
+    seen = Counter(sampler.sample(3, source) for _ in range(24000))
+    assert set(seen) == brute_force(["ab", "cd", "e"], 3)
+    assert all(800 <= count <= 1200 for count in seen.values())
+
+
+def test_invalid_classes():
+    """Empty or overlapping classes and short lengths are refused."""
+    for classes in ([], ["ab", ""], ["ab", "bc"]):
+        with pytest.raises(ValueError):
+            PasswordSampler(classes)
+    with pytest.raises(ValueError):
+        PasswordSampler(["a", "b", "c"]).count(2)
+
+
+def test_random_buffer_below():
+    """Bounded draws stay in range and reach every value."""
+    source = RandomBuffer(3)
+    for bound in (1, 2, 7, 256, 257, 10 ** 30):
+        values = [source.below(bound) for _ in range(300)]
+        assert all(0 <= value < bound for value in values)
+        if bound <= 7:
+            assert set(values) == set(range(bound))
+    assert len(source.take(10)) == 10
+    with pytest.raises(ValueError):
+        RandomBuffer(0)
+
+
+@pytest.mark.parametrize("flags", list(itertools.product([True, False], repeat=3)))
+def test_generated_passwords_contain_each_class(flags):
+    """Generated passwords have the requested length and every included class."""
+    classes = character_classes(*flags)
+    passwords = list(generate_passwords(50, 12, *flags, buffer_size=16))
+    assert len(passwords) == 50
+    for password in passwords:
+        assert len(password) == 12
+        assert all(any(char in members for char in password) for members in classes)
+        assert set(password) <= set("".join(classes))
+
+
+def test_generator_arguments():
+    """Negative counts and lengths below the class count fail immediately."""
+    with pytest.raises(ValueError):
+        generate_passwords(-1)
+    with pytest.raises(ValueError):
+        generate_passwords(5, 3)
+    assert list(generate_passwords(0)) == []
+    
+    analyzer = PasswordAnalyzer()
+    passwords = list(analyzer.generate_many(20, 8, include_symbols=False))
+    assert all(len(password) == 8 and not set(password) & set(string.punctuation)
+               for password in passwords)
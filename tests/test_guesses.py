@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# FortiPass - Guess Estimator Tests
+
+"""
+estimate_guesses() must find the same minimum as trying every cover, never
+rise when matches are added or made cheaper, and GuessLattice must agree
+with a fresh estimate after every edit.
+"""
+
+import math
+import random
+
+from fortipass.core.guesses import (
+    MAX_ESTIMATE_LENGTH, GuessLattice, estimate_guesses
+)
+
+KINDS = ("dictionary", "keyboard", "sequence", "repeat", "date")
+
+
+def random_candidates(length: int, count: int, rng: random.Random):
+    """Return random (start, end, guesses, kind) spans inside length."""
+    candidates = []
+    for _ in range(count):
+        start = rng.randrange(length)
+        end = rng.randint(start + 1, min(length, start + 6))
+        candidates.append((start, end, float(rng.randint(1, 10 ** rng.randint(1, 5))),
+                           rng.choice(KINDS)))
+    return candidates
+
+
+def brute_force_estimate(length: int, candidates) -> float:
+    """Try every cover of the password and return the cheapest in log10."""
+    floors = {1: math.log10(10), "multi": math.log10(50)}
+    starting = {}
+    for start, end, guesses, _ in candidates:
+        floor = floors[1] if end - start == 1 else floors["multi"]
+        starting.setdefault(start, []).append((end, max(math.log10(guesses), floor)))
+    
+    best = math.inf
+    
+    def walk(position, count, product):
+        nonlocal best
+        if position == length:
+            total = product + math.lgamma(count + 1) / math.log(10)
+            growth = (count - 1) * 4
+            high, low = max(total, growth), min(total, growth)
+            best = min(best, high + math.log10(1 + 10 ** (low - high)))
+            return
+        for end, log_guesses in starting.get(position, ()):
+            walk(end, count + 1, product + log_guesses)
+        for end in range(position + 1, length + 1):
+            run = end - position
+            walk(end, count + 1, product + (run if run > 1 else math.log10(11)))
+    
+    walk(0, 0, 0.0)
+    return best
+
+
+def test_matches_exhaustive_search():
+    """The DP minimum equals the cheapest of all covers on short inputs."""
+    rng = random.Random(8)
+    for _ in range(300):
+        length = rng.randint(1, 8)
+        candidates = random_candidates(length, rng.randint(0, 5), rng)
+        estimate = estimate_guesses(length, candidates)
+        assert abs(estimate.guesses_log10 - brute_force_estimate(length, candidates)) < 1e-3
+        # The reported segments tile the password
+        assert estimate.segments[0][0] == 0 and estimate.segments[-1][1] == length
+        assert all(left[1] == right[0]
+                   for left, right in zip(estimate.segments, estimate.segments[1:]))
+
+
+def test_monotonic_in_candidates():
+    """More matches or cheaper matches never raise the estimate."""
+    rng = random.Random(9)
+    for _ in range(300):
+        length = rng.randint(1, 40)
+        candidates = random_candidates(length, rng.randint(0, 12), rng)
+        base = estimate_guesses(length, candidates).guesses_log10
+        
+        extra = candidates + random_candidates(length, rng.randint(1, 4), rng)
+        assert estimate_guesses(length, extra).guesses_log10 <= base + 1e-9
+        
+        if candidates:
+            cheaper = list(candidates)
+            index = rng.randrange(len(cheaper))
+            start, end, guesses, kind = cheaper[index]
+            cheaper[index] = (start, end, max(1.0, guesses / rng.randint(2, 100)), kind)
+            assert estimate_guesses(length, cheaper).guesses_log10 <= base + 1e-9
+        
+        # A brute-force password is the worst case
+        assert base <= estimate_guesses(length, []).guesses_log10 + 1e-9
+
+
+def test_monotonic_in_length():
+    """Appending characters without new matches never lowers the estimate."""
+    rng = random.Random(10)
+    previous = 0.0
+    for length in range(1, MAX_ESTIMATE_LENGTH + 20):
+        current = estimate_guesses(length, []).guesses_log10
+        assert current > previous
+        previous = current
+    
+    for _ in range(200):
+        length = rng.randint(1, 30)
+        candidates = random_candidates(length, rng.randint(0, 8), rng)
+        base = estimate_guesses(length, candidates).guesses_log10
+        assert estimate_guesses(length + rng.randint(1, 5), candidates).guesses_log10 >= base
+
+
+def test_empty_password():
+    """Nothing to guess costs nothing."""
+    assert estimate_guesses(0, []).guesses_log10 == 0.0
+    assert GuessLattice().update(0, []).segments == []
+
+
+def test_lattice_matches_fresh_estimate():
+    """Incremental updates equal a fresh estimate across appends, deletes and edits."""
+    rng = random.Random(11)
+    lattice = GuessLattice()
+    length, candidates = 0, []
+    for _ in range(500):
+        action = rng.random()
+        if action < 0.5:
+            length += rng.randint(1, 3)
+        elif action < 0.7:
+            length = max(0, length - rng.randint(1, 4))
+        elif action < 0.8:
+            length = rng.randint(0, MAX_ESTIMATE_LENGTH + 10)
+        candidates = [span for span in candidates if span[1] <= length]
+        if length and rng.random() < 0.6:
+            candidates += random_candidates(length, rng.randint(1, 3), rng)
+        if candidates and rng.random() < 0.2:
+            candidates.pop(rng.randrange(len(candidates)))
+        
+        updated = lattice.update(length, candidates)
+        fresh = estimate_guesses(length, candidates)
+        assert updated.guesses_log10 == fresh.guesses_log10
+        assert updated.segments == fresh.segments
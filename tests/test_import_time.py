@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# FortiPass - Import Time Tests
+
+"""
+Run benchmarks/bench_import.py and fail if it reports a module over its
+import budget or importing a GUI, PDF or other forbidden dependency.
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_entry_points_import_within_budget():
+    """Every headless entry point imports within budget and stays headless."""
+    completed = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "benchmarks", "bench_import.py")],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=ROOT,
+        universal_newlines=True, timeout=300
+    )
+    assert completed.returncode == 0, completed.stdout
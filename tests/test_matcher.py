@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# FortiPass - Substring Matcher Tests
+
+"""
+AhoCorasick must report exactly the occurrences a brute-force search finds,
+and analyzers loading the same wordlist file must share one built matcher.
+"""
+
+import os
+import random
+import shutil
+
+from fortipass.core.matcher import AhoCorasick
+from fortipass.core.password_analyzer import PasswordAnalyzer
+
+WORDLIST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "data", "common_passwords.txt")
+
+
+def test_matches_brute_force():
+    """Every occurrence of every pattern is found, ordered by end position."""
+    rng = random.Random(4)
+    patterns = list({"".join(rng.choice("abc") for _ in range(rng.randint(1, 6)))
+                     for _ in range(60)})
+    matcher = AhoCorasick()
+    for pattern in patterns:
+        matcher.add(pattern, pattern)
+    
+    for _ in range(500):
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 30)))
+        expected = sorted((start, start + len(pattern), pattern)
+                          for pattern in patterns
+                          for start in range(len(text) - len(pattern) + 1)
+                          if text.startswith(pattern, start))
+        found = matcher.findall(text)
+        assert sorted(found) == expected
+        assert [end for _, end, _ in found] == sorted(end for _, end, _ in found)
+        assert [match for _, matches in matcher.advance(text) for match in matches] == found
+
+
+def test_analyzers_share_matcher(tmp_path):
+    """A built matcher is reused until the wordlist file changes."""
+    path = str(tmp_path / "words.txt")
+    shutil.copyfile(WORDLIST, path)
+    first = PasswordAnalyzer(path)
+    first.preload()
+    second = PasswordAnalyzer(path)
+    second.preload()
+    assert second._matcher is first._matcher
+    
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("zebrafish\n")
+    changed = PasswordAnalyzer(path)
+    changed.preload()
+    assert changed._matcher is not first._matcher
+    assert any(pattern["type"] == "dictionary_substring"
+               for pattern in changed.analyze("zebrafish!!Q7").patterns)
+    
+    # Words assigned directly never come from or enter the shared cache
+    custom = PasswordAnalyzer(path)
+    custom.common_words = {"zebrafish": 1}
+    custom.preload()
+    assert custom._matcher is not changed._matcher
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# FortiPass - Passphrase Generator Tests
+
+"""
+WordIndex must return the words it was built from in order and refuse
+damaged files, and PassphraseGenerator must only join indexed words with
+the configured separators.
+"""
+
+import math
+import pickle
+import random
+import string
+
+import pytest
+
+from fortipass.core.passphrase import (
+    WORDS_MAGIC, PassphraseGenerator, WordIndex, build_word_index, main,
+    normalize_words, read_word_file
+)
+from fortipass.core.password_analyzer import PasswordAnalyzer
+
+
+def random_words(count: int, seed: int):
+    """Return distinct random lowercase words, including non-ASCII ones."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(string.ascii_lowercase + "äéøß")
+                          for _ in range(rng.randint(1, 10))))
+    return sorted(words)
+
+
+def test_round_trip(tmp_path):
+    """Every word comes back at its position, also after pickling."""
+    words = random_words(300, seed=24)
+    path = str(tmp_path / "words.fpwords")
+    assert build_word_index(words, path) == len(words)
+    
+    index = WordIndex(path)
+    try:
+        assert len(index) == len(words)
+        assert [index[i] for i in range(len(index))] == words
+        for position in (-1, len(words)):
+            with pytest.raises(IndexError):
+                index[position]
+        
+        # Indexes pickle by path
+        copy = pickle.loads(pickle.dumps(index))
+        assert [copy[i] for i in range(len(copy))] == words
+        copy.close()
+    finally:
+        index.close()
+
+
+def test_rejects_damaged_files(tmp_path):
+    """Empty, foreign, truncated and padded files raise ValueError."""
+    path = str(tmp_path / "words.fpwords")
+    build_word_index(random_words(50, seed=25), path)
+    with open(path, "rb") as f:
+        data = f.read()
+    
+    damaged = {
+        "empty": b"",
+        "header_only": data[:10],
+        "wrong_magic": b"NOTWORDS" + data[len(WORDS_MAGIC):],
+        "truncated": data[:-1],
+        "padded": data + b"\0",
+    }
+    for name, content in damaged.items():
+        broken = str(tmp_path / (name + ".fpwords"))
+        with open(broken, "wb") as f:
+            f.write(content)
+        with pytest.raises(ValueError):
+            WordIndex(broken)
+
+
+def test_word_file_parsing(tmp_path):
+    """Diceware rolls are dropped and unusable entries are skipped."""
+    source = tmp_path / "diceware.txt"
+    source.write_text("11111\tabacus\n11112 Abbey\nzebra\n\nabacus\nr2d2\n"
+                      "two words here\n", encoding="utf-8")
+    assert normalize_words(read_word_file(str(source))) == ["abacus", "abbey", "zebra"]
+    assert normalize_words([" Tab\t", "TAB", "a b", "x1", ""]) == ["tab"]
+    
+    path = str(tmp_path / "words.fpwords")
+    assert main([str(source), path]) == 0
+    with pytest.raises(ValueError):
+        build_word_index(["only", "ONLY"], path)
+    single = tmp_path / "single.txt"
+    single.write_text("lonely\n", encoding="utf-8")
+    assert main([str(single), str(tmp_path / "single.fpwords")]) == 2
+
+
+@pytest.mark.parametrize("separators", ["-", "", "-_.", " "])
+@pytest.mark.parametrize("capitalize", [False, True])
+@pytest.mark.parametrize("include_digit", [False, True])
+def test_generated_structure(tmp_path, separators, capitalize, include_digit):
+    """Passphrases are indexed words joined by the configured separators."""
+    words = ["alpha", "bravo", "charlie", "delta", "echo"]
+    path = str(tmp_path / "words.fpwords")
+    build_word_index(words, path)
+    index = WordIndex(path)
+    try:
+        generator = PassphraseGenerator(index, 4, separators, capitalize, include_digit)
+        for phrase in generator.generate_many(200, buffer_size=32):
+            rest, digits = phrase, 0
+            for _ in range(4):
+                word = next(word for word in words
+                            if rest.lower().startswith(word))
+                taken = rest[:len(word)]
+                assert taken == (word.capitalize() if capitalize else word)
+                rest = rest[len(word):]
+                if rest[:1].isdigit():
+                    digits += 1
+                    rest = rest[1:]
+                if rest and separators:
+                    assert rest[0] in separators
+                    rest = rest[1:]
+            assert rest == ""
+            assert digits == (1 if include_digit else 0)
+    finally:
+        index.close()
+
+
+def test_entropy_and_arguments(tmp_path):
+    """Entropy follows the word, separator and digit choices; bad settings fail."""
+    path = str(tmp_path / "words.fpwords")
+    build_word_index(random_words(1024, seed=26), path)
+    index = WordIndex(path)
+    try:
+        assert PassphraseGenerator(index, 6).entropy == pytest.approx(60)
+        assert PassphraseGenerator(index, 6, "-_.:").entropy == pytest.approx(70)
+        assert PassphraseGenerator(index, 6, include_digit=True).entropy == pytest.approx(
+            60 + math.log2(60))
+        
+        for words, separators in ((0, "-"), (4, "--"), (4, "-a"), (4, "1")):
+            with pytest.raises(ValueError):
+                PassphraseGenerator(index, words, separators)
+        with pytest.raises(ValueError):
+            PassphraseGenerator(index).generate_many(-1)
+    finally:
+        index.close()
+    
+    analyzer = PasswordAnalyzer(passphrase_index_path=path)
+    try:
+        assert len(analyzer.generate_passphrase(words=5).split("-")) == 5
+    finally:
+        analyzer.word_index.close()
+    with pytest.raises(ValueError):
+        PasswordAnalyzer().passphrase_generator()
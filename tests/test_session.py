@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# FortiPass - Incremental Session Tests
+
+"""
+AnalysisSession must give the same results as PasswordAnalyzer.analyze(),
+including when the analyzer has a result cache or an analysis budget.
+"""
+
+import os
+import random
+
+import pytest
+
+from fortipass.core.budget import AnalysisBudget
+from fortipass.core.password_analyzer import PasswordAnalyzer
+from fortipass.core.session import AnalysisSession
+
+WORDLIST = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "data", "common_passwords.txt")
+
+ALPHABET = "abcqwerty123password!A "
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"cache_size": 64},
+    {"budget": AnalysisBudget(max_matches=3)},
+    {"budget": AnalysisBudget(max_chars=20, max_matches=5), "cache_size": 64},
+])
+def test_session_matches_analyzer(options):
+    """Random edits give the results a fresh analysis of the text gives."""
+    analyzer = PasswordAnalyzer(WORDLIST, **options)
+    reference = PasswordAnalyzer(WORDLIST, budget=options.get("budget"))
+    session = AnalysisSession(analyzer)
+    rng = random.Random(16)
+    for _ in range(300):
+        text = session.text
+        if text and rng.random() < 0.3:
+            session.delete(rng.randrange(len(text)))
+        else:
+            session.insert(rng.randint(0, len(text)), rng.choice(ALPHABET))
+        assert session.result().to_dict() == reference.analyze(session.text).to_dict()
+
+
+def test_session_reports_partial_results():
+    """A match limit on the analyzer applies to session results too."""
+    analyzer = PasswordAnalyzer(WORDLIST, budget=AnalysisBudget(max_matches=1))
+    session = AnalysisSession(analyzer, "qwertypassword123")
+    assert session.result().partial